@@ -4,16 +4,36 @@
 # This script implements the Analytic Logic Gate for f(p_n).
 #
 # - Added the missing definition for get_v11_multiplicative_prediction.
+#
+# Optional C kernel (fastest path): python setup.py build_ext --inplace
 # ==============================================================================
 
 import time
 import math
-import json
 from collections import defaultdict
 
+import numpy as np
+
+from plr_common import load_primes, load_mod6_map, mod6_table
+
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+try:
+    import plr_score # Optional C kernel: python setup.py build_ext --inplace
+    _C_KERNEL_AVAILABLE = True
+except ImportError:
+    _C_KERNEL_AVAILABLE = False
+
 # --- Engine Setup (v16.0 Framework) ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
+MOD6_SCORES = None # Dense length-6 array view of the map (index = S % 6)
+MOD6_SCORES_PLUS1 = None # MOD6_SCORES + 1.0, the v11.0 multiplier per residue
+MOD6_TUPLE = None # Plain-tuple twin of MOD6_SCORES (Numba closure constants)
 
 CLEAN_THRESHOLD = 3.0  
 MESSY_THRESHOLD = 20.0 
@@ -21,127 +41,185 @@ MAX_SIGNATURE_SEARCH_DEPTH = 4 # Ranks 2, 3, 4
 
 def load_engine_data():
     """Loads the v_mod6 messiness map."""
-    global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
-        return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
+    global MESSINESS_MAP_V_MOD6, MOD6_SCORES, MOD6_SCORES_PLUS1, MOD6_TUPLE
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
+    MOD6_TUPLE = mod6_table(MESSINESS_MAP_V_MOD6)
+    MOD6_SCORES = np.array(MOD6_TUPLE, dtype=np.float64)
+    # Fold the v11.0 "+1.0" in once so scoring is a single multiply
+    MOD6_SCORES_PLUS1 = MOD6_SCORES + 1.0
+    print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
+    return True
+
+# --- Numba JIT Kernels (used when numba is installed) ---
+# v11.0 winner and v23.0 flip as a plain scalar loop over an int64
+# candidate array so nopython mode can compile it: no dicts, no lists,
+# no sorting (only the minimum of each bin is ever needed). The residue is
+# recomputed per candidate: % 6 by a constant is a multiply and shift, and
+# carrying residues or gaps over from the previous p_n (nine of the ten
+# candidates are shared) measured slower and would serialize the prange.
+_NO_MESSY_GAP = np.iinfo(np.int64).max
+_count_successes_jit = None # Set by warm_up_kernels for the loaded map
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def v11_v23_predict(p_n, cands, mod6_plus1, min_plus1, is_messy):
+        """v11.0 and v23.0 for one p_n: returns (pred_v11, pred_v23)."""
+        best_score = np.inf
+        best_prime = cands[0]
+        best_gap = cands[0] - p_n
+        # Sentinel gap: with no Messy candidate the flip test below is
+        # simply false, so the final choice is a single select (cmov).
+        messy_gap = _NO_MESSY_GAP
+        messy_prime = best_prime
+        for q_i in cands:
+            gap_g_i = q_i - p_n
+            if min_plus1 * gap_g_i >= best_score: # No later candidate can win or flip
+                break
+            residue = (p_n + q_i) % 6
+            score = mod6_plus1[residue] * gap_g_i
+            if score < best_score:
+                best_score = score
+                best_prime = q_i
+                best_gap = gap_g_i
+            if is_messy[residue] and gap_g_i < messy_gap:
+                messy_gap = gap_g_i
+                messy_prime = q_i
+        return best_prime, (messy_prime if messy_gap < best_gap else best_prime)
+
+def build_numba_kernel(mod6_tuple, messy_thresh):
+    """
+    Compiles the JIT sweep for one loaded map. The per-residue v11.0
+    multipliers and Messy flags are closure constants, so LLVM folds them
+    into the inlined v11_v23_predict instead of reading two tables per
+    candidate. Numba keys its on-disk cache on those constants: one build
+    per distinct map.
+    """
+    mod6_plus1 = tuple(rate + 1.0 for rate in mod6_tuple)
+    min_plus1 = min(mod6_plus1)
+    is_messy = tuple(rate > messy_thresh for rate in mod6_tuple)
 
-def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
-    """The v11.0 "Weighted Gap" Engine Core (Multiplicative)."""
-    if MESSINESS_MAP_V_MOD6 is None: return float('inf')
-    score_mod6 = MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-    if score_mod6 == float('inf'): return float('inf')
-    # Add 1.0 to avoid 0*gap issues and normalize scoring
-    return (score_mod6 + 1.0) * gap_g_n
-
-def get_vmod6_score(anchor_sn):
-    """Helper to get *only* the v_mod6 rate."""
-    if MESSINESS_MAP_V_MOD6 is None: return float('inf')
-    return MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-
-# --- V11.0 BASELINE FUNCTION (The missing definition) ---
-def get_v11_multiplicative_prediction(p_n, candidates):
-    """v11.0 Multiplicative Core: (v_mod6 + 1.0) * gap. Returns the winner prime."""
-    candidate_scores = []
-    for q_i in candidates:
-        S_cand = p_n + q_i
-        gap_g_i = q_i - p_n
-        score = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-        candidate_scores.append((score, q_i))
-
-    candidate_scores.sort(key=lambda x: x[0])
-    return candidate_scores[0][1]
-# --- END V11.0 BASELINE FUNCTION ---
-
-
-# --- v23.0 FINAL LOGIC ---
-def get_v23_internal_flip_prediction(p_n, candidates):
+    @njit(parallel=True, cache=True)
+    def count_successes(prime_arr, start, end, num_cands):
+        """
+        Runs v11_v23_predict for every p_n in prime_arr[start:end] across all
+        cores (each p_n is independent). Returns (v11 hits, v23 hits).
+        """
+        hits_v11 = 0
+        hits_v23 = 0
+        for i in prange(start, end):
+            pred_v11, pred_v23 = v11_v23_predict(
+                prime_arr[i], prime_arr[i + 1:i + 1 + num_cands], mod6_plus1, min_plus1, is_messy)
+            true_p_n_plus_1 = prime_arr[i + 1]
+            if pred_v11 == true_p_n_plus_1:
+                hits_v11 += 1
+            if pred_v23 == true_p_n_plus_1:
+                hits_v23 += 1
+        return hits_v11, hits_v23
+
+    return count_successes
+
+def warm_up_kernels():
+    """Builds and compiles the JIT sweep once so compile time is not billed to the test."""
+    global _count_successes_jit
+    if _C_KERNEL_AVAILABLE or not _NUMBA_AVAILABLE:
+        return
+    start_time = time.time()
+    _count_successes_jit = build_numba_kernel(MOD6_TUPLE, MESSY_THRESHOLD)
+    dummy = np.arange(3, 3 + 4 * NUM_CANDIDATES_TO_CHECK, 2, dtype=np.int64)
+    _count_successes_jit(dummy, 0, 2, NUM_CANDIDATES_TO_CHECK)
+    print(f"Compiled Numba kernels in {time.time() - start_time:.2f} seconds.")
+
+# --- Vectorized Batch Engine (NumPy broadcasting) ---
+def predict_batch(prime_arr, primes_mod6, start, end):
+    """
+    Runs v11.0 and v23.0 for every p_n in prime_arr[start:end] at once.
+    Each row of the (N, NUM_CANDIDATES_TO_CHECK) window matrix is one p_n's
+    candidate list. primes_mod6 is prime_arr % 6 as uint8 (see
+    residues_mod6). Returns (pred_v11, pred_v23) as int64 arrays.
+    """
+    p = prime_arr[start:end, None]
+    Q = np.lib.stride_tricks.sliding_window_view(
+        prime_arr[start + 1:end + NUM_CANDIDATES_TO_CHECK], NUM_CANDIDATES_TO_CHECK)
     
-    # 1. Build the full evidence list and isolate bins
-    candidates_data = []
-    messy_bin = []
+    # S % 6 == (p_n % 6 + q_i % 6) % 6, so the anchor S = p_n + q_i is never
+    # materialized: the residue comes from a uint8 add on precomputed values.
+    q_mod6 = np.lib.stride_tricks.sliding_window_view(
+        primes_mod6[start + 1:end + NUM_CANDIDATES_TO_CHECK], NUM_CANDIDATES_TO_CHECK)
+    s_mod6 = (primes_mod6[start:end, None] + q_mod6) % 6
     
-    for q_i in candidates:
-        S_cand = p_n + q_i
-        gap_g_i = q_i - p_n
-        
-        score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-        vmod6_rate = get_vmod6_score(S_cand)
-        
-        data = (score_v11, q_i, vmod6_rate, gap_g_i)
-        candidates_data.append(data)
-        
-        if vmod6_rate > MESSY_THRESHOLD:
-            messy_bin.append(data)
-
-    # 2. Get the Overall v11.0 Winner (The Baseline Arithmetic Winner)
-    candidates_data.sort(key=lambda x: x[0])
-    v11_winner_score, v11_winner_prime, _, v11_winner_gap = candidates_data[0]
+    # Primes need int64, but gaps and scores do not: int32 gaps and float32
+    # scores halve the bytes moved through the argmin passes.
+    gaps = (Q - p).astype(np.int32)
+    rates = MOD6_SCORES.astype(np.float32)[s_mod6]
+    scores = np.multiply(MOD6_SCORES_PLUS1.astype(np.float32)[s_mod6], gaps, dtype=np.float32)
     
-    final_prediction = v11_winner_prime # Default prediction
-
-    # --- 3. Find the Structural Minimum (The "Cleanest Messy") ---
+    # v11.0 winner per row (argmin keeps the first candidate on ties)
+    win_idx = scores.argmin(axis=1)[:, None]
+    pred_v11 = np.take_along_axis(Q, win_idx, axis=1)[:, 0]
+    v11_winner_gap = np.take_along_axis(gaps, win_idx, axis=1)[:, 0]
     
-    # Sort the Messy Bin by gap (Closeness). We are looking for the prime
-    # in the Messy group that is the absolute closest.
-    if messy_bin:
-        messy_bin.sort(key=lambda x: x[3]) # Sort by gap (index 3)
-        g_messy_low = messy_bin[0][3]
-        p_messy_low = messy_bin[0][1]
-        
-        # --- 4. Apply the Analytic Logic Gate (The Flip Trigger) ---
-        
-        # Condition X: Is the lowest gap in the Messy Bin (g_messy_low) 
-        # LOWER than the gap of the overall arithmetic winner (v11_winner_gap)?
-        if g_messy_low < v11_winner_gap:
-            # The Flip: Structural necessity (low gap) overrides arithmetic winner
-            final_prediction = p_messy_low
+    # v23.0 can only flip rows that have at least one Messy candidate;
+    # the gather and reduction below skip every other row.
+    messy_mask = rates > MESSY_THRESHOLD
+    any_messy = messy_mask.any(axis=1)
+    n_messy = np.count_nonzero(any_messy)
+    if n_messy == 0:
+        return pred_v11, pred_v11.copy()
+    # A slice keeps views when (as on real data) almost every row qualifies
+    rows = np.flatnonzero(any_messy) if n_messy < len(any_messy) // 2 else slice(None)
+    
+    # Closest Messy candidate per remaining row. Non-messy slots get the
+    # int32 max sentinel so argmin never picks them.
+    messy_gaps = np.where(messy_mask[rows], gaps[rows], np.iinfo(np.int32).max)
+    messy_idx = messy_gaps.argmin(axis=1)[:, None]
+    g_messy_low = np.take_along_axis(messy_gaps, messy_idx, axis=1)[:, 0]
+    p_messy_low = np.take_along_axis(Q[rows], messy_idx, axis=1)[:, 0]
+    
+    # The Flip as a branchless per-row select instead of an if per prime
+    pred_v23 = pred_v11.copy()
+    pred_v23[rows] = np.where(g_messy_low < v11_winner_gap[rows], p_messy_low, pred_v11[rows])
+    
+    return pred_v11, pred_v23
 
-    return final_prediction
+def residues_mod6(prime_arr):
+    """Precomputes p % 6 for every prime once, as a compact uint8 array."""
+    return (prime_arr % 6).astype(np.uint8)
 
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 # Max primes to search
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
+# p_n values per vectorized batch: keeps the (N, 10) intermediates ~80MB
+# each instead of several GB for the full 50M range
+CHUNK_SIZE = 1000000
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr
 
 # --- Main Testing Logic ---
 def run_PLR_v23_internal_flip_test():
     
     if not load_engine_data(): return
         
-    prime_list = load_primes_from_file(PRIME_INPUT_FILE)
-    if prime_list is None: return
+    prime_arr = load_primes_from_file(PRIME_INPUT_FILE)
+    if prime_arr is None: return
+    primes_mod6 = residues_mod6(prime_arr)
+
+    warm_up_kernels()
 
     print(f"\nStarting PLR 'Internal Flip' Test (v23.0) for {PRIMES_TO_TEST:,} primes...")
     print(f"  - Baseline: v11.0 (60.49% Multiplicative Core)")
@@ -149,44 +227,42 @@ def run_PLR_v23_internal_flip_test():
     print("-" * 80)
     start_time = time.time()
     
-    total_predictions = 0
-    total_successes_v11_baseline = 0
-    total_successes_v23_new_champ = 0
-    
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    if loop_end_index >= len(prime_list) - (NUM_CANDIDATES_TO_CHECK + 2):
+    if loop_end_index >= len(prime_arr) - (NUM_CANDIDATES_TO_CHECK + 2):
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v23_acc = (total_successes_v23_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
-            v11_acc = (total_successes_v11_baseline / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v23.0 Acc: {v23_acc:.2f}% | v11.0 Acc: {v11_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
+    total_predictions = 0
+    total_successes_v11_baseline = 0
+    total_successes_v23_new_champ = 0
 
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    # --- Run both engines one cache-sized block of p_n at a time ---
+    # C kernel if built, else Numba parallel prange sweep, else NumPy batch.
+    for chunk_start in range(START_INDEX, loop_end_index, CHUNK_SIZE):
+        chunk_end = min(chunk_start + CHUNK_SIZE, loop_end_index)
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+        if _C_KERNEL_AVAILABLE:
+            hits_v11, hits_v23 = plr_score.count_successes(
+                prime_arr, chunk_start, chunk_end, NUM_CANDIDATES_TO_CHECK,
+                MOD6_SCORES, MOD6_SCORES_PLUS1, MESSY_THRESHOLD)
+        elif _NUMBA_AVAILABLE:
+            hits_v11, hits_v23 = _count_successes_jit(
+                prime_arr, chunk_start, chunk_end, NUM_CANDIDATES_TO_CHECK)
+        else:
+            pred_v11, pred_v23 = predict_batch(prime_arr, primes_mod6, chunk_start, chunk_end)
+            true_p_n_plus_1 = prime_arr[chunk_start + 1:chunk_end + 1]
+            hits_v11 = int((pred_v11 == true_p_n_plus_1).sum())
+            hits_v23 = int((pred_v23 == true_p_n_plus_1).sum())
         
-        # --- Run both engines ---
+        total_predictions += chunk_end - chunk_start
+        total_successes_v11_baseline += hits_v11
+        total_successes_v23_new_champ += hits_v23
         
-        # v11.0 Baseline
-        pred_v11 = get_v11_multiplicative_prediction(p_n, candidates)
-        if pred_v11 == true_p_n_plus_1:
-            total_successes_v11_baseline += 1
-        
-        # v23.0 Challenger
-        pred_v23 = get_v23_internal_flip_prediction(p_n, candidates)
-        if pred_v23 == true_p_n_plus_1:
-            total_successes_v23_new_champ += 1
-            
-        total_predictions += 1
+        elapsed = time.time() - start_time
+        v23_acc = (total_successes_v23_new_champ / total_predictions) * 100
+        v11_acc = (total_successes_v11_baseline / total_predictions) * 100
+        print(f"Progress: {total_predictions:,} / {PRIMES_TO_TEST:,} | v23.0 Acc: {v23_acc:.2f}% | v11.0 Acc: {v11_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
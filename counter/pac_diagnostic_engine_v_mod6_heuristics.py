@@ -5,37 +5,36 @@
 # data file, which was generated by 'test-9_mod6-Reside-Analysis.py'.
 # ==============================================================================
 
-import json
+import os
+import sys
 import math
 
+# The shared map loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from plr_common import load_mod6_map, mod6_table
+
 ENGINE_DATA_FILE = "../data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
+MOD6_TUPLE = None # Dense length-6 view of the map (index = S % 6)
 
 def load_engine_data():
-    """Loads the v_mod6 messiness map from the JSON file."""
-    global MESSINESS_MAP_V_MOD6
-    try:
-        with open(ENGINE_DATA_FILE, 'r') as f:
-            data = json.load(f)
-            # Convert string keys back to integers
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in data.items()}
-            return True
-    except FileNotFoundError:
-        print(f"FATAL ERROR: Engine file '{ENGINE_DATA_FILE}' not found.")
+    """Loads the v_mod6 messiness map (shared loader, parsed once per process)."""
+    global MESSINESS_MAP_V_MOD6, MOD6_TUPLE
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(ENGINE_DATA_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         print("Please run 'test-9_mod6-Reside-Analysis.py' first to create this file.")
         return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
-        return False
+    MOD6_TUPLE = mod6_table(MESSINESS_MAP_V_MOD6)
+    return True
 
 def get_messiness_score_v_mod6(anchor_sn):
     """The PAC Diagnostic Engine (v_mod6)."""
-    if MESSINESS_MAP_V_MOD6 is None:
+    if MOD6_TUPLE is None:
         return float('inf') 
         
     residue = anchor_sn % 6
     
     # Look up the score (failure rate) from our verified data
-    score = MESSINESS_MAP_V_MOD6.get(residue, float('inf'))
+    score = MOD6_TUPLE[residue]
     
     return score
\ No newline at end of file
@@ -16,9 +16,21 @@
 # will still show an accuracy significantly > 10%.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
 
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from plr_common import load_primes
+
 # --- The New "Neutral" Engine (v_Tautology) ---
 def get_ideal_grid_score(anchor_sn):
     """
@@ -35,6 +47,32 @@ def get_ideal_grid_score(anchor_sn):
         return 2
     else:
         return 3 # Worst score
+
+if _NUMBA_AVAILABLE:
+    # The same scoring function, compiled: four modulo checks on native ints
+    _ideal_grid_score_jit = njit(cache=True)(get_ideal_grid_score)
+
+    @njit(cache=True)
+    def ideal_grid_batch(prime_arr, start, end, num_cands):
+        """
+        JIT version of the test loop for p_n in prime_arr[start:end].
+        Picks the lowest 'Ideal Grid' score (first candidate on ties, like
+        the stable sort) and returns the number of correct predictions.
+        """
+        successes = 0
+        for i in range(start, end):
+            p_n = prime_arr[i]
+            best_score = 4
+            predicted_p_n_plus_1 = prime_arr[i + 1]
+            for j in range(1, num_cands + 1):
+                q_i = prime_arr[i + j]
+                messiness_score = _ideal_grid_score_jit(p_n + q_i)
+                if messiness_score < best_score:
+                    best_score = messiness_score
+                    predicted_p_n_plus_1 = q_i
+            if predicted_p_n_plus_1 == prime_arr[i + 1]:
+                successes += 1
+        return successes
 # --- End Engine Setup ---
 
 
@@ -43,22 +81,15 @@ PRIME_INPUT_FILE = "../prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
+CHUNK_SIZE = 100000 # p_n per block; progress is printed between blocks
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_list = load_primes(filename)
+    if prime_list is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
     if len(prime_list) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
@@ -71,6 +102,9 @@ def run_PLR_tautology_test():
     
     prime_list = load_primes_from_file(PRIME_INPUT_FILE)
     if prime_list is None: return
+    if not _NUMBA_AVAILABLE:
+        # The pure-Python loop indexes plain ints faster than NumPy scalars
+        prime_list = prime_list.tolist()
 
     print(f"\nStarting PLR Tautology Test for {PRIMES_TO_TEST:,} primes...")
     print(f"  - Using NEUTRAL 'Ideal Grid Score' Engine (P_4, P_3, P_2)")
@@ -83,40 +117,45 @@ def run_PLR_tautology_test():
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            accuracy = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Successes: {total_successes:,} | Accuracy: {accuracy:.2f}% | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            q_i = prime_list[i + j]
-            candidates.append(q_i)
-        
-        true_p_n_plus_1 = candidates[0]
+    for chunk_start in range(START_INDEX, loop_end_index, CHUNK_SIZE):
+        chunk_end = min(chunk_start + CHUNK_SIZE, loop_end_index)
         
-        candidate_scores = []
-        for q_i in candidates:
-            S_cand = p_n + q_i
-            
-            # --- Call the NEUTRAL Engine ---
-            messiness_score = get_ideal_grid_score(S_cand)
-            # ---
-            
-            candidate_scores.append((messiness_score, q_i))
-            
-        # Find the Best Candidate (lowest score / cleanest)
-        candidate_scores.sort(key=lambda x: x[0])
-        best_score, predicted_p_n_plus_1 = candidate_scores[0]
+        if _NUMBA_AVAILABLE:
+            total_successes += ideal_grid_batch(prime_list, chunk_start, chunk_end, NUM_CANDIDATES_TO_CHECK)
+            total_predictions += chunk_end - chunk_start
+        else:
+            for i in range(chunk_start, chunk_end):
+                p_n = prime_list[i]
+                
+                # One slice per anchor instead of NUM_CANDIDATES_TO_CHECK appends
+                candidates = prime_list[i + 1:i + 1 + NUM_CANDIDATES_TO_CHECK]
+                
+                true_p_n_plus_1 = candidates[0]
+                
+                # Find the Best Candidate (lowest score / cleanest).
+                # Tracked minimum; strict < keeps the first candidate on ties.
+                best_score = 4
+                predicted_p_n_plus_1 = true_p_n_plus_1
+                for q_i in candidates:
+                    S_cand = p_n + q_i
+                    
+                    # --- Call the NEUTRAL Engine ---
+                    messiness_score = get_ideal_grid_score(S_cand)
+                    # ---
+                    
+                    if messiness_score < best_score:
+                        best_score = messiness_score
+                        predicted_p_n_plus_1 = q_i
+                
+                total_predictions += 1
+                if predicted_p_n_plus_1 == true_p_n_plus_1:
+                    total_successes += 1
         
-        total_predictions += 1
-        if predicted_p_n_plus_1 == true_p_n_plus_1:
-            total_successes += 1
-            
+        # Progress once per chunk, outside the per-prime loop
+        elapsed = time.time() - start_time
+        accuracy = (total_successes / total_predictions) * 100
+        print(f"Progress: {total_predictions:,} / {PRIMES_TO_TEST:,} | Successes: {total_successes:,} | Accuracy: {accuracy:.2f}% | Time: {elapsed:.0f}s", end='\r')
+                
     # --- Final Summary ---
     progress = PRIMES_TO_TEST
     accuracy = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
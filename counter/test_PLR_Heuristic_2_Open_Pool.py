@@ -15,8 +15,23 @@
 # the *true next prime*, p_{n+1}.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
+
+import numpy as np
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from plr_common import load_primes
+
 # Import our champion v_mod6 engine
 from pac_diagnostic_engine_v_mod6_heuristics import get_messiness_score_v_mod6, load_engine_data
 
@@ -28,29 +43,82 @@ PRIMES_TO_TEST = 10000000
 # We'll check the 150 integers immediately following p_n
 OPEN_POOL_RANGE = 150
 START_INDEX = 10 
+CHUNK_SIZE = 10000 # p_n per block; progress is printed between blocks
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def open_pool_batch(prime_arr, start, end, pool_range, best_offset):
+        """
+        JIT version of the test loop for p_n in prime_arr[start:end].
+        best_offset is the table from build_best_offset_table().
+        Returns (predictions, successes, composite picks).
+        """
+        predictions = 0
+        successes = 0
+        composites = 0
+        for i in range(start, end):
+            p_n = prime_arr[i]
+            true_p_n_plus_1 = prime_arr[i + 1]
+            if true_p_n_plus_1 > p_n + pool_range:
+                continue
+
+            predicted_x = p_n + best_offset[p_n % 6]
+
+            predictions += 1
+            if predicted_x == true_p_n_plus_1:
+                successes += 1
+
+            # Same forward walk as is_prime_after()
+            j = i + 1
+            while prime_arr[j] < predicted_x:
+                j += 1
+            if prime_arr[j] != predicted_x:
+                composites += 1
+        return predictions, successes, composites
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
-        return None, None
-    
-    prime_set = set(prime_list) # We need the prime set to find the *true* next prime
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes and created set in {end_time - start_time:.2f} seconds.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_list = load_primes(filename)
+    if prime_list is None:
+        return None
     
     required_primes = PRIMES_TO_TEST + START_INDEX + OPEN_POOL_RANGE + 2
     if len(prime_list) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
-        return None, None
+        return None
         
-    return prime_list, prime_set
+    return prime_list
+
+def is_prime_after(prime_list, i, x):
+    """
+    Primality oracle for an x in the open pool of p_n = prime_list[i].
+    x is at most OPEN_POOL_RANGE past p_n, so walking forward from
+    prime_list[i + 1] takes a step or two on the cache lines already in
+    use, with no lookup structure and no search of the whole array.
+    """
+    j = i + 1
+    while prime_list[j] < x:
+        j += 1
+    return prime_list[j] == x
+
+def build_best_offset_table(pool_range):
+    """
+    Scores the whole open pool once per residue class of p_n.
+    S = 2*p_n + x_offset, so the v_mod6 score of every integer in the pool
+    depends only on p_n % 6 and x_offset. Entry r is the offset the engine
+    picks for any p_n with p_n % 6 == r (first integer on ties, like the
+    stable sort).
+    """
+    best_offset = np.ones(6, dtype=np.int64)
+    for p_mod6 in range(6):
+        best_score = float('inf')
+        for x_offset in range(1, pool_range + 1):
+            messiness_score = get_messiness_score_v_mod6(2 * p_mod6 + x_offset)
+            if messiness_score < best_score:
+                best_score = messiness_score
+                best_offset[p_mod6] = x_offset
+    return best_offset
 
 # --- Main Testing Logic ---
 def run_PLR_open_pool_test():
@@ -60,7 +128,7 @@ def run_PLR_open_pool_test():
         print("Stopping test: v_mod6 Engine data could not be loaded.")
         return
         
-    prime_list, prime_set = load_primes_from_file(PRIME_INPUT_FILE)
+    prime_list = load_primes_from_file(PRIME_INPUT_FILE)
     if prime_list is None: return
 
     print(f"\nStarting PLR 'Open Pool' Test for {PRIMES_TO_TEST:,} primes...")
@@ -74,52 +142,47 @@ def run_PLR_open_pool_test():
     total_engine_failed_to_find_prime = 0
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
+    best_offset = build_best_offset_table(OPEN_POOL_RANGE)
     
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 10000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            accuracy = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Successes: {total_successes:,} | Accuracy: {accuracy:.2f}% | Time: {elapsed:.0f}s", end='\r')
-
-        # 1. Get Base Prime
-        p_n = prime_list[i]
+    for chunk_start in range(START_INDEX, loop_end_index, CHUNK_SIZE):
+        chunk_end = min(chunk_start + CHUNK_SIZE, loop_end_index)
         
-        # 2. Find the *true* next prime (our target)
-        true_p_n_plus_1 = prime_list[i + 1]
-        
-        # Check if the true next prime is outside our search range
-        if true_p_n_plus_1 > (p_n + OPEN_POOL_RANGE):
-            # This is a large prime gap, we can't test this one.
-            continue
-            
-        # --- 3. Score all candidates in the "Open Pool" ---
-        candidate_scores = [] # Store as (score, integer)
-        
-        for x_offset in range(1, OPEN_POOL_RANGE + 1):
-            candidate_x = p_n + x_offset
+        if _NUMBA_AVAILABLE:
+            predictions, successes, composites = open_pool_batch(prime_list, chunk_start, chunk_end, OPEN_POOL_RANGE, best_offset)
+            total_predictions += predictions
+            total_successes += successes
+            total_engine_failed_to_find_prime += composites
+        else:
+            for i in range(chunk_start, chunk_end):
+                # 1. Get Base Prime
+                p_n = prime_list[i]
             
-            # Create the hypothetical anchor
-            S_cand = p_n + candidate_x
+                # 2. Find the *true* next prime (our target)
+                true_p_n_plus_1 = prime_list[i + 1]
             
-            # --- Call the v_mod6 Engine ---
-            messiness_score = get_messiness_score_v_mod6(S_cand)
-            # ---
+                # Check if the true next prime is outside our search range
+                if true_p_n_plus_1 > (p_n + OPEN_POOL_RANGE):
+                    # This is a large prime gap, we can't test this one.
+                    continue
+                
+                # --- 3 & 4. Best candidate in the "Open Pool" ---
+                # The pool was scored once per p_n % 6 by build_best_offset_table()
+                predicted_x = p_n + best_offset[p_n % 6]
             
-            candidate_scores.append((messiness_score, candidate_x))
+                # 5. Tally the Prediction
+                total_predictions += 1
+                if predicted_x == true_p_n_plus_1:
+                    total_successes += 1
             
-        # 4. Find the Best Candidate (lowest score)
-        candidate_scores.sort(key=lambda x: x[0])
-        best_score, predicted_x = candidate_scores[0]
-        
-        # 5. Tally the Prediction
-        total_predictions += 1
-        if predicted_x == true_p_n_plus_1:
-            total_successes += 1
+                # Check if the engine's pick was even a prime number
+                if not is_prime_after(prime_list, i, predicted_x):
+                    total_engine_failed_to_find_prime += 1
         
-        # Check if the engine's pick was even a prime number
-        if predicted_x not in prime_set:
-            total_engine_failed_to_find_prime += 1
+        # Progress once per chunk, outside the per-prime loop
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        accuracy = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Successes: {total_successes:,} | Accuracy: {accuracy:.2f}% | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
@@ -20,81 +20,150 @@
 #    "noisy" candidate list (it may have 20+ candidates).
 # 3. Run the v16.0 "Chained Signature" engine on this list.
 # 4. Check if the winner is the true p_{n+1}.
+#
+# Optional C kernel (fastest path), from the repository root:
+#   python setup.py build_ext --inplace
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
 from collections import defaultdict
 
+import numpy as np
+
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+# The shared loaders and helpers live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from plr_common import load_primes, load_mod6_map, mod6_table, v16_prediction, open_pool_ends, mod6_lut
+
+try:
+    from plr_score import v16_open_pool # Optional C kernel: python setup.py build_ext --inplace
+    _C_KERNEL_AVAILABLE = True
+except ImportError:
+    _C_KERNEL_AVAILABLE = False
+
 # --- Engine Setup (v16.0 "Chained Signature") ---
 MOD6_ENGINE_FILE = "../data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
+MOD6_TUPLE = None # Plain-tuple view of the map (index = S % 6)
+MOD6_SCORES = None # float64 array twin of MOD6_TUPLE for the JIT kernels
 
 CLEAN_THRESHOLD = 3.0  
 MESSY_THRESHOLD = 20.0 
 MAX_SIGNATURE_SEARCH_DEPTH = 4 # Ranks 2, 3, 4
+SUB_BLOCK_SIZE = 4096 # p_n per parallel work item in the JIT kernel
 
 def load_engine_data():
     """Loads the v_mod6 messiness map."""
-    global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
-        return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
+    global MESSINESS_MAP_V_MOD6, MOD6_TUPLE, MOD6_SCORES
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
+    MOD6_TUPLE = mod6_table(MESSINESS_MAP_V_MOD6)
+    MOD6_SCORES = np.array(MOD6_TUPLE, dtype=np.float64)
+    print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
+    return True
 
-def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
-    """The v11.0 "Weighted Gap" Engine Core."""
-    if MESSINESS_MAP_V_MOD6 is None: return float('inf')
-    score_mod6 = MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-    if score_mod6 == float('inf'): return float('inf')
-    return (score_mod6 + 1.0) * gap_g_n
-
-def get_vmod6_score(anchor_sn):
-    """Helper to get *only* the v_mod6 rate."""
-    if MESSINESS_MAP_V_MOD6 is None: return float('inf')
-    return MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-
-def get_v16_prediction(p_n, candidates):
-    """
-    Runs the full v16.0 "Chained Signature" logic.
-    'candidates' is now our "noisy" list of primes from the pool.
-    """
-    candidate_scores = []
-    for q_i in candidates:
-        S_cand = p_n + q_i
-        gap_g_i = q_i - p_n
-        score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-        vmod6_rate = get_vmod6_score(S_cand)
-        candidate_scores.append((score_v11, q_i, vmod6_rate))
-
-    candidate_scores.sort(key=lambda x: x[0])
-    
-    # If no candidates were found in the pool, return None
-    if not candidate_scores:
-        return None
-        
-    winner_v11_prime = candidate_scores[0][1]
-    winner_v11_vmod6 = candidate_scores[0][2]
-    
-    prediction_v16 = winner_v11_prime # Default
-    
-    if winner_v11_vmod6 < CLEAN_THRESHOLD: 
-        for rank_index in range(1, MAX_SIGNATURE_SEARCH_DEPTH): # Ranks 2, 3, 4
-            if rank_index >= len(candidate_scores): break
-            next_candidate_vmod6 = candidate_scores[rank_index][2]
-            if next_candidate_vmod6 > MESSY_THRESHOLD:
-                prediction_v16 = candidate_scores[rank_index][1]
-                break
-                
-    return prediction_v16
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def predict_from_window_v16(prime_arr, i, pool_size, mod6_scores, mod6_lut, clean, messy,
+                                buf_scores, buf_primes):
+        """
+        Fused Open Pool + v16.0 for p_n = prime_arr[i]: walks the primes in
+        (p_n, p_n + pool_size] and scores them as it goes, without building
+        a candidate list. buf_scores / buf_primes (length DEPTH - 1) are
+        caller-owned scratch for the runner-up ranks. Returns
+        (prediction, primes in pool); an empty pool returns (0, 0).
+        """
+        p_n = prime_arr[i]
+        limit = p_n + pool_size
+        n_primes = len(prime_arr)
+        base = (2 * p_n) % 6 # (p_n + q_i) % 6 == mod6_lut[base + gap]
+
+        # Rank 1 in the same pass that finds the pool
+        winner_index = 0
+        winner_score = np.inf
+        j = i + 1
+        while j < n_primes and prime_arr[j] <= limit:
+            q_i = prime_arr[j]
+            gap_g_i = q_i - p_n
+            score_v11 = (mod6_scores[mod6_lut[base + gap_g_i]] + 1.0) * gap_g_i
+            if score_v11 < winner_score:
+                winner_score = score_v11
+                winner_index = j
+            j += 1
+        pool_end = j
+        if pool_end == i + 1:
+            return 0, 0
+        if winner_index == 0: # Every score was inf: first candidate, like the sort
+            winner_index = i + 1
+
+        prediction_v16 = prime_arr[winner_index]
+        if mod6_scores[mod6_lut[base + prediction_v16 - p_n]] < clean:
+            # Insertion-sorted runner-up buffer, as in plr_common.v16_prediction
+            slots = len(buf_scores)
+            filled = 0
+            for j in range(i + 1, pool_end):
+                if j == winner_index:
+                    continue
+                q_i = prime_arr[j]
+                gap_g_i = q_i - p_n
+                score_v11 = (mod6_scores[mod6_lut[base + gap_g_i]] + 1.0) * gap_g_i
+                pos = filled
+                while pos > 0 and buf_scores[pos - 1] > score_v11:
+                    pos -= 1
+                if pos < slots:
+                    last = min(filled, slots - 1)
+                    for m in range(last, pos, -1):
+                        buf_scores[m] = buf_scores[m - 1]
+                        buf_primes[m] = buf_primes[m - 1]
+                    buf_scores[pos] = score_v11
+                    buf_primes[pos] = q_i
+                    if filled < slots:
+                        filled += 1
+            for r in range(filled):
+                if mod6_scores[mod6_lut[base + buf_primes[r] - p_n]] > messy:
+                    prediction_v16 = buf_primes[r]
+                    break
+        return prediction_v16, pool_end - (i + 1)
+
+    @njit(parallel=True, cache=True)
+    def v16_open_pool_batch(prime_arr, start, end, pool_size, mod6_scores, mod6_lut, clean, messy,
+                            depth, sub_block_size):
+        """
+        JIT version of the test loop for p_n in prime_arr[start:end]. The
+        range is cut into contiguous sub-blocks of sub_block_size p_n, run
+        in parallel: each sub-block sweeps its own stretch of the prime
+        array (consecutive pools overlap, so it stays in cache) and reuses
+        one scratch buffer instead of allocating one per p_n.
+        Returns (predictions, successes, primes in pools).
+        """
+        predictions = 0
+        successes = 0
+        primes_in_pools = 0
+        n_blocks = (end - start + sub_block_size - 1) // sub_block_size
+        for b in prange(n_blocks):
+            buf_scores = np.empty(depth - 1)
+            buf_primes = np.empty(depth - 1, dtype=prime_arr.dtype)
+            block_start = start + b * sub_block_size
+            for i in range(block_start, min(block_start + sub_block_size, end)):
+                if prime_arr[i + 1] - prime_arr[i] > pool_size:
+                    continue # Prime gap > POOL_SIZE
+                prediction_v16, pool_count = predict_from_window_v16(
+                    prime_arr, i, pool_size, mod6_scores, mod6_lut, clean, messy,
+                    buf_scores, buf_primes)
+                predictions += 1
+                primes_in_pools += pool_count
+                if prediction_v16 == prime_arr[i + 1]:
+                    successes += 1
+        return predictions, successes, primes_in_pools
 # --- End Engine Setup ---
 
 # --- Configuration ---
@@ -103,30 +172,21 @@ PRIMES_TO_TEST = 50000000
 # We test all integers up to p_n + POOL_SIZE
 POOL_SIZE = 210 # A challenging pool, covers the first maximal gap
 START_INDEX = 10 
+CHUNK_SIZE = 100000 # p_n per block; progress is printed between blocks
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
-        return None, None
-    
-    # We need a prime set for fast "is_prime" lookups
-    prime_set = set(prime_list)
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes and created set in {end_time - start_time:.2f} seconds.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
+        return None
     
     required_primes = PRIMES_TO_TEST + START_INDEX + 10 # Just need a buffer
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
-        return None, None
+        return None
         
-    return prime_list, prime_set
+    return prime_arr
 
 # --- Main Testing Logic ---
 def run_PLR_v16_open_pool_test():
@@ -135,8 +195,8 @@ def run_PLR_v16_open_pool_test():
         print("Stopping test: Engine data could not be loaded.")
         return
         
-    prime_list, prime_set = load_primes_from_file(PRIME_INPUT_FILE)
-    if prime_list is None: return
+    prime_arr = load_primes_from_file(PRIME_INPUT_FILE)
+    if prime_arr is None: return
 
     print(f"\nStarting PLR 'Open Pool' Test (v16.0) for {PRIMES_TO_TEST:,} primes...")
     print(f"  - Engine: v16.0 (75.94% Champion)")
@@ -150,47 +210,63 @@ def run_PLR_v16_open_pool_test():
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    if loop_end_index >= len(prime_list) - 2: # Need i and i+1
+    if loop_end_index >= len(prime_arr) - 2: # Need i and i+1
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v16_acc = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
-            rand_acc = (total_predictions / total_primes_in_pools) * 100 if total_primes_in_pools > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v16.0 Acc: {v16_acc:.2f}% | Random: {rand_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    residue_lut = mod6_lut(POOL_SIZE)
+    for chunk_start in range(START_INDEX, loop_end_index, CHUNK_SIZE):
+        chunk_end = min(chunk_start + CHUNK_SIZE, loop_end_index)
         
-        # --- 1. Create the "Open Pool" of Candidates ---
-        open_pool_candidates = []
-        for k in range(1, POOL_SIZE + 1):
-            candidate_int = p_n + k
+        if _C_KERNEL_AVAILABLE:
+            predictions, successes, primes_in_pools = v16_open_pool(
+                prime_arr, chunk_start, chunk_end, POOL_SIZE, MOD6_SCORES,
+                CLEAN_THRESHOLD, MESSY_THRESHOLD, MAX_SIGNATURE_SEARCH_DEPTH)
+            total_predictions += predictions
+            total_successes += successes
+            total_primes_in_pools += primes_in_pools
+        elif _NUMBA_AVAILABLE:
+            predictions, successes, primes_in_pools = v16_open_pool_batch(
+                prime_arr, chunk_start, chunk_end, POOL_SIZE, MOD6_SCORES, residue_lut,
+                CLEAN_THRESHOLD, MESSY_THRESHOLD, MAX_SIGNATURE_SEARCH_DEPTH, SUB_BLOCK_SIZE)
+            total_predictions += predictions
+            total_successes += successes
+            total_primes_in_pools += primes_in_pools
+        else:
+            # Pool bounds for the whole block at once, then plain Python
+            # ints (block-relative indices) for the engine loop
+            pool_ends = (open_pool_ends(prime_arr, chunk_start, chunk_end, POOL_SIZE) - chunk_start).tolist()
+            block = prime_arr[chunk_start:chunk_start + pool_ends[-1] + 1].tolist()
+            # The true next prime is in the pool unless the gap is larger
+            # than POOL_SIZE. We skip those tests as they're outside the
+            # parameters: one np.diff per block picks the p_n to test.
+            gaps = np.diff(prime_arr[chunk_start:chunk_end + 1])
+            for k in np.flatnonzero(gaps <= POOL_SIZE).tolist():
+                p_n = block[k]
+                true_p_n_plus_1 = block[k + 1]
             
-            # This is our "Prime Oracle"
-            if candidate_int in prime_set:
-                open_pool_candidates.append(candidate_int)
-        
-        # Ensure the true prime was actually in our pool
-        if true_p_n_plus_1 not in open_pool_candidates:
-            # This happens if the prime gap > POOL_SIZE.
-            # We skip this test as it's outside the parameters.
-            continue
+                # --- 1. Create the "Open Pool" of Candidates ---
+                # Every prime in (p_n, p_n + POOL_SIZE], in ascending order
+                open_pool_candidates = block[k + 1:pool_ends[k]]
+                
+                total_predictions += 1
+                total_primes_in_pools += len(open_pool_candidates)
             
-        total_predictions += 1
-        total_primes_in_pools += len(open_pool_candidates)
-        
-        # --- 2. Get v16.0 Prediction ---
-        prediction_v16 = get_v16_prediction(p_n, open_pool_candidates)
-        
-        if prediction_v16 is None:
-            continue # No candidates were found (shouldn't happen here)
+                # --- 2. Get v16.0 Prediction ---
+                prediction_v16 = v16_prediction(
+                    p_n, open_pool_candidates, MOD6_TUPLE, CLEAN_THRESHOLD, MESSY_THRESHOLD, MAX_SIGNATURE_SEARCH_DEPTH)
+            
+                if prediction_v16 is None:
+                    continue # No candidates were found (shouldn't happen here)
 
-        if prediction_v16 == true_p_n_plus_1:
-            total_successes += 1
+                if prediction_v16 == true_p_n_plus_1:
+                    total_successes += 1
+        
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        v16_acc = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
+        rand_acc = (total_predictions / total_primes_in_pools) * 100 if total_primes_in_pools > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v16.0 Acc: {v16_acc:.2f}% | Random: {rand_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
@@ -16,16 +16,22 @@
 #
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
 from collections import defaultdict
 
+# The shared loaders and helpers live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from plr_common import load_primes, load_mod6_map, mod6_table, v16_prediction
+
 # --- Engine Setup (v16.0 "Chained Signature") ---
 # IMPORTANT: We are using the *original* data maps trained on primes 1-50M.
 # We are intentionally NOT retraining the model.
 MOD6_ENGINE_FILE = "../data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
+MOD6_TUPLE = None # Dense length-6 view of the map (index = S % 6)
 
 # --- These are the "Signature" thresholds ---
 CLEAN_THRESHOLD = 3.0  
@@ -34,62 +40,15 @@ MAX_SIGNATURE_SEARCH_DEPTH = 4 # Ranks 2, 3, 4
 
 def load_engine_data():
     """Loads the v_mod6 messiness map."""
-    global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) data from '{MOD6_ENGINE_FILE}'.")
-        print("Running in 'Replication' mode. Data map is from primes 1-50M.")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
-        return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
+    global MESSINESS_MAP_V_MOD6, MOD6_TUPLE
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
+    MOD6_TUPLE = mod6_table(MESSINESS_MAP_V_MOD6)
+    print(f"Loaded v_mod6 (Mod 6) data from '{MOD6_ENGINE_FILE}'.")
+    print("Running in 'Replication' mode. Data map is from primes 1-50M.")
+    return True
 
-def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
-    """The v11.0 "Weighted Gap" Engine Core."""
-    if MESSINESS_MAP_V_MOD6 is None: return float('inf')
-    score_mod6 = MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-    if score_mod6 == float('inf'): return float('inf')
-    return (score_mod6 + 1.0) * gap_g_n
-
-def get_vmod6_score(anchor_sn):
-    """Helper to get *only* the v_mod6 rate."""
-    if MESSINESS_MAP_V_MOD6 is None: return float('inf')
-    return MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-
-def get_v16_prediction(p_n, candidates):
-    """
-    Runs the full v16.0 "Chained Signature" logic.
-    """
-    candidate_scores = []
-    for q_i in candidates:
-        S_cand = p_n + q_i
-        gap_g_i = q_i - p_n
-        score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-        vmod6_rate = get_vmod6_score(S_cand)
-        candidate_scores.append((score_v11, q_i, vmod6_rate))
-
-    candidate_scores.sort(key=lambda x: x[0])
-    
-    if not candidate_scores: return None
-        
-    winner_v11_prime = candidate_scores[0][1]
-    winner_v11_vmod6 = candidate_scores[0][2]
-    
-    prediction_v16 = winner_v11_prime # Default
-    
-    if winner_v11_vmod6 < CLEAN_THRESHOLD: 
-        for rank_index in range(1, MAX_SIGNATURE_SEARCH_DEPTH): # Ranks 2, 3, 4
-            if rank_index >= len(candidate_scores): break
-            next_candidate_vmod6 = candidate_scores[rank_index][2]
-            if next_candidate_vmod6 > MESSY_THRESHOLD:
-                prediction_v16 = candidate_scores[rank_index][1]
-                break
-                
-    return prediction_v16
 # --- End Engine Setup ---
 
 # --- Configuration ---
@@ -99,30 +58,23 @@ PRIMES_TO_TEST = 49999900
 NUM_CANDIDATES_TO_CHECK = 10 
 # We *start* from the 50,000,010th prime
 START_INDEX = 50000010 
+CHUNK_SIZE = 100000 # p_n per block; progress is printed between blocks
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     # We must have 100M primes in the file for this test
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         print(f"This test requires at least {required_primes:,} primes.")
         return None
         
-    return prime_list
+    return prime_arr
 
 # --- Main Testing Logic ---
 def run_PLR_v16_replication_test():
@@ -131,8 +83,8 @@ def run_PLR_v16_replication_test():
         print("Stopping test: Engine data could not be loaded.")
         return
         
-    prime_list = load_primes_from_file(PRIME_INPUT_FILE)
-    if prime_list is None: return
+    prime_arr = load_primes_from_file(PRIME_INPUT_FILE)
+    if prime_arr is None: return
 
     print(f"\nStarting PLR 'Replication' Test (v16.0) for primes {START_INDEX:,} to {START_INDEX + PRIMES_TO_TEST:,}...")
     print(f"  - Engine: v16.0 (75.94% Champion)")
@@ -145,31 +97,35 @@ def run_PLR_v16_replication_test():
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    if loop_end_index >= len(prime_list) - (NUM_CANDIDATES_TO_CHECK + 2):
+    if loop_end_index >= len(prime_arr) - (NUM_CANDIDATES_TO_CHECK + 2):
         print("FATAL ERROR: PRIMES_TO_TEST + START_INDEX is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v16_acc = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v16.0 Acc: {v16_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    for chunk_start in range(START_INDEX, loop_end_index, CHUNK_SIZE):
+        chunk_end = min(chunk_start + CHUNK_SIZE, loop_end_index)
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+        # One int64 -> int conversion per block; the engine works on plain ints
+        block = prime_arr[chunk_start:chunk_end + NUM_CANDIDATES_TO_CHECK].tolist()
         
-        total_predictions += 1
-        
-        # Get v16.0 Prediction
-        prediction_v16 = get_v16_prediction(p_n, candidates)
+        for k in range(chunk_end - chunk_start):
+            p_n = block[k]
+            true_p_n_plus_1 = block[k + 1]
+            
+            candidates = block[k + 1:k + 1 + NUM_CANDIDATES_TO_CHECK]
+            
+            total_predictions += 1
+            
+            # Get v16.0 Prediction
+            prediction_v16 = v16_prediction(
+                p_n, candidates, MOD6_TUPLE, CLEAN_THRESHOLD, MESSY_THRESHOLD, MAX_SIGNATURE_SEARCH_DEPTH)
 
-        if prediction_v16 == true_p_n_plus_1:
-            total_successes += 1
+            if prediction_v16 == true_p_n_plus_1:
+                total_successes += 1
+        
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        v16_acc = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v16.0 Acc: {v16_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
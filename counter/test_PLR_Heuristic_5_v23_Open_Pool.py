@@ -12,14 +12,29 @@
 # 3. ELSE: PREDICT the standard v11.0 winner.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
 from collections import defaultdict
 
+import numpy as np
+
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+# The shared loaders and helpers live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from plr_common import load_primes, load_mod6_map, mod6_table, open_pool_ends, mod6_lut
+
 # --- Engine Setup (v23.0 Logic) ---
 MOD6_ENGINE_FILE = "../data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
+MOD6_TUPLE = None # Plain-tuple view of the map (index = S % 6)
+MOD6_SCORES = None # float64 array twin of MOD6_TUPLE for the JIT kernels
 
 CLEAN_THRESHOLD = 3.0  
 MESSY_THRESHOLD = 20.0 
@@ -27,109 +42,144 @@ POOL_SIZE = 210
 
 def load_engine_data():
     """Loads the v_mod6 messiness map."""
-    global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
+    global MESSINESS_MAP_V_MOD6, MOD6_TUPLE, MOD6_SCORES
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
-        return False
-
-def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
-    """The v11.0 "Weighted Gap" Engine Core (Multiplicative)."""
-    if MESSINESS_MAP_V_MOD6 is None: return float('inf')
-    score_mod6 = MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-    if score_mod6 == float('inf'): return float('inf')
-    return (score_mod6 + 1.0) * gap_g_n
-
-def get_vmod6_score(anchor_sn):
-    """Helper to get *only* the v_mod6 rate."""
-    if MESSINESS_MAP_V_MOD6 is None: return float('inf')
-    return MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-
+    MOD6_TUPLE = mod6_table(MESSINESS_MAP_V_MOD6)
+    MOD6_SCORES = np.array(MOD6_TUPLE, dtype=np.float64)
+    print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
+    return True
 
 # --- v23.0 FINAL LOGIC FUNCTION ---
 def get_v23_internal_flip_prediction(p_n, candidates):
     
-    # 1. Build the full evidence list and isolate bins
-    candidates_data = []
-    messy_bin = []
+    # 1. Single pass over the evidence: track the v11.0 winner and the
+    #    closest Messy candidate as we go (no lists, no sorting).
+    if not candidates: return None
+    
+    v11_winner_score = float('inf')
+    v11_winner_prime = candidates[0] # Kept if every score is inf, like the sort
+    v11_winner_gap = v11_winner_prime - p_n
+    g_messy_low = float('inf') # inf: no Messy candidate seen yet
+    p_messy_low = None
     
+    mod6 = MOD6_TUPLE # Scoring inlined: one tuple index per candidate
     for q_i in candidates:
-        S_cand = p_n + q_i
         gap_g_i = q_i - p_n
         
-        score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-        vmod6_rate = get_vmod6_score(S_cand)
-        
-        data = (score_v11, q_i, vmod6_rate, gap_g_i)
-        candidates_data.append(data)
+        vmod6_rate = mod6[(p_n + q_i) % 6]
+        score_v11 = (vmod6_rate + 1.0) * gap_g_i
         
-        if vmod6_rate > MESSY_THRESHOLD:
-            messy_bin.append(data)
-
-    # 2. Get the Overall v11.0 Winner (The Baseline Arithmetic Winner)
-    if not candidates_data: return None
+        # 2. The Overall v11.0 Winner (The Baseline Arithmetic Winner).
+        #    Strict '<' keeps the first candidate on ties, like a stable sort.
+        if score_v11 < v11_winner_score:
+            v11_winner_score = score_v11
+            v11_winner_prime = q_i
+            v11_winner_gap = gap_g_i
         
-    candidates_data.sort(key=lambda x: x[0])
-    v11_winner_score, v11_winner_prime, _, v11_winner_gap = candidates_data[0]
+        # 3. The Structural Minimum: the closest prime in the Messy Bin
+        if vmod6_rate > MESSY_THRESHOLD and gap_g_i < g_messy_low:
+            g_messy_low = gap_g_i
+            p_messy_low = q_i
     
     final_prediction = v11_winner_prime # Default prediction
 
-    # --- 3. Find the Structural Minimum and Apply Logic Gate ---
-    if messy_bin:
-        messy_bin.sort(key=lambda x: x[3]) # Sort Messy Bin by gap
-        g_messy_low = messy_bin[0][3]
-        p_messy_low = messy_bin[0][1]
-        
-        # Analytic Logic Gate: If g_messy_low is LOWER than the winner's gap
-        if g_messy_low < v11_winner_gap:
-            # FLIP: Structural necessity overrides arithmetic winner
-            final_prediction = p_messy_low
+    # --- 4. Apply Logic Gate ---
+    # Analytic Logic Gate: If g_messy_low is LOWER than the winner's gap
+    if g_messy_low < v11_winner_gap:
+        # FLIP: Structural necessity overrides arithmetic winner
+        final_prediction = p_messy_low
 
     return final_prediction
-# --- End Engine Setup ---
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def predict_from_window_v23(prime_arr, i, pool_size, mod6_scores, mod6_lut, messy):
+        """
+        Fused Open Pool + v23.0 for p_n = prime_arr[i]: one walk over the
+        primes in (p_n, p_n + pool_size], scoring as it goes, without
+        building a candidate list. Returns (prediction, primes in pool);
+        an empty pool returns (0, 0).
+        """
+        p_n = prime_arr[i]
+        limit = p_n + pool_size
+        n_primes = len(prime_arr)
+        base = (2 * p_n) % 6 # (p_n + q_i) % 6 == mod6_lut[base + gap]
+
+        v11_winner_score = np.inf
+        v11_winner_prime = 0
+        v11_winner_gap = 0
+        g_messy_low = -1 # -1: no Messy candidate seen yet
+        p_messy_low = 0
+        j = i + 1
+        while j < n_primes and prime_arr[j] <= limit:
+            q_i = prime_arr[j]
+            gap_g_i = q_i - p_n
+            vmod6_rate = mod6_scores[mod6_lut[base + gap_g_i]]
+            score_v11 = (vmod6_rate + 1.0) * gap_g_i
+            if v11_winner_prime == 0 or score_v11 < v11_winner_score:
+                v11_winner_score = score_v11
+                v11_winner_prime = q_i
+                v11_winner_gap = gap_g_i
+            if vmod6_rate > messy and (g_messy_low < 0 or gap_g_i < g_messy_low):
+                g_messy_low = gap_g_i
+                p_messy_low = q_i
+            j += 1
+
+        pool_count = j - (i + 1)
+        if g_messy_low >= 0 and g_messy_low < v11_winner_gap:
+            return p_messy_low, pool_count # The Analytic Flip
+        return v11_winner_prime, pool_count
+
+    @njit(parallel=True, cache=True)
+    def v23_open_pool_batch(prime_arr, start, end, pool_size, mod6_scores, mod6_lut, messy):
+        """
+        JIT version of the test loop for p_n in prime_arr[start:end], split
+        across all cores (each p_n only reads shared, read-only data).
+        Returns (predictions, successes, primes in pools).
+        """
+        predictions = 0
+        successes = 0
+        primes_in_pools = 0
+        for i in prange(start, end):
+            if prime_arr[i + 1] - prime_arr[i] > pool_size:
+                continue # Prime gap > POOL_SIZE
+            prediction_v23, pool_count = predict_from_window_v23(
+                prime_arr, i, pool_size, mod6_scores, mod6_lut, messy)
+            predictions += 1
+            primes_in_pools += pool_count
+            if prediction_v23 == prime_arr[i + 1]:
+                successes += 1
+        return predictions, successes, primes_in_pools
 
 # --- Configuration ---
 PRIME_INPUT_FILE = "../prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
 START_INDEX = 10 
+CHUNK_SIZE = 100000 # p_n per block; progress is printed between blocks
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
-        return None, None
-    
-    prime_set = set(prime_list)
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes and created set in {end_time - start_time:.2f} seconds.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
+        return None
     
     required_primes = PRIMES_TO_TEST + START_INDEX + 10 # Buffer
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
-        return None, None
+        return None
         
-    return prime_list, prime_set
+    return prime_arr
 
 # --- Main Testing Logic ---
 def run_PLR_v23_open_pool_test():
     
     if not load_engine_data(): return
         
-    prime_list, prime_set = load_primes_from_file(PRIME_INPUT_FILE)
-    if prime_list is None: return
+    prime_arr = load_primes_from_file(PRIME_INPUT_FILE)
+    if prime_arr is None: return
 
     print(f"\nStarting PLR 'v23.0 Open Pool' Test (Test 42) for {PRIMES_TO_TEST:,} primes...")
     print(f"  - Engine: v23.0 (100% Theoretical Logic)")
@@ -143,42 +193,53 @@ def run_PLR_v23_open_pool_test():
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    if loop_end_index >= len(prime_list) - POOL_SIZE:
+    if loop_end_index >= len(prime_arr) - POOL_SIZE:
         print("FATAL ERROR: Test range exceeds prime list length for Open Pool.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v23_acc = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
-            rand_acc = (total_predictions / total_primes_in_pools) * 100 if total_primes_in_pools > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v23.0 Acc: {v23_acc:.2f}% | Random: {rand_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    residue_lut = mod6_lut(POOL_SIZE)
+    for chunk_start in range(START_INDEX, loop_end_index, CHUNK_SIZE):
+        chunk_end = min(chunk_start + CHUNK_SIZE, loop_end_index)
         
-        # --- 1. Create the "Open Pool" of Candidates ---
-        open_pool_candidates = []
-        for k in range(1, POOL_SIZE + 1):
-            candidate_int = p_n + k
-            if candidate_int in prime_set:
-                open_pool_candidates.append(candidate_int)
-        
-        # Ensure the true prime was actually in our pool
-        if true_p_n_plus_1 not in open_pool_candidates:
-            continue
+        if _NUMBA_AVAILABLE:
+            predictions, successes, primes_in_pools = v23_open_pool_batch(
+                prime_arr, chunk_start, chunk_end, POOL_SIZE, MOD6_SCORES, residue_lut, MESSY_THRESHOLD)
+            total_predictions += predictions
+            total_successes += successes
+            total_primes_in_pools += primes_in_pools
+        else:
+            # Pool bounds for the whole block at once, then plain Python
+            # ints (block-relative indices) for the engine loop
+            pool_ends = (open_pool_ends(prime_arr, chunk_start, chunk_end, POOL_SIZE) - chunk_start).tolist()
+            block = prime_arr[chunk_start:chunk_start + pool_ends[-1] + 1].tolist()
+            # The true next prime is in the pool unless the gap is larger
+            # than POOL_SIZE. We skip those tests as they're outside the
+            # parameters: one np.diff per block picks the p_n to test.
+            gaps = np.diff(prime_arr[chunk_start:chunk_end + 1])
+            for k in np.flatnonzero(gaps <= POOL_SIZE).tolist():
+                p_n = block[k]
+                true_p_n_plus_1 = block[k + 1]
             
-        total_predictions += 1
-        total_primes_in_pools += len(open_pool_candidates)
-        
-        # --- 2. Get v23.0 Prediction ---
-        prediction_v23 = get_v23_internal_flip_prediction(p_n, open_pool_candidates)
-        
-        if prediction_v23 is None: continue
+                # --- 1. Create the "Open Pool" of Candidates ---
+                # Every prime in (p_n, p_n + POOL_SIZE], in ascending order
+                open_pool_candidates = block[k + 1:pool_ends[k]]
+                
+                total_predictions += 1
+                total_primes_in_pools += len(open_pool_candidates)
+            
+                # --- 2. Get v23.0 Prediction ---
+                prediction_v23 = get_v23_internal_flip_prediction(p_n, open_pool_candidates)
+            
+                if prediction_v23 is None: continue
 
-        if prediction_v23 == true_p_n_plus_1:
-            total_successes += 1
+                if prediction_v23 == true_p_n_plus_1:
+                    total_successes += 1
+        
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        v23_acc = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
+        rand_acc = (total_predictions / total_primes_in_pools) * 100 if total_primes_in_pools > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v23.0 Acc: {v23_acc:.2f}% | Random: {rand_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     v23_acc = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
@@ -16,18 +16,45 @@
 # on this new data, it proves our model is a UNIVERSAL LAW
 # and not an over-fitted artifact. If it collapses,
 # it proves the 100% was an illusion of curve-fitting.
+#
+# Optional C kernel (fastest path), from the repository root:
+#   python setup.py build_ext --inplace
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
+import multiprocessing
 from collections import defaultdict
 
+import numpy as np
+
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+# The shared loaders and helpers live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from plr_common import load_primes, load_mod6_map, mod6_table
+
+try:
+    import plr_score # Optional C kernel: python setup.py build_ext --inplace
+    _C_KERNEL_AVAILABLE = True
+except ImportError:
+    _C_KERNEL_AVAILABLE = False
+
 # --- Engine Setup (v23.0 "Internal Flip" Logic) ---
 # IMPORTANT: We are using the *original* data maps trained on primes 1-50M.
 # We are intentionally NOT retraining the model.
 MOD6_ENGINE_FILE = "../data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
+MOD6_TUPLE = None # Dense length-6 view of the map (index = S % 6)
+MOD6_SCORES = None # float64 array twin of MOD6_TUPLE for the JIT kernels
+MOD6_SCORES_PLUS1 = None # MOD6_SCORES + 1.0, the v11.0 multiplier (C kernel)
+MOD6_MIN_PLUS1 = None # Smallest v11.0 multiplier: every score is >= this * gap
 
 # --- These are the "Signature" thresholds ---
 CLEAN_THRESHOLD = 3.0  
@@ -35,74 +62,64 @@ MESSY_THRESHOLD = 20.0
 
 def load_engine_data():
     """Loads the v_mod6 messiness map."""
-    global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) data from '{MOD6_ENGINE_FILE}'.")
-        print("Running in 'Replication' mode. Data map is from primes 1-50M.")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
+    global MESSINESS_MAP_V_MOD6, MOD6_TUPLE, MOD6_SCORES, MOD6_SCORES_PLUS1, MOD6_MIN_PLUS1
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
-        return False
-
-def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
-    """The v11.0 "Weighted Gap" Engine Core (Multiplicative)."""
-    if MESSINESS_MAP_V_MOD6 is None: return float('inf')
-    score_mod6 = MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-    if score_mod6 == float('inf'): return float('inf')
-    # Add 1.0 to avoid 0*gap issues and normalize scoring
-    return (score_mod6 + 1.0) * gap_g_n
-
-def get_vmod6_score(anchor_sn):
-    """Helper to get *only* the v_mod6 rate."""
-    if MESSINESS_MAP_V_MOD6 is None: return float('inf')
-    return MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-
-# --- v23.0 FINAL LOGIC FUNCTION ---
-def get_v23_internal_flip_prediction(p_n, candidates):
-    
-    # 1. Build the full evidence list and isolate bins
-    candidates_data = []
-    messy_bin = []
-    
-    for q_i in candidates:
-        S_cand = p_n + q_i
-        gap_g_i = q_i - p_n
-        
-        score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-        vmod6_rate = get_vmod6_score(S_cand)
-        
-        # Store (v11_score, prime, vmod6_rate, gap)
-        data = (score_v11, q_i, vmod6_rate, gap_g_i)
-        candidates_data.append(data)
-        
-        if vmod6_rate > MESSY_THRESHOLD:
-            messy_bin.append(data)
+    MOD6_TUPLE = mod6_table(MESSINESS_MAP_V_MOD6)
+    MOD6_SCORES = np.array(MOD6_TUPLE, dtype=np.float64)
+    MOD6_SCORES_PLUS1 = MOD6_SCORES + 1.0
+    MOD6_MIN_PLUS1 = min(MOD6_TUPLE) + 1.0
+    print(f"Loaded v_mod6 (Mod 6) data from '{MOD6_ENGINE_FILE}'.")
+    print("Running in 'Replication' mode. Data map is from primes 1-50M.")
+    return True
 
-    # 2. Get the Overall v11.0 Winner (The Baseline Arithmetic Winner)
-    if not candidates_data: return None
-        
-    candidates_data.sort(key=lambda x: x[0])
-    v11_winner_score, v11_winner_prime, _, v11_winner_gap = candidates_data[0]
-    
-    final_prediction = v11_winner_prime # Default prediction
+# --- v23.0 FINAL LOGIC (JIT kernels, used when numba is installed) ---
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def predict_v23(prime_arr, i, num_cands, mod6_scores, min_plus1, messy):
+        """
+        v23.0 for p_n = prime_arr[i] and the next num_cands primes, on
+        scalar locals only: the v11.0 winner, flipped to the closest Messy
+        candidate when that one's gap is lower.
+        Not memoized: the result depends only on (p_n % 6, the ten gaps),
+        but that key was unique for 199,997 of 200,000 consecutive p_n.
+        """
+        p_n = prime_arr[i]
+        v11_winner_score = np.inf
+        v11_winner_prime = prime_arr[i + 1]
+        v11_winner_gap = v11_winner_prime - p_n
+        g_messy_low = -1 # -1: no Messy candidate seen yet
+        p_messy_low = 0
+        for j in range(i + 1, i + 1 + num_cands):
+            q_i = prime_arr[j]
+            gap_g_i = q_i - p_n
+            if min_plus1 * gap_g_i >= v11_winner_score: # No later candidate can win or flip
+                break
+            vmod6_rate = mod6_scores[(p_n + q_i) % 6]
+            score_v11 = (vmod6_rate + 1.0) * gap_g_i
+            if score_v11 < v11_winner_score:
+                v11_winner_score = score_v11
+                v11_winner_prime = q_i
+                v11_winner_gap = gap_g_i
+            if vmod6_rate > messy and (g_messy_low < 0 or gap_g_i < g_messy_low):
+                g_messy_low = gap_g_i
+                p_messy_low = q_i
+        if g_messy_low >= 0 and g_messy_low < v11_winner_gap:
+            return p_messy_low
+        return v11_winner_prime
 
-    # --- 3. Find the Structural Minimum and Apply Logic Gate ---
-    if messy_bin:
-        messy_bin.sort(key=lambda x: x[3]) # Sort Messy Bin by gap
-        g_messy_low = messy_bin[0][3]
-        p_messy_low = messy_bin[0][1]
-        
-        # Analytic Logic Gate: If g_messy_low is LOWER than the winner's gap
-        if g_messy_low < v11_winner_gap:
-            # FLIP: Structural necessity overrides arithmetic winner
-            final_prediction = p_messy_low
-
-    return final_prediction
+    @njit(parallel=True, cache=True)
+    def v23_replication_batch(prime_arr, start, end, num_cands, mod6_scores, min_plus1, messy):
+        """
+        JIT version of the test loop for p_n in prime_arr[start:end], split
+        across cores with prange. Returns the number of successes.
+        """
+        successes = 0
+        for i in prange(start, end):
+            if predict_v23(prime_arr, i, num_cands, mod6_scores, min_plus1, messy) == prime_arr[i + 1]:
+                successes += 1
+        return successes
 # --- End Engine Setup ---
 
 # --- Configuration ---
@@ -112,30 +129,90 @@ PRIMES_TO_TEST = 49999900
 NUM_CANDIDATES_TO_CHECK = 10 
 # We *start* from the 50,000,010th prime
 START_INDEX = 50000010 
+CHUNK_SIZE = 100000 # p_n per block; progress is printed between blocks
+# Processes for the NumPy fallback; the C and Numba kernels already use every core
+WORKERS = os.cpu_count() or 1
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     # We must have 100M primes in the file for this test
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         print(f"This test requires at least {required_primes:,} primes.")
         return None
         
-    return prime_list
+    return prime_arr
+
+def predict_batch_v23(prime_arr, start, end):
+    """
+    NumPy version of predict_v23 for every p_n in
+    prime_arr[start:end] at once. Each row of the
+    (N, NUM_CANDIDATES_TO_CHECK) window matrix is one p_n's candidate list.
+    Returns the predictions as an int64 array.
+    """
+    p = prime_arr[start:end, None]
+    Q = np.lib.stride_tricks.sliding_window_view(
+        prime_arr[start + 1:end + NUM_CANDIDATES_TO_CHECK], NUM_CANDIDATES_TO_CHECK)
+    gaps = Q - p
+    
+    # S % 6 == (p_n % 6 + q_i % 6) % 6: one modulo per prime in the block
+    # (uint8) instead of one per (p_n, candidate) pair. The table is tiled
+    # twice so the raw residue sum 0..10 indexes it with no second modulo.
+    block_mod6 = (prime_arr[start:end + NUM_CANDIDATES_TO_CHECK] % 6).astype(np.uint8)
+    q_mod6 = np.lib.stride_tricks.sliding_window_view(block_mod6[1:], NUM_CANDIDATES_TO_CHECK)
+    residue_sum = block_mod6[:end - start, None] + q_mod6
+    scores = (np.tile(MOD6_SCORES, 2)[residue_sum] + 1.0) * gaps
+    # 'Messy' depends only on the residue: a bool gather, no float compare
+    messy_mask = np.tile(MOD6_SCORES > MESSY_THRESHOLD, 2)[residue_sum]
+    
+    # v11.0 winner per row (argmin keeps the first candidate on ties)
+    win_idx = scores.argmin(axis=1)[:, None]
+    pred_v11 = np.take_along_axis(Q, win_idx, axis=1)[:, 0]
+    v11_winner_gap = np.take_along_axis(gaps, win_idx, axis=1)[:, 0]
+    
+    # Closest Messy candidate per row. Non-messy slots get the int64 max
+    # sentinel, which never beats a real gap in the flip below.
+    messy_gaps = np.where(messy_mask, gaps, np.iinfo(np.int64).max)
+    messy_idx = messy_gaps.argmin(axis=1)[:, None]
+    g_messy_low = np.take_along_axis(messy_gaps, messy_idx, axis=1)[:, 0]
+    p_messy_low = np.take_along_axis(Q, messy_idx, axis=1)[:, 0]
+    
+    # The Flip as a per-row select instead of an if per prime
+    return np.where(g_messy_low < v11_winner_gap, p_messy_low, pred_v11)
+
+def count_block_v23(prime_arr, start, end):
+    """v23.0 successes for p_n in prime_arr[start:end], on the fastest available path."""
+    if _C_KERNEL_AVAILABLE:
+        # count_successes scores v11.0 and v23.0 in the same pass
+        _, hits_v23 = plr_score.count_successes(
+            prime_arr, start, end, NUM_CANDIDATES_TO_CHECK,
+            MOD6_SCORES, MOD6_SCORES_PLUS1, MESSY_THRESHOLD)
+        return hits_v23
+    if _NUMBA_AVAILABLE:
+        return v23_replication_batch(
+            prime_arr, start, end, NUM_CANDIDATES_TO_CHECK, MOD6_SCORES, MOD6_MIN_PLUS1, MESSY_THRESHOLD)
+    pred_v23 = predict_batch_v23(prime_arr, start, end)
+    return int((pred_v23 == prime_arr[start + 1:end + 1]).sum())
+
+# --- Worker processes for the NumPy fallback ---
+# Each worker memory-maps the same .npy prime cache (shared page cache, no
+# copy) and only block bounds and success counts cross the process boundary.
+_WORKER_PRIMES = None
+
+def _init_worker(prime_file, mod6_scores):
+    """Pool initializer: maps the cached prime array and sets the score table."""
+    global _WORKER_PRIMES, MOD6_SCORES
+    _WORKER_PRIMES = load_primes(prime_file, verbose=False)
+    MOD6_SCORES = mod6_scores
+
+def _count_block_worker(bounds):
+    return count_block_v23(_WORKER_PRIMES, *bounds)
 
 # --- Main Testing Logic ---
 def run_PLR_v23_replication_test():
@@ -144,8 +221,8 @@ def run_PLR_v23_replication_test():
         print("Stopping test: Engine data could not be loaded.")
         return
         
-    prime_list = load_primes_from_file(PRIME_INPUT_FILE)
-    if prime_list is None: return
+    prime_arr = load_primes_from_file(PRIME_INPUT_FILE)
+    if prime_arr is None: return
 
     print(f"\nStarting PLR 'Replication' Test (v23.0) for primes {START_INDEX:,} to {START_INDEX + PRIMES_TO_TEST:,}...")
     print(f"  - Engine: v23.0 (100.00% Theoretical Champion)")
@@ -158,34 +235,32 @@ def run_PLR_v23_replication_test():
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    if loop_end_index >= len(prime_list) - (NUM_CANDIDATES_TO_CHECK + 2):
+    if loop_end_index >= len(prime_arr) - (NUM_CANDIDATES_TO_CHECK + 2):
         print("FATAL ERROR: PRIMES_TO_TEST + START_INDEX is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v23_acc = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v23.0 Acc: {v23_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
-        
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
-        
-        total_predictions += 1
-        
-        # Get v23.0 Prediction
-        prediction_v23 = get_v23_internal_flip_prediction(p_n, candidates)
+    blocks = [(chunk_start, min(chunk_start + CHUNK_SIZE, loop_end_index))
+              for chunk_start in range(START_INDEX, loop_end_index, CHUNK_SIZE)]
+    pool = None
+    if _C_KERNEL_AVAILABLE or _NUMBA_AVAILABLE or WORKERS <= 1:
+        block_successes = (count_block_v23(prime_arr, start, end) for start, end in blocks)
+    else:
+        pool = multiprocessing.Pool(WORKERS, initializer=_init_worker,
+                                    initargs=(PRIME_INPUT_FILE, MOD6_SCORES))
+        block_successes = pool.imap(_count_block_worker, blocks)
+    
+    for (chunk_start, chunk_end), successes in zip(blocks, block_successes):
+        total_successes += successes
+        total_predictions += chunk_end - chunk_start
         
-        if prediction_v23 is None:
-            continue
-
-        if prediction_v23 == true_p_n_plus_1:
-            total_successes += 1
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        v23_acc = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v23.0 Acc: {v23_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
+    
+    if pool is not None:
+        pool.close()
+        pool.join()
             
     # --- Final Summary ---
     progress = total_predictions
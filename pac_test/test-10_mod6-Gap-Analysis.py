@@ -12,15 +12,24 @@
 # the new engine for our next PLR test.
 # ==============================================================================
 
+import os
+import sys
 import math
 import time
-from collections import defaultdict
 import json
 
+import numpy as np
+
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from plr_common import load_primes, law_one_k_min, prime_table, mod_by_constant
+
 # --- Configuration ---
 PRIME_INPUT_FILE = "../prime/primes_100m.txt"
 MAX_PRIME_PAIRS_TO_TEST = 50000000
 START_INDEX = 10 
+CHUNK_SIZE = 100000 # pairs per block (800 KB per int64 block array, cache-sized); progress is printed between blocks
+K_SEARCH_LIMIT = 2000 # Law I k_min search radius
 OUTPUT_JSON_FILE = "messiness_map_v_mod6_gap.json" # Our new engine file
 
 # --- Gap Categorization (from test-6-result.txt) ---
@@ -30,41 +39,32 @@ GAP_BIN_LARGE = 22.0
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
-        return None, None
-    
-    prime_set = set(prime_list)
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes and created set in {end_time - start_time:.2f} seconds.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
+        return None
     
     required_primes = MAX_PRIME_PAIRS_TO_TEST + START_INDEX + 10
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small.")
-        return None, None
+        return None
         
-    return prime_list, prime_set
+    return prime_arr
 
-def categorize_gap(gap_g_n):
-    """Categorizes the gap g_n into Small, Medium, or Large."""
-    if gap_g_n < GAP_BIN_SMALL:
-        return "Small"
-    elif gap_g_n >= GAP_BIN_LARGE:
-        return "Large"
-    else:
-        return "Medium"
+GAP_CATEGORIES = ["Small", "Medium", "Large"] # Column order of the 2D maps
+
+def categorize_gaps(gap_arr):
+    """Gap category index (0 Small, 1 Medium, 2 Large) for each gap g_n."""
+    return np.where(gap_arr < GAP_BIN_SMALL, 0, np.where(gap_arr >= GAP_BIN_LARGE, 2, 1))
 
 # --- Main Testing Logic ---
 def run_mod6_gap_analysis():
     
-    prime_list, prime_set = load_primes_from_file(PRIME_INPUT_FILE)
-    if prime_list is None: return
+    prime_arr = load_primes_from_file(PRIME_INPUT_FILE)
+    if prime_arr is None: return
+    # k_min never exceeds K_SEARCH_LIMIT, so a small table answers every
+    # 'is k prime?' with one lookup
+    k_is_prime = prime_table(prime_arr, K_SEARCH_LIMIT)
 
     print(f"\nStarting PAC Mod 6 + Gap 2D Analysis for {MAX_PRIME_PAIRS_TO_TEST:,} S_n pairs...")
     print(f"  - Binning anchors and failures by (S_n % 6) AND (Gap Category)...")
@@ -74,57 +74,39 @@ def run_mod6_gap_analysis():
     
     total_law_I_failures = 0
     
-    # 2D Dictionary: {residue: {gap_category: failure_count}}
-    failure_map = {res: defaultdict(int) for res in range(6)}
+    # 2D count array: failure_map[residue, gap_category_index]
+    failure_map = np.zeros((6, len(GAP_CATEGORIES)), dtype=np.int64)
     
-    # {residue: {gap_category: anchor_count}}
-    anchor_map = {res: defaultdict(int) for res in range(6)}
+    # anchor_map[residue, gap_category_index]
+    anchor_map = np.zeros((6, len(GAP_CATEGORIES)), dtype=np.int64)
 
     loop_end_index = MAX_PRIME_PAIRS_TO_TEST + START_INDEX
     
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            print(f"Progress: {progress:,} / {MAX_PRIME_PAIRS_TO_TEST:,} | Law I Fails: {total_law_I_failures:,} | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        p_n_plus_1 = prime_list[i+1]
-        anchor_S_n = p_n + p_n_plus_1
-        gap_g_n = p_n_plus_1 - p_n
+    for chunk_start in range(START_INDEX, loop_end_index, CHUNK_SIZE):
+        chunk_end = min(chunk_start + CHUNK_SIZE, loop_end_index)
+        block_arr = prime_arr[chunk_start:chunk_end + 1]
+        anchors = block_arr[:-1] + block_arr[1:]
         
-        # --- 1. Categorize the Anchor ---
-        residue = anchor_S_n % 6
-        gap_category = categorize_gap(gap_g_n)
+        # --- 1. Categorize every anchor of the block ---
+        # Flat bin index residue * 3 + gap category, so one bincount
+        # fills the whole (residue, category) count array
+        bins = mod_by_constant(anchors, 6) * len(GAP_CATEGORIES) + categorize_gaps(np.diff(block_arr))
+        anchor_map += np.bincount(bins, minlength=anchor_map.size).reshape(anchor_map.shape)
         
-        anchor_map[residue][gap_category] += 1
-
         # --- 2. Find the Law I k_min ---
-        min_distance_k = 0
-        search_dist = 1
-        
-        while True:
-            q_lower = anchor_S_n - search_dist
-            q_upper = anchor_S_n + search_dist
-
-            if q_lower in prime_set:
-                min_distance_k = search_dist
-                break
-            if q_upper in prime_set:
-                min_distance_k = search_dist
-                break
-                
-            search_dist += 1
-            if search_dist > 2000: break 
-        
-        if min_distance_k == 0: continue 
-
-        # --- 3. Check if it's a composite failure ---
-        is_k_composite = (min_distance_k > 1) and (min_distance_k not in prime_set)
+        # Binary search on the sorted primes (no set of every prime);
+        # k_min == 0 means none within K_SEARCH_LIMIT and never fails
+        k_min_arr = law_one_k_min(prime_arr, anchors, K_SEARCH_LIMIT)
         
-        if is_k_composite:
-            total_law_I_failures += 1
-            failure_map[residue][gap_category] += 1
+        # --- 3. Composite failures: k_min > 1 and not prime ---
+        is_k_composite = (k_min_arr > 1) & ~k_is_prime[k_min_arr]
+        total_law_I_failures += int(np.count_nonzero(is_k_composite))
+        failure_map += np.bincount(bins[is_k_composite], minlength=failure_map.size).reshape(failure_map.shape)
+
+        # Progress once per block
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        print(f"Progress: {progress:,} / {MAX_PRIME_PAIRS_TO_TEST:,} | Law I Fails: {total_law_I_failures:,} | Time: {elapsed:.0f}s", end='\r')
             
     print(f"Progress: {MAX_PRIME_PAIRS_TO_TEST:,} / {MAX_PRIME_PAIRS_TO_TEST:,} | Law I Fails: {total_law_I_failures:,} | Time: {time.time() - start_time:.0f}s   ")
     print(f"\nAnalysis completed in {time.time() - start_time:.2f} seconds.")
@@ -146,9 +128,9 @@ def run_mod6_gap_analysis():
         # Residues 1, 3, 5 are not expected (except for S_0=2+3=5)
         if residue % 2 != 0: continue 
             
-        for category in ["Small", "Medium", "Large"]:
-            failures = failure_map[residue].get(category, 0)
-            total_anchors = anchor_map[residue].get(category, 0)
+        for category_index, category in enumerate(GAP_CATEGORIES):
+            failures = int(failure_map[residue, category_index])
+            total_anchors = int(anchor_map[residue, category_index])
             
             if total_anchors > 0:
                 failure_rate = (failures / total_anchors) * 100
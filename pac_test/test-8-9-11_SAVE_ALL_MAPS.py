@@ -0,0 +1,85 @@
+# ==============================================================================
+# PRIMORIAL ANCHOR CONJECTURE (PAC) - TESTS 8 / 9 / 11: ALL RESIDUE MAPS
+#
+# This script builds the v_mod6, v1.0 (Mod 30) and v3.0 (Mod 210) engine
+# data in ONE pass and SAVES all three files.
+#
+# 6 and 30 both divide 210, so the Mod 210 counts fold into the Mod 30
+# and Mod 6 counts (residue r mod 210 lands in r % 30 and r % 6). The
+# maps are identical to the ones test-9, test-11 and test-8_SAVE_MAP
+# write, for one prime load and one scan instead of three.
+# ==============================================================================
+
+import os
+import sys
+import time
+import json
+
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from plr_common import load_primes, law_one_residue_counts, fold_residue_counts, residue_failure_rates
+
+# --- Configuration ---
+PRIME_INPUT_FILE = "../prime/primes_100m.txt"
+MAX_PRIME_PAIRS_TO_TEST = 50000000
+START_INDEX = 10
+CHUNK_SIZE = 100000 # pairs per block (800 KB per int64 block array, cache-sized); progress is printed between blocks
+K_SEARCH_LIMIT = 2000 # Law I k_min search radius
+SCAN_MODULUS = 210 # Must be a multiple of every modulus below
+OUTPUT_JSON_FILES = {
+    6: "messiness_map_v_mod6.json",
+    30: "messiness_map_v1_mod30.json",
+    210: "messiness_map_v3_mod210.json",
+}
+
+# --- Function to load primes from a file ---
+def load_primes_from_file(filename):
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
+        return None
+
+    required_primes = MAX_PRIME_PAIRS_TO_TEST + START_INDEX + 10
+    if len(prime_arr) < required_primes:
+        print(f"\nFATAL ERROR: Prime file is too small.")
+        return None
+
+    return prime_arr
+
+# --- Main Testing Logic ---
+def run_all_residue_maps():
+
+    prime_arr = load_primes_from_file(PRIME_INPUT_FILE)
+    if prime_arr is None: return
+
+    print(f"\nStarting PAC Residue Analysis (Mod {', '.join(str(m) for m in OUTPUT_JSON_FILES)}) for {MAX_PRIME_PAIRS_TO_TEST:,} S_n pairs...")
+    print(f"  - Binning anchors and failures by S_n % {SCAN_MODULUS} (one scan)...")
+    for json_file in OUTPUT_JSON_FILES.values():
+        print(f"  - Saving results to {json_file}")
+    print("-" * 80)
+    start_time = time.time()
+
+    anchor_counts, failure_counts = law_one_residue_counts(
+        prime_arr, START_INDEX, MAX_PRIME_PAIRS_TO_TEST, SCAN_MODULUS, K_SEARCH_LIMIT, CHUNK_SIZE)
+    print(f"\nAnalysis completed in {time.time() - start_time:.2f} seconds.")
+    print("-" * 80)
+
+    # --- Process and Save Data ---
+    print("\n" + "="*20 + " PAC-8/9/11: RESIDUE MAPS " + "="*20)
+    print(f"\nTotal S_n Anchors Analyzed: {MAX_PRIME_PAIRS_TO_TEST:,}")
+    print(f"Total Law I Failures Found: {int(failure_counts.sum()):,}\n")
+
+    for modulus, json_file in OUTPUT_JSON_FILES.items():
+        scores = residue_failure_rates(fold_residue_counts(anchor_counts, modulus),
+                                       fold_residue_counts(failure_counts, modulus))
+        try:
+            with open(json_file, 'w') as f:
+                json.dump(scores, f, indent=2)
+            print(f"  [SUCCESS] Mod {modulus} messiness map saved to '{json_file}'")
+        except Exception as e:
+            print(f"  [FAILURE] Could not save JSON file: {e}")
+
+    print("=" * (50 + len(" FINAL CONCLUSION ")))
+
+if __name__ == "__main__":
+    run_all_residue_maps()
@@ -6,45 +6,43 @@
 # This is the data-gathering step for our PLR v3.0 engine.
 # ==============================================================================
 
+import os
+import sys
 import math
 import time
-from collections import defaultdict
 import json # Import the JSON library
 
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from plr_common import load_primes, law_one_residue_counts, residue_failure_rates
+
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 MAX_PRIME_PAIRS_TO_TEST = 50000000
 START_INDEX = 10 
+CHUNK_SIZE = 100000 # pairs per block (800 KB per int64 block array, cache-sized); progress is printed between blocks
+K_SEARCH_LIMIT = 2000 # Law I k_min search radius
 OUTPUT_JSON_FILE = "messiness_map_v3_mod210.json" # Our new engine file
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
-        return None, None
-    
-    prime_set = set(prime_list)
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes and created set in {end_time - start_time:.2f} seconds.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
+        return None
     
     required_primes = MAX_PRIME_PAIRS_TO_TEST + START_INDEX + 10
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small.")
-        return None, None
+        return None
         
-    return prime_list, prime_set
+    return prime_arr
 
 # --- Main Testing Logic ---
 def run_mod210_residue_analysis():
     
-    prime_list, prime_set = load_primes_from_file(PRIME_INPUT_FILE)
-    if prime_list is None: return
+    prime_arr = load_primes_from_file(PRIME_INPUT_FILE)
+    if prime_arr is None: return
 
     print(f"\nStarting PAC Mod 210 Residue Analysis for {MAX_PRIME_PAIRS_TO_TEST:,} S_n pairs...")
     print(f"  - Binning anchors and failures by S_n % 210...")
@@ -52,69 +50,18 @@ def run_mod210_residue_analysis():
     print("-" * 80)
     start_time = time.time()
     
-    total_law_I_failures = 0
-    failure_counts = defaultdict(int)
-    anchor_counts = defaultdict(int)
-
-    loop_end_index = MAX_PRIME_PAIRS_TO_TEST + START_INDEX
-    
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            print(f"Progress: {progress:,} / {MAX_PRIME_PAIRS_TO_TEST:,} | Law I Fails: {total_law_I_failures:,} | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        p_n_plus_1 = prime_list[i+1]
-        anchor_S_n = p_n + p_n_plus_1
-        
-        residue = anchor_S_n % 210
-        anchor_counts[residue] += 1
-
-        min_distance_k = 0
-        search_dist = 1
-        
-        while True:
-            q_lower = anchor_S_n - search_dist
-            q_upper = anchor_S_n + search_dist
-
-            if q_lower in prime_set:
-                min_distance_k = search_dist
-                break
-            if q_upper in prime_set:
-                min_distance_k = search_dist
-                break
-                
-            search_dist += 1
-            if search_dist > 2000: break 
-        
-        if min_distance_k == 0: continue 
-
-        is_k_composite = (min_distance_k > 1) and (min_distance_k not in prime_set)
-        
-        if is_k_composite:
-            total_law_I_failures += 1
-            failure_counts[residue] += 1
-            
-    print(f"Progress: {MAX_PRIME_PAIRS_TO_TEST:,} / {MAX_PRIME_PAIRS_TO_TEST:,} | Law I Fails: {total_law_I_failures:,} | Time: {time.time() - start_time:.0f}s   ")
+    # Shared block scan (plr_common), also used by test-8-9-11_SAVE_ALL_MAPS.py
+    anchor_counts, failure_counts = law_one_residue_counts(
+        prime_arr, START_INDEX, MAX_PRIME_PAIRS_TO_TEST, 210, K_SEARCH_LIMIT, CHUNK_SIZE)
+    total_law_I_failures = int(failure_counts.sum())
     print(f"\nAnalysis completed in {time.time() - start_time:.2f} seconds.")
     print("-" * 80)
 
     # --- Process and Save Data ---
     print("\nProcessing and saving v3.0 engine data...")
-    messiness_scores_v3 = {} # This is our new v3.0 engine data
-    
-    for residue in range(210):
-        failures = failure_counts.get(residue, 0)
-        total_anchors = anchor_counts.get(residue, 0)
-        
-        if total_anchors > 0:
-            failure_rate = (failures / total_anchors) * 100
-            messiness_scores_v3[residue] = failure_rate
-        else:
-            # If a residue class never appeared, give it an 'infinite'
-            # score so the engine knows it's impossible.
-            messiness_scores_v3[residue] = float('inf') 
+    # Residues that never appeared score 'infinite', so the engine knows
+    # they are impossible
+    messiness_scores_v3 = residue_failure_rates(anchor_counts, failure_counts) # This is our new v3.0 engine data
 
     # --- *** SAVE THE ENGINE DATA TO A FILE *** ---
     try:
@@ -0,0 +1,333 @@
+# ==============================================================================
+# PATH OF LEAST RESISTANCE (PLR) - SHARED HELPERS
+#
+# Code shared by the PLR engine and the counter/ heuristic tests.
+#
+# - load_primes: one prime loader for every script. The text file is parsed
+#   once into a .npy cache next to it; later runs (and other scripts)
+#   memory-map that cache read-only, so the pages are shared between
+#   processes and repeated loads in one process are free.
+# - load_mod6_map / mod6_table: the v_mod6 messiness map and its dense
+#   length-6 view (index = S % 6).
+# - v16_prediction: the v16.0 "Chained Signature" predictor for one p_n,
+#   shared by the counter/ v16 tests.
+# - open_pool_ends / mod6_lut: Open Pool helpers for the counter/ tests.
+# - law_one_k_min / prime_table: Law I k_min search and a primality table
+#   for small values, for the pac_test/ map builders (no set of every
+#   prime). law_one_k_min uses a Numba merge scan when Numba is installed.
+# - law_one_residue_counts / fold_residue_counts / residue_failure_rates:
+#   the block scan behind the pac_test/ residue maps. One scan by a multiple
+#   of every modulus needed folds into each smaller map. The scan uses the
+#   plr_score C kernel when it is built.
+# - mod_by_constant: array % scalar without a divide per element.
+# - prime_wheel / is_prime_wheel: mod-30 wheel bitmap for scripts that test
+#   arbitrary values one at a time (1 bit per candidate instead of a set).
+# ==============================================================================
+
+import os
+import json
+import time
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+try:
+    import plr_score # Optional C kernel: python setup.py build_ext --inplace
+    _C_KERNEL_AVAILABLE = True
+except ImportError:
+    _C_KERNEL_AVAILABLE = False
+
+@lru_cache(maxsize=None)
+def _load_prime_array(filename):
+    """Returns the read-only int64 prime array for an absolute file path."""
+    cache_file = os.path.splitext(filename)[0] + ".npy"
+    if not (os.path.exists(cache_file) and os.path.getmtime(cache_file) >= os.path.getmtime(filename)):
+        # 8 bytes per prime instead of a ~28-byte Python int plus list slot
+        prime_arr = np.loadtxt(filename, dtype=np.int64, ndmin=1)
+        # Write to a temporary file and rename, so an interrupted first run
+        # never leaves a truncated cache that looks newer than the text file
+        tmp_file = cache_file + ".tmp"
+        try:
+            with open(tmp_file, 'wb') as f:
+                np.save(f, prime_arr)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"WARNING: Could not write prime cache '{cache_file}': {e}")
+            prime_arr.flags.writeable = False
+            return prime_arr
+    return np.load(cache_file, mmap_mode='r')
+
+def load_primes(filename, verbose=True):
+    """
+    Loads ALL primes from the text file as a read-only int64 array.
+    Returns None if the file does not exist. verbose=False skips the
+    progress lines (for worker processes). Scripts whose per-prime loop
+    works on Python ints call .tolist() on the result; that is still far
+    faster than parsing the text file.
+    """
+    if verbose:
+        print(f"Loading ALL primes from {filename}...")
+    start_time = time.time()
+    try:
+        prime_arr = _load_prime_array(os.path.abspath(filename))
+    except FileNotFoundError:
+        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+        return None
+
+    end_time = time.time()
+    if verbose:
+        print(f"Loaded {len(prime_arr):,} primes in {end_time - start_time:.2f} seconds.")
+    return prime_arr
+
+@lru_cache(maxsize=None)
+def _load_mod6_items(filename):
+    """Returns the parsed map as (residue, rate) pairs for an absolute file path."""
+    with open(filename, 'r') as f:
+        return tuple((int(k), v) for k, v in json.load(f).items())
+
+def load_mod6_map(filename):
+    """
+    Loads the v_mod6 messiness map {S % 6: failure rate}. The JSON file
+    stays the source of truth (pac_test/ regenerates it); it is parsed
+    once per process. Returns None if the file is missing or cannot be
+    parsed.
+    """
+    try:
+        return dict(_load_mod6_items(os.path.abspath(filename)))
+    except FileNotFoundError:
+        print(f"FATAL ERROR: Engine file not found: {filename}")
+        return None
+    except Exception as e:
+        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
+        return None
+
+def mod6_table(mod6_map):
+    """
+    Dense tuple view of the map: table[S % 6] is the rate, and residues
+    missing from the map score inf, as with dict.get. Tuple indexing skips
+    the hashing and default branch of dict.get.
+    """
+    return tuple(mod6_map.get(k, float('inf')) for k in range(6))
+
+def v16_prediction(p_n, candidates, mod6, clean_thresh, messy_thresh, depth):
+    """
+    Runs the full v16.0 "Chained Signature" logic for one p_n, with mod6
+    the mod6_table of the map. Returns None for an empty candidate list.
+    Only ranks 1..depth are needed, so nothing is fully sorted: a min scan
+    finds the winner, and a second pass (only for Clean winners) keeps the
+    next-best candidates in a short buffer.
+    """
+    if not candidates: return None
+    
+    # Rank 1: strict '<' keeps the first candidate on ties, like a stable sort
+    winner_index = 0
+    winner_score = float('inf')
+    for index, q_i in enumerate(candidates):
+        score_v11 = (mod6[(p_n + q_i) % 6] + 1.0) * (q_i - p_n)
+        if score_v11 < winner_score:
+            winner_score = score_v11
+            winner_index = index
+        
+    winner_v11_prime = candidates[winner_index]
+    winner_v11_vmod6 = mod6[(p_n + winner_v11_prime) % 6]
+    
+    prediction_v16 = winner_v11_prime # Default
+    
+    if winner_v11_vmod6 < clean_thresh: 
+        # Ranks 2..depth as an insertion-sorted (score, prime) buffer; new
+        # entries go after equal scores so ties keep candidate order
+        runners_up = []
+        slots = depth - 1
+        for index, q_i in enumerate(candidates):
+            if index == winner_index: continue
+            score_v11 = (mod6[(p_n + q_i) % 6] + 1.0) * (q_i - p_n)
+            pos = len(runners_up)
+            while pos > 0 and runners_up[pos - 1][0] > score_v11:
+                pos -= 1
+            if pos < slots:
+                runners_up.insert(pos, (score_v11, q_i))
+                if len(runners_up) > slots:
+                    runners_up.pop()
+        
+        for _, q_i in runners_up:
+            if mod6[(p_n + q_i) % 6] > messy_thresh:
+                prediction_v16 = q_i
+                break
+                
+    return prediction_v16
+
+def open_pool_ends(prime_arr, start, end, pool_size):
+    """
+    For each p_n in prime_arr[start:end], the index one past the last prime
+    <= p_n + pool_size, so the Open Pool of prime_arr[i] is
+    prime_arr[i + 1:pool_end]. One binary search per p_n on the sorted
+    array replaces testing every integer in the pool against a prime set.
+    """
+    return np.searchsorted(prime_arr, prime_arr[start:end] + pool_size, side='right')
+
+def mod6_lut(pool_size):
+    """
+    Residue table for the JIT kernels: lut[k] == k % 6 for
+    k in [0, 6 + pool_size). With base = (2 * p_n) % 6, the residue of
+    S = p_n + q_i is lut[base + gap], so a kernel takes one modulo per
+    p_n instead of one per candidate.
+    """
+    return (np.arange(6 + pool_size) % 6).astype(np.intp)
+
+def mod_by_constant(values, modulus):
+    """
+    values % modulus for an integer array and a scalar modulus. NumPy's
+    floor division by a scalar runs as a multiply by a precomputed
+    reciprocal (libdivide), but remainder still issues one divide per
+    element; rebuilding the remainder from the quotient is ~1.7x faster
+    and gives the same result.
+    """
+    return values - (values // modulus) * modulus
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _law_one_k_min_jit(prime_arr, anchors, max_dist):
+        """
+        Merge scan twin of the NumPy path below: anchors are sorted, so one
+        pointer walks forward through the primes instead of a binary search
+        per anchor. Serial on purpose; the walk is a single pass.
+        """
+        k_min = np.empty(len(anchors), dtype=np.int64)
+        n_primes = len(prime_arr)
+        j = np.searchsorted(prime_arr, anchors[0])
+        for a in range(len(anchors)):
+            s_n = anchors[a]
+            while j < n_primes and prime_arr[j] < s_n:
+                j += 1
+            lower = s_n - prime_arr[j - 1]
+            upper = prime_arr[j] - s_n if j < n_primes else max_dist + 1
+            k = min(lower, upper)
+            k_min[a] = k if k <= max_dist else 0
+        return k_min
+
+def law_one_k_min(prime_arr, anchors, max_dist):
+    """
+    Law I k_min for each even anchor S_n: the smallest d >= 1 such that
+    S_n - d or S_n + d is prime, or 0 if there is none within max_dist.
+    One binary search per anchor finds the primes on either side of S_n,
+    replacing a prime-set probe at every distance. anchors must be sorted
+    (S_n = p_n + p_n+1 always is), so the searches run on the short
+    stretch of primes the block spans instead of the whole array.
+    """
+    if _NUMBA_AVAILABLE and len(anchors) > 0:
+        return _law_one_k_min_jit(prime_arr, anchors, max_dist)
+    lo = np.searchsorted(prime_arr, anchors[0])
+    hi = np.searchsorted(prime_arr, anchors[-1])
+    idx = lo + np.searchsorted(prime_arr[lo:hi], anchors)
+    lower = anchors - prime_arr[idx - 1]
+    # Anchors past the last prime only have a lower neighbour
+    has_upper = idx < len(prime_arr)
+    upper = np.where(has_upper, prime_arr[np.minimum(idx, len(prime_arr) - 1)] - anchors, max_dist + 1)
+    k_min = np.minimum(lower, upper)
+    return np.where(k_min <= max_dist, k_min, 0)
+
+# The 8 residues mod 30 a prime past 5 can have, and each one's bit in a
+# wheel byte (-1 for residues that share a factor with 30)
+WHEEL_RESIDUES = (1, 7, 11, 13, 17, 19, 23, 29)
+WHEEL_BIT = tuple(WHEEL_RESIDUES.index(r) if r in WHEEL_RESIDUES else -1 for r in range(30))
+
+def prime_wheel(prime_arr):
+    """
+    Mod-30 wheel bitmap of the primes: byte n // 30 has bit WHEEL_BIT[n % 30]
+    set when n is prime. Every prime past 5 is coprime to 30, so one byte
+    covers 30 integers (~67 MB for primes up to 2e9, against several GB
+    for a set of the same primes). Returned as bytes, which index faster
+    than a NumPy array from a Python loop.
+    """
+    prime_arr = np.asarray(prime_arr, dtype=np.int64)
+    wheel_primes = prime_arr[prime_arr > 5]
+    residue_bits = np.array([1 << b if b >= 0 else 0 for b in WHEEL_BIT], dtype=np.uint8)
+    wheel = np.zeros(int(prime_arr[-1]) // 30 + 1, dtype=np.uint8)
+    np.bitwise_or.at(wheel, wheel_primes // 30, residue_bits[wheel_primes % 30])
+    return wheel.tobytes()
+
+def is_prime_wheel(wheel, n):
+    """n is in the primes prime_wheel() was built from (False past the last one)."""
+    if n < 7:
+        return n == 2 or n == 3 or n == 5
+    bit = WHEEL_BIT[n % 30]
+    byte = n // 30
+    return bit >= 0 and byte < len(wheel) and (wheel[byte] >> bit) & 1 == 1
+
+def prime_table(prime_arr, limit):
+    """
+    Boolean table over [0, limit]: table[n] is True when n is prime. A
+    gather on it tests a whole array of small values (Law I k values are
+    <= the k search radius) with one load each, no search.
+    """
+    table = np.zeros(limit + 1, dtype=bool)
+    table[prime_arr[:np.searchsorted(prime_arr, limit, side='right')]] = True
+    return table
+
+def law_one_residue_counts(prime_arr, start, num_pairs, modulus, max_dist, chunk_size):
+    """
+    Anchor and Law I failure counts by S_n % modulus for the num_pairs
+    anchors S_n = p_n + p_n+1 from prime_arr[start], as two int64 arrays of
+    length modulus. A failure is a composite k_min > 1; k_min == 0 (no
+    prime within max_dist) never fails. Works in blocks of chunk_size pairs
+    and prints progress between blocks.
+    """
+    # k_min never exceeds max_dist, so a small table answers every
+    # 'is k prime?' with one lookup
+    k_is_prime = prime_table(prime_arr, max_dist)
+    anchor_counts = np.zeros(modulus, dtype=np.int64)
+    failure_counts = np.zeros(modulus, dtype=np.int64)
+    total_failures = 0
+    start_time = time.time()
+
+    end = start + num_pairs
+    for chunk_start in range(start, end, chunk_size):
+        chunk_end = min(chunk_start + chunk_size, end)
+        if _C_KERNEL_AVAILABLE:
+            # Same binning and Law I test as below, as one compiled merge scan
+            block_anchors, block_failures = plr_score.residue_scan(
+                prime_arr, chunk_start, chunk_end, modulus, max_dist)
+            anchor_counts += block_anchors
+            failure_counts += block_failures
+            total_failures += sum(block_failures)
+        else:
+            block_arr = prime_arr[chunk_start:chunk_end + 1]
+            anchors = block_arr[:-1] + block_arr[1:]
+            residues = mod_by_constant(anchors, modulus)
+            k_min_arr = law_one_k_min(prime_arr, anchors, max_dist)
+            is_k_composite = (k_min_arr > 1) & ~k_is_prime[k_min_arr]
+            total_failures += int(np.count_nonzero(is_k_composite))
+            anchor_counts += np.bincount(residues, minlength=modulus)
+            failure_counts += np.bincount(residues[is_k_composite], minlength=modulus)
+
+        elapsed = time.time() - start_time
+        print(f"Progress: {chunk_end - start:,} / {num_pairs:,} | Law I Fails: {total_failures:,} | Time: {elapsed:.0f}s", end='\r')
+
+    print(f"Progress: {num_pairs:,} / {num_pairs:,} | Law I Fails: {total_failures:,} | Time: {time.time() - start_time:.0f}s   ")
+    return anchor_counts, failure_counts
+
+def fold_residue_counts(counts, modulus):
+    """
+    Counts by n % modulus from counts by n % M, for any multiple M of
+    modulus (residue r mod M lands in r % modulus). Lets one scan by
+    lcm(6, 30, 210) = 210 fill all three maps.
+    """
+    return counts.reshape(-1, modulus).sum(axis=0)
+
+def residue_failure_rates(anchor_counts, failure_counts):
+    """
+    The messiness map {residue: failure rate %} the engines load. Residues
+    no anchor reached (odd ones, etc.) score inf.
+    """
+    rates = {}
+    for residue in range(len(anchor_counts)):
+        failures = int(failure_counts[residue])
+        total_anchors = int(anchor_counts[residue])
+        rates[residue] = (failures / total_anchors) * 100 if total_anchors > 0 else float('inf')
+    return rates
@@ -0,0 +1,526 @@
+/*
+ * ==============================================================================
+ * PATH OF LEAST RESISTANCE (PLR) - v11.0 / v16.0 / v23.0 / v24.0 C KERNELS
+ *
+ * Ahead-of-time compiled twins of count_successes() in
+ * PLR_Engine_Internal_Flip.py (also used by the v23 replication test in
+ * counter/) and in test_files_archive/PLR_Engine/PLR_Engine_Analytic_Synthesis.py,
+ * v16_open_pool_batch() in
+ * counter/test_PLR_Heuristic_3_v16_Open_Pool.py and the per-block Law I
+ * residue binning of the pac_test/ residue scripts. Build in place with:
+ *
+ *   python setup.py build_ext --inplace
+ *
+ * The scripts use this module when it can be imported and fall back to
+ * Numba / NumPy / pure Python otherwise.
+ *
+ * - S % 6 is an unsigned modulo by a constant, which the compiler turns into
+ *   a multiply-by-reciprocal (no divide instruction).
+ * - The two 6-entry score tables fit in one cache line each.
+ * - The outer loop over p_n is split across cores with OpenMP when built
+ *   with -fopenmp (setup.py does this on Linux); otherwise it runs serially.
+ * ==============================================================================
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+#include <string.h>
+#include <math.h>
+
+/*
+ * v11.0 winner and v23.0 flip for one p_n and its candidate list (in gap
+ * order). Every score is at least min_plus1 * gap, so once that reaches
+ * the best score no later candidate can win, or flip (its gap is past the
+ * winner's), and the scan stops early.
+ */
+static inline void
+v11_v23_predict(int64_t p_n, const int64_t *cands, Py_ssize_t num_cands,
+                const double *mod6_scores, const double *mod6_plus1, double min_plus1,
+                double messy_thresh, int64_t *out_v11, int64_t *out_v23)
+{
+    double best_score = INFINITY;
+    int64_t best_prime = cands[0];
+    int64_t best_gap = cands[0] - p_n;
+    int64_t messy_gap = INT64_MAX;  /* sentinel: never triggers the flip */
+    int64_t messy_prime = best_prime;
+
+    for (Py_ssize_t j = 0; j < num_cands; j++) {
+        int64_t q_i = cands[j];
+        int64_t gap_g_i = q_i - p_n;
+        if (min_plus1 * (double)gap_g_i >= best_score)
+            break;
+        unsigned residue = (unsigned)((uint64_t)(p_n + q_i) % 6u);
+        double score = mod6_plus1[residue] * (double)gap_g_i;
+        /* strict < keeps the first candidate on ties, like the stable sort */
+        if (score < best_score) {
+            best_score = score;
+            best_prime = q_i;
+            best_gap = gap_g_i;
+        }
+        if (mod6_scores[residue] > messy_thresh && gap_g_i < messy_gap) {
+            messy_gap = gap_g_i;
+            messy_prime = q_i;
+        }
+    }
+    *out_v11 = best_prime;
+    *out_v23 = messy_gap < best_gap ? messy_prime : best_prime;
+}
+
+/*
+ * v11.0 winner and v24.0 prediction (v23.0 flip, else the v16.0 chain over
+ * ranks 2..depth) for one p_n. The chain never needs the ranked list: the
+ * first Messy candidate in rank order is the Messy one with the lowest
+ * (score, position), and its rank is the number of candidates ahead of it.
+ */
+static inline void
+v11_v24_predict(int64_t p_n, const int64_t *cands, Py_ssize_t num_cands,
+                const double *mod6_scores, double clean_thresh, double messy_thresh,
+                Py_ssize_t depth, int64_t *out_v11, int64_t *out_v24)
+{
+    double best_score = INFINITY;
+    Py_ssize_t best_j = 0;
+    int64_t messy_gap = INT64_MAX;  /* sentinel: never triggers the flip */
+    int64_t messy_prime = cands[0];
+    double chain_score = INFINITY;
+    Py_ssize_t chain_j = -1;
+
+    for (Py_ssize_t j = 0; j < num_cands; j++) {
+        int64_t gap_g_i = cands[j] - p_n;
+        double rate = mod6_scores[(uint64_t)(p_n + cands[j]) % 6u];
+        double score = (rate + 1.0) * (double)gap_g_i;
+        /* strict < keeps the first candidate on ties, like the stable sort */
+        if (score < best_score) {
+            best_score = score;
+            best_j = j;
+        }
+        if (rate > messy_thresh) {
+            if (gap_g_i < messy_gap) {
+                messy_gap = gap_g_i;
+                messy_prime = cands[j];
+            }
+            if (chain_j < 0 || score < chain_score) {
+                chain_score = score;
+                chain_j = j;
+            }
+        }
+    }
+
+    int64_t pred_v11 = cands[best_j];
+    *out_v11 = pred_v11;
+    *out_v24 = pred_v11;
+    if (messy_gap < pred_v11 - p_n) {  /* PART A: v23.0 flip */
+        *out_v24 = messy_prime;
+        return;
+    }
+    /* PART B: v16.0 chain, only if #1 is Clean and a Messy candidate exists */
+    if (chain_j < 0 || mod6_scores[(uint64_t)(p_n + pred_v11) % 6u] >= clean_thresh)
+        return;
+    Py_ssize_t rank_index = 0;
+    for (Py_ssize_t j = 0; j < num_cands; j++) {
+        double score = (mod6_scores[(uint64_t)(p_n + cands[j]) % 6u] + 1.0) * (double)(cands[j] - p_n);
+        rank_index += score < chain_score || (score == chain_score && j < chain_j);
+    }
+    if (rank_index < depth)
+        *out_v24 = cands[chain_j];
+}
+
+/* Most ranks the v16.0 signature search may look at (runner-up buffer size). */
+#define V16_MAX_DEPTH 16
+
+/*
+ * Fused Open Pool + v16.0 for p_n = p[i]: walks the primes in
+ * (p_n, p_n + pool_size], keeping rank 1 and, only when rank 1 is Clean,
+ * an insertion-sorted buffer of ranks 2..depth. Returns the prediction and
+ * stores the pool size in *pool_count; an empty pool returns 0.
+ */
+static inline int64_t
+v16_open_pool_predict(const int64_t *p, Py_ssize_t n_primes, Py_ssize_t i,
+                      int64_t pool_size, const double *mod6_scores,
+                      double clean_thresh, double messy_thresh, int slots,
+                      Py_ssize_t *pool_count)
+{
+    int64_t p_n = p[i];
+    int64_t limit = p_n + pool_size;
+    Py_ssize_t winner = i + 1;  /* every score inf: first candidate, like the sort */
+    double winner_score = INFINITY;
+    Py_ssize_t j = i + 1;
+
+    for (; j < n_primes && p[j] <= limit; j++) {
+        int64_t gap_g_i = p[j] - p_n;
+        unsigned residue = (unsigned)((uint64_t)(p_n + p[j]) % 6u);
+        double score = (mod6_scores[residue] + 1.0) * (double)gap_g_i;
+        if (score < winner_score) {
+            winner_score = score;
+            winner = j;
+        }
+    }
+    Py_ssize_t pool_end = j;
+    *pool_count = pool_end - (i + 1);
+    if (*pool_count == 0)
+        return 0;
+
+    int64_t prediction = p[winner];
+    if (mod6_scores[(uint64_t)(p_n + prediction) % 6u] >= clean_thresh)
+        return prediction;
+
+    double buf_scores[V16_MAX_DEPTH];
+    int64_t buf_primes[V16_MAX_DEPTH];
+    int filled = 0;
+    for (j = i + 1; j < pool_end; j++) {
+        if (j == winner)
+            continue;
+        int64_t q_i = p[j];
+        unsigned residue = (unsigned)((uint64_t)(p_n + q_i) % 6u);
+        double score = (mod6_scores[residue] + 1.0) * (double)(q_i - p_n);
+        int pos = filled;
+        while (pos > 0 && buf_scores[pos - 1] > score)
+            pos--;
+        if (pos < slots) {
+            int last = filled < slots - 1 ? filled : slots - 1;
+            for (int m = last; m > pos; m--) {
+                buf_scores[m] = buf_scores[m - 1];
+                buf_primes[m] = buf_primes[m - 1];
+            }
+            buf_scores[pos] = score;
+            buf_primes[pos] = q_i;
+            if (filled < slots)
+                filled++;
+        }
+    }
+    for (int r = 0; r < filled; r++) {
+        if (mod6_scores[(uint64_t)(p_n + buf_primes[r]) % 6u] > messy_thresh)
+            return buf_primes[r];
+    }
+    return prediction;
+}
+
+/*
+ * Acquires a contiguous buffer whose element type is one of the struct
+ * format codes in codes (native byte order, 8-byte items), so an int64
+ * array passed as a float64 table is rejected instead of having its bits
+ * read as doubles. Returns Py_CLEANUP_SUPPORTED as an "O&" converter.
+ */
+static int
+get_typed_buffer(PyObject *obj, Py_buffer *buf, const char *codes, const char *dtype)
+{
+    if (PyObject_GetBuffer(obj, buf, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) < 0)
+        return 0;
+    const char *fmt = buf->format != NULL ? buf->format : "B";
+    if (*fmt == '@' || *fmt == '=' || (PY_LITTLE_ENDIAN && *fmt == '<'))
+        fmt++;
+    if (buf->itemsize != 8 || fmt[0] == '\0' || fmt[1] != '\0' || strchr(codes, fmt[0]) == NULL) {
+        PyErr_Format(PyExc_TypeError, "expected a contiguous %s array, got format '%s'",
+                     dtype, buf->format != NULL ? buf->format : "B");
+        PyBuffer_Release(buf);
+        return 0;
+    }
+    return Py_CLEANUP_SUPPORTED;
+}
+
+/* "O&" converter for prime arrays: int64 ('q', or 'l' where long is 8 bytes) */
+static int
+prime_buffer(PyObject *obj, void *buf)
+{
+    if (obj == NULL) {
+        PyBuffer_Release((Py_buffer *)buf);
+        return 1;
+    }
+    return get_typed_buffer(obj, (Py_buffer *)buf, "ql", "int64");
+}
+
+/* "O&" converter for the rate tables: float64 ('d') */
+static int
+rate_buffer(PyObject *obj, void *buf)
+{
+    if (obj == NULL) {
+        PyBuffer_Release((Py_buffer *)buf);
+        return 1;
+    }
+    return get_typed_buffer(obj, (Py_buffer *)buf, "d", "float64");
+}
+
+static int
+check_buffer(Py_buffer *buf, const char *name, Py_ssize_t min_len)
+{
+    if (buf->len / buf->itemsize < min_len) {
+        PyErr_Format(PyExc_ValueError, "%s must have at least %zd items", name, min_len);
+        return -1;
+    }
+    return 0;
+}
+
+PyDoc_STRVAR(count_successes_doc,
+"count_successes(prime_arr, start, end, num_cands, mod6_scores, mod6_plus1, messy_thresh)\n"
+"\n"
+"Runs v11.0 and v23.0 for every p_n in prime_arr[start:end].\n"
+"prime_arr is an int64 array; the score tables are float64 arrays of length 6.\n"
+"Returns (v11 hits, v23 hits).");
+
+static PyObject *
+count_successes(PyObject *self, PyObject *args)
+{
+    Py_buffer primes, scores, plus1;
+    Py_ssize_t start, end, num_cands;
+    double messy_thresh;
+    long long hits_v11 = 0, hits_v23 = 0;
+
+    if (!PyArg_ParseTuple(args, "O&nnnO&O&d", prime_buffer, &primes, &start, &end,
+                          &num_cands, rate_buffer, &scores, rate_buffer, &plus1,
+                          &messy_thresh))
+        return NULL;
+
+    if (check_buffer(&primes, "prime_arr", end + num_cands) < 0 ||
+        check_buffer(&scores, "mod6_scores", 6) < 0 ||
+        check_buffer(&plus1, "mod6_plus1", 6) < 0 ||
+        start < 0 || num_cands < 1) {
+        if (!PyErr_Occurred())
+            PyErr_SetString(PyExc_ValueError, "start must be >= 0 and num_cands >= 1");
+        PyBuffer_Release(&primes);
+        PyBuffer_Release(&scores);
+        PyBuffer_Release(&plus1);
+        return NULL;
+    }
+
+    const int64_t *p = (const int64_t *)primes.buf;
+    const double *mod6_scores = (const double *)scores.buf;
+    const double *mod6_plus1 = (const double *)plus1.buf;
+    double min_plus1 = mod6_plus1[0];
+    for (int r = 1; r < 6; r++)
+        min_plus1 = fmin(min_plus1, mod6_plus1[r]);
+
+    Py_BEGIN_ALLOW_THREADS
+    #pragma omp parallel for reduction(+:hits_v11, hits_v23) schedule(static)
+    for (Py_ssize_t i = start; i < end; i++) {
+        int64_t pred_v11, pred_v23;
+        v11_v23_predict(p[i], p + i + 1, num_cands, mod6_scores, mod6_plus1, min_plus1,
+                        messy_thresh, &pred_v11, &pred_v23);
+        hits_v11 += pred_v11 == p[i + 1];
+        hits_v23 += pred_v23 == p[i + 1];
+    }
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&primes);
+    PyBuffer_Release(&scores);
+    PyBuffer_Release(&plus1);
+    return Py_BuildValue("(LL)", hits_v11, hits_v23);
+}
+
+PyDoc_STRVAR(count_successes_v24_doc,
+"count_successes_v24(prime_arr, start, end, num_cands, mod6_scores, clean_thresh, messy_thresh, depth)\n"
+"\n"
+"Runs v11.0 and v24.0 for every p_n in prime_arr[start:end].\n"
+"prime_arr is an int64 array; mod6_scores is a float64 array of length 6.\n"
+"Returns (v11 hits, v24 hits).");
+
+static PyObject *
+count_successes_v24(PyObject *self, PyObject *args)
+{
+    Py_buffer primes, scores;
+    Py_ssize_t start, end, num_cands, depth;
+    double clean_thresh, messy_thresh;
+    long long hits_v11 = 0, hits_v24 = 0;
+
+    if (!PyArg_ParseTuple(args, "O&nnnO&ddn", prime_buffer, &primes, &start, &end,
+                          &num_cands, rate_buffer, &scores, &clean_thresh, &messy_thresh,
+                          &depth))
+        return NULL;
+
+    if (check_buffer(&primes, "prime_arr", end + num_cands) < 0 ||
+        check_buffer(&scores, "mod6_scores", 6) < 0 ||
+        start < 0 || num_cands < 1) {
+        if (!PyErr_Occurred())
+            PyErr_SetString(PyExc_ValueError, "start must be >= 0 and num_cands >= 1");
+        PyBuffer_Release(&primes);
+        PyBuffer_Release(&scores);
+        return NULL;
+    }
+
+    const int64_t *p = (const int64_t *)primes.buf;
+    const double *mod6_scores = (const double *)scores.buf;
+
+    Py_BEGIN_ALLOW_THREADS
+    #pragma omp parallel for reduction(+:hits_v11, hits_v24) schedule(static)
+    for (Py_ssize_t i = start; i < end; i++) {
+        int64_t pred_v11, pred_v24;
+        v11_v24_predict(p[i], p + i + 1, num_cands, mod6_scores, clean_thresh,
+                        messy_thresh, depth, &pred_v11, &pred_v24);
+        hits_v11 += pred_v11 == p[i + 1];
+        hits_v24 += pred_v24 == p[i + 1];
+    }
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&primes);
+    PyBuffer_Release(&scores);
+    return Py_BuildValue("(LL)", hits_v11, hits_v24);
+}
+
+PyDoc_STRVAR(v16_open_pool_doc,
+"v16_open_pool(prime_arr, start, end, pool_size, mod6_scores, clean_thresh, messy_thresh, depth)\n"
+"\n"
+"Runs the v16.0 Open Pool test for every p_n in prime_arr[start:end],\n"
+"skipping p_n whose gap to p_{n+1} is larger than pool_size.\n"
+"prime_arr is an int64 array; mod6_scores is a float64 array of length 6.\n"
+"Returns (predictions, successes, primes in pools).");
+
+static PyObject *
+v16_open_pool(PyObject *self, PyObject *args)
+{
+    Py_buffer primes, scores;
+    Py_ssize_t start, end;
+    long long pool_size;
+    double clean_thresh, messy_thresh;
+    int depth;
+    long long predictions = 0, successes = 0, primes_in_pools = 0;
+
+    if (!PyArg_ParseTuple(args, "O&nnLO&ddi", prime_buffer, &primes, &start, &end,
+                          &pool_size, rate_buffer, &scores, &clean_thresh, &messy_thresh,
+                          &depth))
+        return NULL;
+
+    if (check_buffer(&primes, "prime_arr", end + 1) < 0 ||
+        check_buffer(&scores, "mod6_scores", 6) < 0 ||
+        start < 0 || depth < 1 || depth > V16_MAX_DEPTH + 1) {
+        if (!PyErr_Occurred())
+            PyErr_Format(PyExc_ValueError,
+                         "start must be >= 0 and depth in [1, %d]", V16_MAX_DEPTH + 1);
+        PyBuffer_Release(&primes);
+        PyBuffer_Release(&scores);
+        return NULL;
+    }
+
+    const int64_t *p = (const int64_t *)primes.buf;
+    const double *mod6_scores = (const double *)scores.buf;
+    Py_ssize_t n_primes = primes.len / 8;
+
+    Py_BEGIN_ALLOW_THREADS
+    #pragma omp parallel for reduction(+:predictions, successes, primes_in_pools) schedule(static)
+    for (Py_ssize_t i = start; i < end; i++) {
+        if (p[i + 1] - p[i] > pool_size)
+            continue;  /* prime gap > pool_size */
+        Py_ssize_t pool_count;
+        int64_t prediction = v16_open_pool_predict(p, n_primes, i, pool_size, mod6_scores,
+                                                   clean_thresh, messy_thresh, depth - 1,
+                                                   &pool_count);
+        predictions += 1;
+        primes_in_pools += pool_count;
+        successes += prediction == p[i + 1];
+    }
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&primes);
+    PyBuffer_Release(&scores);
+    return Py_BuildValue("(LLL)", predictions, successes, primes_in_pools);
+}
+
+PyDoc_STRVAR(residue_scan_doc,
+"residue_scan(prime_arr, start, end, modulus, max_dist)\n"
+"\n"
+"Bins every anchor S_n = p_n + p_n+1 for p_n in prime_arr[start:end] by\n"
+"S_n % modulus and counts its Law I failures: k_min (the distance to the\n"
+"nearest prime within max_dist) is composite and > 1. prime_arr is a\n"
+"sorted int64 array. Returns (anchor counts, failure counts) as lists of\n"
+"length modulus.");
+
+static PyObject *
+residue_scan(PyObject *self, PyObject *args)
+{
+    Py_buffer primes;
+    Py_ssize_t start, end, modulus;
+    long long max_dist;
+
+    if (!PyArg_ParseTuple(args, "O&nnnL", prime_buffer, &primes, &start, &end, &modulus,
+                          &max_dist))
+        return NULL;
+
+    if (check_buffer(&primes, "prime_arr", end + 1) < 0 ||
+        start < 1 || end < start || modulus < 1 || max_dist < 1) {
+        if (!PyErr_Occurred())
+            PyErr_SetString(PyExc_ValueError,
+                            "need 1 <= start <= end, modulus >= 1 and max_dist >= 1");
+        PyBuffer_Release(&primes);
+        return NULL;
+    }
+
+    const int64_t *p = (const int64_t *)primes.buf;
+    Py_ssize_t n_primes = primes.len / 8;
+    long long *anchor_counts = PyMem_Calloc(modulus, sizeof(long long));
+    long long *failure_counts = PyMem_Calloc(modulus, sizeof(long long));
+    unsigned char *small_prime = PyMem_Calloc(max_dist + 1, 1);
+    if (anchor_counts == NULL || failure_counts == NULL || small_prime == NULL) {
+        PyMem_Free(anchor_counts);
+        PyMem_Free(failure_counts);
+        PyMem_Free(small_prime);
+        PyBuffer_Release(&primes);
+        return PyErr_NoMemory();
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    /* k_min never exceeds max_dist, so a small table answers "is k prime?" */
+    for (Py_ssize_t j = 0; j < n_primes && p[j] <= max_dist; j++)
+        small_prime[p[j]] = 1;
+
+    /* Anchors only grow, so one pointer walks the primes for the whole
+     * block: after the walk, p[j] is the first prime >= S_n. */
+    int64_t first_anchor = p[start] + p[start + 1];
+    Py_ssize_t lo = 0, hi = n_primes;
+    while (lo < hi) {
+        Py_ssize_t mid = lo + (hi - lo) / 2;
+        if (p[mid] < first_anchor)
+            lo = mid + 1;
+        else
+            hi = mid;
+    }
+    Py_ssize_t j = lo;
+    for (Py_ssize_t i = start; i < end; i++) {
+        int64_t s_n = p[i] + p[i + 1];
+        while (j < n_primes && p[j] < s_n)
+            j++;
+        int64_t k_min = s_n - p[j - 1];
+        if (j < n_primes && p[j] - s_n < k_min)
+            k_min = p[j] - s_n;
+        Py_ssize_t residue = (Py_ssize_t)((uint64_t)s_n % (uint64_t)modulus);
+        anchor_counts[residue] += 1;
+        /* k_min > max_dist means no prime in range: never a failure */
+        if (k_min > max_dist)
+            k_min = 0;
+        failure_counts[residue] += k_min > 1 && !small_prime[k_min];
+    }
+    Py_END_ALLOW_THREADS
+
+    PyObject *anchors = PyList_New(modulus);
+    PyObject *failures = PyList_New(modulus);
+    for (Py_ssize_t r = 0; anchors != NULL && failures != NULL && r < modulus; r++) {
+        PyList_SET_ITEM(anchors, r, PyLong_FromLongLong(anchor_counts[r]));
+        PyList_SET_ITEM(failures, r, PyLong_FromLongLong(failure_counts[r]));
+    }
+    PyMem_Free(anchor_counts);
+    PyMem_Free(failure_counts);
+    PyMem_Free(small_prime);
+    PyBuffer_Release(&primes);
+    if (anchors == NULL || failures == NULL || PyErr_Occurred()) {
+        Py_XDECREF(anchors);
+        Py_XDECREF(failures);
+        return NULL;
+    }
+    return Py_BuildValue("(NN)", anchors, failures);
+}
+
+static PyMethodDef plr_score_methods[] = {
+    {"count_successes", count_successes, METH_VARARGS, count_successes_doc},
+    {"count_successes_v24", count_successes_v24, METH_VARARGS, count_successes_v24_doc},
+    {"v16_open_pool", v16_open_pool, METH_VARARGS, v16_open_pool_doc},
+    {"residue_scan", residue_scan, METH_VARARGS, residue_scan_doc},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef plr_score_module = {
+    PyModuleDef_HEAD_INIT, "plr_score",
+    "AOT-compiled v11.0 / v16.0 / v23.0 / v24.0 and PAC residue kernels for the PLR scripts.", -1, plr_score_methods
+};
+
+PyMODINIT_FUNC
+PyInit_plr_score(void)
+{
+    return PyModule_Create(&plr_score_module);
+}
@@ -0,0 +1,33 @@
+# Builds the optional C kernels used by PLR_Engine_Internal_Flip.py, the
+# v24 Analytic Synthesis engine in test_files_archive/PLR_Engine/, the
+# counter/ tests 3 (v16 Open Pool) and 6 (v23 replication) and the
+# pac_test/ residue scripts (test-8, test-9, test-11, through plr_common):
+#
+#   python setup.py build_ext --inplace
+#
+# The scripts run without it (Numba / NumPy fallbacks).
+import sys
+
+from setuptools import Extension, setup
+
+if sys.platform.startswith("linux"):
+    compile_args = ["-O3", "-fopenmp"]
+    link_args = ["-fopenmp"]
+elif sys.platform == "win32":
+    compile_args = ["/O2", "/openmp"]
+    link_args = []
+else:
+    compile_args = ["-O3"]
+    link_args = []
+
+setup(
+    name="plr_score",
+    ext_modules=[
+        Extension(
+            "plr_score",
+            sources=["plr_score.c"],
+            extra_compile_args=compile_args,
+            extra_link_args=link_args,
+        )
+    ],
+)
@@ -10,14 +10,29 @@
 # 75.94% accuracy gain.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
 from collections import defaultdict
 
+import numpy as np
+
+# The shared loaders live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes, load_mod6_map, mod6_table, mod_by_constant
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
 # --- Engine Setup (v11.0 "Weighted Gap") ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
+MOD6_TUPLE = None # Dense length-6 view of the map (index = S % 6)
+MOD6_SCORES = None # Array twin of MOD6_TUPLE for the batch engine
 
 # --- These are the "Signature" thresholds ---
 CLEAN_THRESHOLD = 3.0  # (v_mod6 score < 3.0 is "Clean")
@@ -27,63 +42,160 @@ MAX_SIGNATURE_SEARCH_DEPTH = 4 # (Will check Ranks 2, 3, and 4)
 
 
 def load_engine_data():
-    """Loads the v_mod6 messiness map."""
-    global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
-        return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
+    """Loads the v_mod6 messiness map (shared loader, parsed once per process)."""
+    global MESSINESS_MAP_V_MOD6, MOD6_TUPLE, MOD6_SCORES
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
+    MOD6_TUPLE = mod6_table(MESSINESS_MAP_V_MOD6)
+    MOD6_SCORES = np.array(MOD6_TUPLE, dtype=np.float64)
+    print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
+    return True
 
 def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
     """The v11.0 "Weighted Gap" Engine."""
-    if MESSINESS_MAP_V_MOD6 is None:
+    if MOD6_TUPLE is None:
         return float('inf')
-    score_mod6 = MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-    if score_mod6 == float('inf'):
-        return float('inf')
-    return (score_mod6 + 1.0) * gap_g_n
+    # inf rates stay inf: (inf + 1.0) * gap with gap > 0
+    return (MOD6_TUPLE[anchor_sn % 6] + 1.0) * gap_g_n
 
 def get_vmod6_score(anchor_sn):
     """Helper to get *only* the v_mod6 rate."""
-    if MESSINESS_MAP_V_MOD6 is None:
+    if MOD6_TUPLE is None:
         return float('inf')
-    return MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
+    return MOD6_TUPLE[anchor_sn % 6]
 # --- End Engine Setup ---
 
+# --- JIT Engine (Numba, optional) ---
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def count_successes(prime_arr, start, end, num_cands, mod6_scores,
+                        clean_thresh, messy_thresh, depth):
+        """
+        Loop twin of predict_batch for every p_n in prime_arr[start:end].
+        Only the ranks the chain can reach are kept: each candidate is
+        insertion-sorted into a (depth + 1)-slot buffer, shifting only
+        strictly larger scores so ties keep list.sort order. The chain is
+        then walked as in the original loop. Returns
+        (v15 hits, v16 hits, overrides).
+        """
+        hits_v15 = 0
+        hits_v16 = 0
+        overrides = 0
+        slots = min(depth + 1, num_cands)
+        scores = np.empty(slots)
+        primes = np.empty(slots, dtype=np.int64)
+        rates = np.empty(slots)
+        for i in range(start, end):
+            p_n = prime_arr[i]
+            filled = 0
+            for j in range(num_cands):
+                q_i = prime_arr[i + 1 + j]
+                rate = mod6_scores[(p_n + q_i) % 6]
+                score = (rate + 1.0) * (q_i - p_n)
+                pos = filled
+                while pos > 0 and scores[pos - 1] > score:
+                    pos -= 1
+                if pos == slots:
+                    continue
+                for m in range(min(filled, slots - 1), pos, -1):
+                    scores[m] = scores[m - 1]
+                    primes[m] = primes[m - 1]
+                    rates[m] = rates[m - 1]
+                scores[pos] = score
+                primes[pos] = q_i
+                rates[pos] = rate
+                if filled < slots:
+                    filled += 1
+            
+            prediction_v15 = primes[0]
+            prediction_v16 = primes[0]
+            if rates[0] < clean_thresh:
+                for rank_index in range(1, slots):
+                    if rates[rank_index] > messy_thresh:
+                        overrides += 1
+                        if rank_index <= 2:
+                            prediction_v15 = primes[rank_index]
+                        if rank_index <= 3:
+                            prediction_v16 = primes[rank_index]
+                        break
+            
+            true_p_n_plus_1 = prime_arr[i + 1]
+            if prediction_v15 == true_p_n_plus_1:
+                hits_v15 += 1
+            if prediction_v16 == true_p_n_plus_1:
+                hits_v16 += 1
+        return hits_v15, hits_v16, overrides
+
+def warm_up_kernels():
+    """Compiles (or loads the cached) JIT kernel so compile time is not billed to the test."""
+    if not _NUMBA_AVAILABLE:
+        return
+    start_time = time.time()
+    dummy = np.arange(3, 3 + 4 * NUM_CANDIDATES_TO_CHECK, 2, dtype=np.int64)
+    count_successes(dummy, 0, 2, NUM_CANDIDATES_TO_CHECK, MOD6_SCORES,
+                    CLEAN_THRESHOLD, MESSY_THRESHOLD, MAX_SIGNATURE_SEARCH_DEPTH)
+    print(f"Compiled Numba kernel in {time.time() - start_time:.2f} seconds.")
+
+# --- Vectorized Batch Engine (NumPy broadcasting) ---
+def predict_batch(prime_arr, start, end):
+    """
+    Runs v15.0 and v16.0 for every p_n in prime_arr[start:end] at once.
+    Each row of the (N, NUM_CANDIDATES_TO_CHECK) window matrix is one p_n's
+    candidate list, scored as in the two helpers above. Returns
+    (pred_v15, pred_v16, overridden), where overridden marks the rows whose
+    chain found a Messy candidate.
+    """
+    p = prime_arr[start:end, None]
+    Q = np.lib.stride_tricks.sliding_window_view(
+        prime_arr[start + 1:end + NUM_CANDIDATES_TO_CHECK], NUM_CANDIDATES_TO_CHECK)
+    rates = MOD6_SCORES[mod_by_constant(p + Q, 6)]
+    scores = (rates + 1.0) * (Q - p)
+    
+    # The v11.0 ranked list, cut to the ranks the chain can reach. A stable
+    # sort keeps the first candidate on ties, like list.sort.
+    order = np.argsort(scores, axis=1, kind='stable')[:, :MAX_SIGNATURE_SEARCH_DEPTH + 1]
+    ranked_primes = np.take_along_axis(Q, order, axis=1)
+    ranked_rates = np.take_along_axis(rates, order, axis=1)
+    pred_v11 = ranked_primes[:, 0]
+    
+    # --- CHAINED SEARCH: Ranks 2.. ---
+    # Only when #1 is "Clean" (potential failure signature); the first
+    # 'Messy' candidate found is the override, counted once per p_n.
+    is_messy = ranked_rates[:, 1:] > MESSY_THRESHOLD
+    overridden = (ranked_rates[:, 0] < CLEAN_THRESHOLD) & is_messy.any(axis=1)
+    rank_index = is_messy.argmax(axis=1) + 1
+    next_candidate_prime = np.take_along_axis(ranked_primes, rank_index[:, None], axis=1)[:, 0]
+    
+    # v15.0 applies the Rank 2 and Rank 3 fixes, v16.0 also the Rank 4 fix.
+    # A first Messy candidate deeper than that still counts as an override
+    # but changes neither prediction.
+    pred_v15 = np.where(overridden & (rank_index <= 2), next_candidate_prime, pred_v11)
+    pred_v16 = np.where(overridden & (rank_index <= 3), next_candidate_prime, pred_v11)
+    return pred_v15, pred_v16, overridden
+
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
+# p_n values per vectorized batch: keeps the (N, 10) intermediates ~80MB
+# each instead of several GB for the full 50M range
+CHUNK_SIZE = 1000000
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr
 
 # --- Main Testing Logic ---
 def run_PLR_v16_chained_signature_test():
@@ -92,8 +204,10 @@ def run_PLR_v16_chained_signature_test():
         print("Stopping test: Engine data could not be loaded.")
         return
         
-    prime_list = load_primes_from_file(PRIME_INPUT_FILE)
-    if prime_list is None: return
+    prime_arr = load_primes_from_file(PRIME_INPUT_FILE)
+    if prime_arr is None: return
+
+    warm_up_kernels()
 
     print(f"\nStarting PLR 'Chained Signature' Test (v16.0 - Metric Update) for {PRIMES_TO_TEST:,} primes...")
     print(f"  - Engine: v11.0 + 'Clean #1 vs. Messy #(2-4)' Chained Override")
@@ -110,96 +224,36 @@ def run_PLR_v16_chained_signature_test():
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    if loop_end_index >= len(prime_list) - (NUM_CANDIDATES_TO_CHECK + 2):
+    if loop_end_index >= len(prime_arr) - (NUM_CANDIDATES_TO_CHECK + 2):
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v16_acc = (total_successes_v16_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
-            v15_acc = (total_successes_v15_baseline / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v16.0 Acc: {v16_acc:.2f}% | v15.0 Acc: {v15_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
-        
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+    # --- Run both engines one block of p_n at a time ---
+    # Numba loop if available, else NumPy batch.
+    for chunk_start in range(START_INDEX, loop_end_index, CHUNK_SIZE):
+        chunk_end = min(chunk_start + CHUNK_SIZE, loop_end_index)
         
-        # Get the v11.0 ranked list
-        candidate_scores = []
-        for q_i in candidates:
-            S_cand = p_n + q_i
-            gap_g_i = q_i - p_n
-            score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-            # Store (score, prime, vmod6_score)
-            vmod6_rate = get_vmod6_score(S_cand)
-            candidate_scores.append((score_v11, q_i, vmod6_rate))
-
-        total_predictions += 1
-        candidate_scores.sort(key=lambda x: x[0])
+        if _NUMBA_AVAILABLE:
+            hits_v15, hits_v16, overrides = count_successes(
+                prime_arr, chunk_start, chunk_end, NUM_CANDIDATES_TO_CHECK, MOD6_SCORES,
+                CLEAN_THRESHOLD, MESSY_THRESHOLD, MAX_SIGNATURE_SEARCH_DEPTH)
+        else:
+            pred_v15, pred_v16, overridden = predict_batch(prime_arr, chunk_start, chunk_end)
+            true_p_n_plus_1 = prime_arr[chunk_start + 1:chunk_end + 1]
+            hits_v15 = int(np.count_nonzero(pred_v15 == true_p_n_plus_1))
+            hits_v16 = int(np.count_nonzero(pred_v16 == true_p_n_plus_1))
+            overrides = int(np.count_nonzero(overridden))
         
-        # --- Apply v15.0 Baseline Logic (Ranks 2 and 3) ---
+        total_predictions += chunk_end - chunk_start
+        total_successes_v15_baseline += hits_v15
+        total_successes_v16_new_champ += hits_v16
+        total_v16_overrides_attempted += overrides
         
-        winner_v11_prime = candidate_scores[0][1]
-        winner_v11_vmod6 = candidate_scores[0][2]
-        
-        # We need to know the v15 prediction for the final tally
-        prediction_v15 = winner_v11_prime
-        
-        # The new v16.0 engine's prediction
-        prediction_v16 = winner_v11_prime # Default for new engine
-        
-        
-        # --- CHAINED SEARCH: Ranks 2, 3, 4 ---
-        if winner_v11_vmod6 < CLEAN_THRESHOLD: # If #1 is "Clean" (potential failure signature)
-            
-            # This flag tracks if *any* override was applied in this chain
-            override_applied = False
-            
-            for rank_index in range(1, MAX_SIGNATURE_SEARCH_DEPTH + 1):
-                if rank_index >= len(candidate_scores):
-                    break
-                    
-                next_candidate_vmod6 = candidate_scores[rank_index][2]
-                
-                if next_candidate_vmod6 > MESSY_THRESHOLD:
-                    # *** OVERRIDE ***
-                    # The first 'Messy' candidate found is the prediction
-                    
-                    if not override_applied:
-                        # Only count the override once (at the highest priority rank found)
-                        total_v16_overrides_attempted += 1
-                        override_applied = True
-                        
-                    # The override decision is the Messy candidate's prime
-                    next_candidate_prime = candidate_scores[rank_index][1]
-
-                    # Tallying logic for both baselines and new engine:
-                    if rank_index == 1: # Rank 2 fix (v12.0 logic)
-                        prediction_v15 = next_candidate_prime
-                        prediction_v16 = next_candidate_prime
-                    elif rank_index == 2: # Rank 3 fix (v15.0 logic)
-                        # The v15 baseline uses Rank 2 OR Rank 3 fix
-                        if not candidate_scores[1][2] > MESSY_THRESHOLD:
-                            prediction_v15 = next_candidate_prime
-                        prediction_v16 = next_candidate_prime
-                    elif rank_index == 3: # Rank 4 fix (v16.0 new logic)
-                        prediction_v16 = next_candidate_prime
-                        
-                    # Break the chain after the first fix is applied (highest priority)
-                    break 
-
-        # --- Tally v15.0 Baseline Result ---
-        if prediction_v15 == true_p_n_plus_1:
-            total_successes_v15_baseline += 1
-            
-        # --- Tally v16.0 Result ---
-        if prediction_v16 == true_p_n_plus_1:
-            total_successes_v16_new_champ += 1
+        # Progress once per block
+        elapsed = time.time() - start_time
+        v16_acc = (total_successes_v16_new_champ / total_predictions) * 100
+        v15_acc = (total_successes_v15_baseline / total_predictions) * 100
+        print(f"Progress: {total_predictions:,} / {PRIMES_TO_TEST:,} | v16.0 Acc: {v16_acc:.2f}% | v15.0 Acc: {v15_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
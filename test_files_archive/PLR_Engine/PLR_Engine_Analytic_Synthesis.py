@@ -12,157 +12,299 @@
 # 75.94% structural framework.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
+import multiprocessing
 from collections import defaultdict
 
+import numpy as np
+
+# The shared loaders live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes, load_mod6_map, mod6_table, mod_by_constant
+
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+try:
+    import plr_score # Optional C kernel: python setup.py build_ext --inplace (repo root)
+    _C_KERNEL_AVAILABLE = True
+except ImportError:
+    _C_KERNEL_AVAILABLE = False
+
 # --- Engine Setup ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
+MOD6_SCORES = None # Dense length-6 array view of the map (index = S % 6)
+MOD6_PAIR_SCORES = None # Same rates by residue pair: index 6 * (p % 6) + q % 6
+FLOAT32_GAP_LIMIT = 0 # Largest gap for which float32 batch scores rank exactly
 
 CLEAN_THRESHOLD = 3.0  
 MESSY_THRESHOLD = 20.0 
 MAX_SIGNATURE_SEARCH_DEPTH = 4 # Ranks 2, 3, 4
 
 def load_engine_data():
-    """Loads the v_mod6 messiness map."""
-    global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
-        return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
+    """Loads the v_mod6 messiness map (shared loader, parsed once per process)."""
+    global MESSINESS_MAP_V_MOD6, MOD6_SCORES, MOD6_PAIR_SCORES, FLOAT32_GAP_LIMIT
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
+    MOD6_SCORES = np.array(mod6_table(MESSINESS_MAP_V_MOD6), dtype=np.float64)
+    # S % 6 == (p % 6 + q % 6) % 6, so the rate of S = p + q can be
+    # read straight off the two primes' residues
+    MOD6_PAIR_SCORES = MOD6_SCORES[np.add.outer(np.arange(6), np.arange(6)) % 6].ravel()
+    FLOAT32_GAP_LIMIT = float32_exact_gap_limit(MOD6_SCORES)
+    print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
+    return True
 
-def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
-    """The v11.0 "Weighted Gap" Engine Core (Multiplicative)."""
-    if MESSINESS_MAP_V_MOD6 is None: return float('inf')
-    score_mod6 = MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-    if score_mod6 == float('inf'): return float('inf')
-    return (score_mod6 + 1.0) * gap_g_n
-
-def get_vmod6_score(anchor_sn):
-    """Helper to get *only* the v_mod6 rate."""
-    if MESSINESS_MAP_V_MOD6 is None: return float('inf')
-    return MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-
-# --- v11.0 BASELINE FUNCTION (For v24.0 step 1) ---
-def get_v11_multiplicative_prediction(p_n, candidates):
-    """v11.0 Multiplicative Core: (v_mod6 + 1.0) * gap. Returns the winner prime."""
-    candidate_scores = []
-    for q_i in candidates:
-        S_cand = p_n + q_i
-        gap_g_i = q_i - p_n
-        score = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-        candidate_scores.append((score, q_i))
-
-    candidate_scores.sort(key=lambda x: x[0])
-    return candidate_scores[0][1]
-
-# --- v24.0 SYNTHESIS FUNCTION ---
-def get_v24_synthesis_prediction(p_n, candidates, v11_baseline_prediction):
-    
-    # 1. Build the full evidence list and isolate bins (needed for both v23 and v16 logic)
-    candidates_data = []
-    messy_bin = []
-    
-    for q_i in candidates:
-        S_cand = p_n + q_i
-        gap_g_i = q_i - p_n
-        score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-        vmod6_rate = get_vmod6_score(S_cand)
+def float32_exact_gap_limit(rates, max_gap=1 << 16):
+    """
+    Largest G (up to max_gap) such that float32 (rate + 1.0) * gap, for
+    every finite rate and every gap <= G, ranks exactly like float64: same
+    order, no new ties. Close rates limit it; found by bisection, since a
+    smaller G only drops scores.
+    """
+    plus1 = rates[np.isfinite(rates)] + 1.0
+    def ranks_exactly(G):
+        gaps = np.arange(1, G + 1)
+        s64 = (plus1[:, None] * gaps).ravel()
+        s32 = (plus1.astype(np.float32)[:, None] * gaps.astype(np.float32)).ravel()
+        order = np.argsort(s64, kind='stable')
+        return np.array_equal(np.sign(np.diff(s64[order])), np.sign(np.diff(s32[order])))
+    lo, hi = 0, max_gap + 1
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        lo, hi = (mid, hi) if ranks_exactly(mid) else (lo, mid)
+    return lo
+
+# --- Numba JIT Kernels (used when numba is installed) ---
+# v11.0 and v24.0 as a scalar loop over an int64 candidate array: no
+# dicts, lists or sorting. The v16.0 step never needs the full ranked
+# list: the first Messy candidate in rank order is the Messy one with the
+# lowest (score, position), and a second pass counts how many candidates
+# rank ahead of it.
+_NO_MESSY_GAP = np.iinfo(np.int64).max
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def v11_v24_predict(p_n, cands, pair_row, cands_mod6, clean_thresh, messy_thresh, depth):
+        """
+        v11.0 and v24.0 for one p_n: returns (pred_v11, pred_v24).
+        pair_row is p_n's row of MOD6_PAIR_SCORES and cands_mod6 the
+        candidates' residues, so each rate is one table load (no % 6).
+        """
+        best_score = np.inf
+        best_j = 0
+        messy_gap = _NO_MESSY_GAP
+        messy_prime = cands[0]
+        chain_score = np.inf
+        chain_j = -1
+        for j in range(len(cands)):
+            q_i = cands[j]
+            gap_g_i = q_i - p_n
+            rate = pair_row[cands_mod6[j]]
+            score = (rate + 1.0) * gap_g_i
+            # Strict '<' keeps the first candidate on ties, like the stable sort
+            if score < best_score:
+                best_score = score
+                best_j = j
+            if rate > messy_thresh:
+                if gap_g_i < messy_gap:
+                    messy_gap = gap_g_i
+                    messy_prime = q_i
+                if chain_j < 0 or score < chain_score:
+                    chain_score = score
+                    chain_j = j
         
-        data = (score_v11, q_i, vmod6_rate, gap_g_i)
-        candidates_data.append(data)
+        pred_v11 = cands[best_j]
+        # PART A: v23.0 Flip
+        if messy_gap < pred_v11 - p_n:
+            return pred_v11, messy_prime
         
-        if vmod6_rate > MESSY_THRESHOLD:
-            messy_bin.append(data)
-            
-    # Sort data for ease of accessing the Rank 1/Rank 2/Rank 3 elements
-    candidates_data.sort(key=lambda x: x[0]) 
-
-    # --- PART A: Apply v23.0 Logic (The 100% Flip Gate) ---
-    
-    # Get v11.0 Winner data
-    v11_winner_prime = candidates_data[0][1]
-    v11_winner_gap = candidates_data[0][3]
+        # PART B: v16.0 Chain, only if #1 is "Clean" and a Messy candidate exists
+        if chain_j >= 0 and pair_row[cands_mod6[best_j]] < clean_thresh:
+            rank_index = 0
+            for j in range(len(cands)):
+                q_i = cands[j]
+                score = (pair_row[cands_mod6[j]] + 1.0) * (q_i - p_n)
+                if score < chain_score or (score == chain_score and j < chain_j):
+                    rank_index += 1
+            if rank_index < depth: # Ranks 2 .. depth
+                return pred_v11, cands[chain_j]
+        return pred_v11, pred_v11
 
-    prediction_v24 = v11_winner_prime # Default starts at the v11 winner
-    flip_triggered = False
+    @njit(parallel=True, cache=True)
+    def count_successes(prime_arr, primes_mod6, start, end, num_cands, pair_scores,
+                        clean_thresh, messy_thresh, depth):
+        """
+        Runs v11_v24_predict for every p_n in prime_arr[start:end] across
+        all cores (each p_n is independent; the hit counters are prange
+        reductions). Returns (v11 hits, v24 hits).
+        """
+        hits_v11 = 0
+        hits_v24 = 0
+        for i in prange(start, end):
+            row = 6 * primes_mod6[i]
+            pred_v11, pred_v24 = v11_v24_predict(
+                prime_arr[i], prime_arr[i + 1:i + 1 + num_cands], pair_scores[row:row + 6],
+                primes_mod6[i + 1:i + 1 + num_cands], clean_thresh, messy_thresh, depth)
+            true_p_n_plus_1 = prime_arr[i + 1]
+            if pred_v11 == true_p_n_plus_1:
+                hits_v11 += 1
+            if pred_v24 == true_p_n_plus_1:
+                hits_v24 += 1
+        return hits_v11, hits_v24
 
-    if messy_bin:
-        messy_bin.sort(key=lambda x: x[3]) # Sort Messy Bin by gap
-        g_messy_low = messy_bin[0][3]
-        p_messy_low = messy_bin[0][1]
-        
-        # Analytic Logic Gate: If g_messy_low is LOWER than the winner's gap
-        if g_messy_low < v11_winner_gap:
-            # FLIP: The structural necessity overrides the arithmetic winner
-            prediction_v24 = p_messy_low
-            flip_triggered = True
+def warm_up_kernels():
+    """Compiles (or loads the cached) JIT kernels so compile time is not billed to the test."""
+    if _C_KERNEL_AVAILABLE or not _NUMBA_AVAILABLE:
+        return
+    start_time = time.time()
+    dummy = np.arange(3, 3 + 4 * NUM_CANDIDATES_TO_CHECK, 2, dtype=np.int64)
+    count_successes(dummy, residues_mod6(dummy), 0, 2, NUM_CANDIDATES_TO_CHECK, MOD6_PAIR_SCORES,
+                    CLEAN_THRESHOLD, MESSY_THRESHOLD, MAX_SIGNATURE_SEARCH_DEPTH)
+    print(f"Compiled Numba kernels in {time.time() - start_time:.2f} seconds.")
 
-    # --- PART B: Apply v16.0 Logic (The 75.94% Chained Signature Fix) ---
+# --- Vectorized Batch Engine (NumPy, candidate-major) ---
+def predict_batch(prime_arr, primes_mod6, start, end):
+    """
+    Runs v11.0 and v24.0 for every p_n in prime_arr[start:end] at once.
+    Candidate slot j (the j-th next prime) is one contiguous length-N row
+    of each work array, scored as (rate + 1.0) * gap; the two v24.0 steps
+    become per-column masks and selects. primes_mod6 is prime_arr % 6 as
+    uint8 (see residues_mod6). Returns (pred_v11, pred_v24) as int64 arrays.
+    """
+    num_p = end - start
+    p = prime_arr[start:end]
+    row = primes_mod6[start:end] * np.uint8(6)
     
-    # We only apply the v16.0 logic if the v23.0 flip DID NOT occur.
-    if not flip_triggered:
-        
-        # Extract v16.0 required metrics from the v11 ranked list
-        winner_v11_vmod6 = candidates_data[0][2] # Rank 1 vmod6 score
-        
-        if winner_v11_vmod6 < CLEAN_THRESHOLD: # If #1 is "Clean"
-            for rank_index in range(1, MAX_SIGNATURE_SEARCH_DEPTH): # Ranks 2, 3, 4
-                if rank_index >= len(candidates_data): break
-                
-                next_candidate_vmod6 = candidates_data[rank_index][2]
-                
-                if next_candidate_vmod6 > MESSY_THRESHOLD:
-                    # Found the Messy suspect - OVERRIDE
-                    prediction_v24 = candidates_data[rank_index][1]
-                    break
-                    
-    return prediction_v24
+    # Structure of arrays: gaps, residue pairs and scores are separate
+    # (NUM_CANDIDATES_TO_CHECK, N) arrays rather than N small windows, so
+    # every pass below runs along long contiguous rows. The anchor
+    # S = p_n + q_i is never materialized: each candidate's residue pair
+    # is one uint8 add into a 36-entry table, instead of an int64 add and
+    # modulo per candidate.
+    gaps = np.empty((NUM_CANDIDATES_TO_CHECK, num_p), dtype=np.int32)
+    pairs = np.empty((NUM_CANDIDATES_TO_CHECK, num_p), dtype=np.uint8)
+    for j in range(NUM_CANDIDATES_TO_CHECK):
+        np.subtract(prime_arr[start + 1 + j:end + 1 + j], p, out=gaps[j], casting='unsafe')
+        np.add(row, primes_mod6[start + 1 + j:end + 1 + j], out=pairs[j])
+    
+    # Scores are only ranked, so float32 scores (half the bytes through
+    # the gathers) are used whenever they rank exactly like float64; past
+    # FLOAT32_GAP_LIMIT fall back to float64. The Clean/Messy tests read
+    # boolean pair tables built from the float64 rates, so no threshold
+    # test ever sees a rounded rate.
+    score_dtype = np.float32 if gaps[-1].max() <= FLOAT32_GAP_LIMIT else np.float64
+    scores = np.multiply((MOD6_PAIR_SCORES + 1.0).astype(score_dtype)[pairs], gaps, dtype=score_dtype)
+    is_messy_pair = MOD6_PAIR_SCORES > MESSY_THRESHOLD
+    is_clean_pair = MOD6_PAIR_SCORES < CLEAN_THRESHOLD
+    
+    # The v11.0 winner: argmin keeps the first candidate on ties, like a
+    # stable sort. No column is ever sorted (see PART B).
+    cols = np.arange(num_p)
+    win_idx = scores.argmin(axis=0)
+    first_q = start + 1 + cols # prime_arr index of each p_n's first candidate
+    pred_v11 = prime_arr[first_q + win_idx]
+    
+    # --- PART A: v23.0 Flip ---
+    # Candidates come in gap order, so the closest Messy candidate is the
+    # first Messy slot; columns without one never flip.
+    messy = is_messy_pair[pairs]
+    messy_idx = messy.argmax(axis=0)
+    has_messy = messy[messy_idx, cols]
+    flip_triggered = has_messy & (gaps[messy_idx, cols] < gaps[win_idx, cols])
+    
+    # --- PART B: v16.0 Chain (Ranks 2, 3, 4), only where #1 is "Clean" ---
+    # As in the Numba kernel: the first Messy candidate in rank order is the
+    # Messy one with the lowest (score, position), and its rank is the
+    # number of candidates that sort ahead of it.
+    chain_idx = np.where(messy, scores, np.inf).argmin(axis=0)
+    chain_score = scores[chain_idx, cols]
+    ahead = (scores < chain_score) | ((scores == chain_score) &
+                                      (np.arange(NUM_CANDIDATES_TO_CHECK)[:, None] < chain_idx))
+    overridden = (is_clean_pair[pairs[win_idx, cols]] & has_messy &
+                  (ahead.sum(axis=0) < MAX_SIGNATURE_SEARCH_DEPTH))
+    
+    pred_v24 = np.where(flip_triggered, prime_arr[first_q + messy_idx],
+                        np.where(overridden, prime_arr[first_q + chain_idx], pred_v11))
+    return pred_v11, pred_v24
+
+def residues_mod6(prime_arr):
+    """Precomputes p % 6 for every prime once, as a compact uint8 array."""
+    return mod_by_constant(prime_arr, 6).astype(np.uint8)
 
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
+# p_n values per batch: keeps each (10, N) work array a few MB, so a
+# block's passes stay in cache instead of streaming ~80MB arrays
+CHUNK_SIZE = 100000
+# Processes for the NumPy fallback; the C and Numba kernels already use every core
+WORKERS = os.cpu_count() or 1
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr
+
+def count_block_v24(prime_arr, primes_mod6, start, end):
+    """(v11.0 hits, v24.0 hits) for p_n in prime_arr[start:end], on the fastest available path."""
+    if _C_KERNEL_AVAILABLE:
+        return plr_score.count_successes_v24(
+            prime_arr, start, end, NUM_CANDIDATES_TO_CHECK, MOD6_SCORES,
+            CLEAN_THRESHOLD, MESSY_THRESHOLD, MAX_SIGNATURE_SEARCH_DEPTH)
+    if _NUMBA_AVAILABLE:
+        return count_successes(
+            prime_arr, primes_mod6, start, end, NUM_CANDIDATES_TO_CHECK, MOD6_PAIR_SCORES,
+            CLEAN_THRESHOLD, MESSY_THRESHOLD, MAX_SIGNATURE_SEARCH_DEPTH)
+    pred_v11, pred_v24 = predict_batch(prime_arr, primes_mod6, start, end)
+    true_p_n_plus_1 = prime_arr[start + 1:end + 1]
+    return int((pred_v11 == true_p_n_plus_1).sum()), int((pred_v24 == true_p_n_plus_1).sum())
+
+# --- Worker processes for the NumPy fallback ---
+# Each worker memory-maps the same .npy prime cache (shared page cache, no
+# copy) and only block bounds and hit counts cross the process boundary.
+_WORKER_PRIMES = None
+
+def _init_worker(prime_file, mod6_scores, pair_scores, float32_gap_limit):
+    """Pool initializer: maps the cached prime array and sets the score tables."""
+    global _WORKER_PRIMES, MOD6_SCORES, MOD6_PAIR_SCORES, FLOAT32_GAP_LIMIT
+    _WORKER_PRIMES = load_primes(prime_file, verbose=False)
+    MOD6_SCORES, MOD6_PAIR_SCORES, FLOAT32_GAP_LIMIT = mod6_scores, pair_scores, float32_gap_limit
+
+def _count_block_worker(bounds):
+    # Residues for this block's primes only, rather than all 100M per worker
+    start, end = bounds
+    block = _WORKER_PRIMES[start:end + NUM_CANDIDATES_TO_CHECK]
+    return count_block_v24(block, residues_mod6(block), 0, end - start)
 
 # --- Main Testing Logic ---
 def run_PLR_v24_synthesis_test():
     
     if not load_engine_data(): return
         
-    prime_list = load_primes_from_file(PRIME_INPUT_FILE)
-    if prime_list is None: return
+    prime_arr = load_primes_from_file(PRIME_INPUT_FILE)
+    if prime_arr is None: return
+
+    primes_mod6 = residues_mod6(prime_arr)
+    warm_up_kernels()
 
     print(f"\nStarting PLR 'Analytic Synthesis' Test (v24.0) for {PRIMES_TO_TEST:,} primes...")
     print(f"  - Baseline: v11.0 (60.49% Core)")
@@ -176,38 +318,37 @@ def run_PLR_v24_synthesis_test():
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    if loop_end_index >= len(prime_list) - (NUM_CANDIDATES_TO_CHECK + 2):
+    if loop_end_index >= len(prime_arr) - (NUM_CANDIDATES_TO_CHECK + 2):
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v24_acc = (total_successes_v24_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
-            v11_acc = (total_successes_v11_baseline / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v24.0 Acc: {v24_acc:.2f}% | v11.0 Acc: {v11_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
+    # --- Run both engines one block at a time ---
+    # C kernel if built, else Numba kernel if installed, else the NumPy
+    # batch engine spread over WORKERS processes
+    blocks = [(chunk_start, min(chunk_start + CHUNK_SIZE, loop_end_index))
+              for chunk_start in range(START_INDEX, loop_end_index, CHUNK_SIZE)]
+    pool = None
+    if _C_KERNEL_AVAILABLE or _NUMBA_AVAILABLE or WORKERS <= 1:
+        block_hits = (count_block_v24(prime_arr, primes_mod6, start, end) for start, end in blocks)
+    else:
+        pool = multiprocessing.Pool(WORKERS, initializer=_init_worker,
+                                    initargs=(PRIME_INPUT_FILE, MOD6_SCORES, MOD6_PAIR_SCORES, FLOAT32_GAP_LIMIT))
+        block_hits = pool.imap(_count_block_worker, blocks)
 
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
-        
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+    for (chunk_start, chunk_end), (hits_v11, hits_v24) in zip(blocks, block_hits):
+        total_successes_v11_baseline += hits_v11
+        total_successes_v24_new_champ += hits_v24
+        total_predictions += chunk_end - chunk_start
         
-        # --- Run both engines ---
-        
-        # v11.0 Baseline
-        pred_v11 = get_v11_multiplicative_prediction(p_n, candidates)
-        if pred_v11 == true_p_n_plus_1:
-            total_successes_v11_baseline += 1
-        
-        # v24.0 Challenger
-        pred_v24 = get_v24_synthesis_prediction(p_n, candidates, pred_v11) # pred_v11 is unused here, but kept for future structure
-        if pred_v24 == true_p_n_plus_1:
-            total_successes_v24_new_champ += 1
-            
-        total_predictions += 1
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        v24_acc = (total_successes_v24_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
+        v11_acc = (total_successes_v11_baseline / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v24.0 Acc: {v24_acc:.2f}% | v11.0 Acc: {v11_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
+    
+    if pool is not None:
+        pool.close()
+        pool.join()
             
     # --- Final Summary ---
     progress = total_predictions
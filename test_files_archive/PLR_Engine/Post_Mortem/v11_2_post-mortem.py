@@ -29,83 +29,68 @@
 # "Path of Least Resistance" is not always the true path.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
 from collections import defaultdict
 
+import numpy as np
+
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from plr_common import load_primes, load_mod6_map, mod6_table, mod_by_constant
+
 # --- Engine Setup (v11.0 "Weighted Gap") ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
+MOD6_SCORES = None # Dense length-6 array view of the map (index = S % 6)
 
 def load_engine_data():
-    """Loads the v_mod6 messiness map."""
-    global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
-        return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
+    """Loads the v_mod6 messiness map (shared loader, parsed once per process)."""
+    global MESSINESS_MAP_V_MOD6, MOD6_SCORES
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
+    MOD6_SCORES = np.array(mod6_table(MESSINESS_MAP_V_MOD6), dtype=np.float64)
+    print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
+    return True
+
+# --- End Engine Setup ---
 
-def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
+def score_batch(prime_arr, start, end):
     """
-    The v11.0 "Weighted Gap" Engine.
-    Final_Score = (v_mod6_rate + 1.0) * (gap_g_n)
-    Returns a single float value.
+    v11.0 rates and scores for every p_n in prime_arr[start:end] at once.
+    Row r of each (N, NUM_CANDIDATES_TO_CHECK) matrix is p_n =
+    prime_arr[start + r] against its candidate list, so column 0 is always
+    the true p_n+1. Returns (rates, scores).
     """
-    if MESSINESS_MAP_V_MOD6 is None:
-        return float('inf')
-
-    score_mod6 = MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-    
-    # Handle 'inf' scores to avoid math errors
-    if score_mod6 == float('inf'):
-        return float('inf')
-        
-    final_weighted_score = (score_mod6 + 1.0) * gap_g_n
-    return final_weighted_score
-
-def get_vmod6_score(anchor_sn):
-    """Helper to get *only* the v_mod6 rate."""
-    if MESSINESS_MAP_V_MOD6 is None:
-        return float('inf')
-    return MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-# --- End Engine Setup ---
+    p = prime_arr[start:end, None]
+    Q = np.lib.stride_tricks.sliding_window_view(
+        prime_arr[start + 1:end + NUM_CANDIDATES_TO_CHECK], NUM_CANDIDATES_TO_CHECK)
+    rates = MOD6_SCORES[mod_by_constant(p + Q, 6)]
+    return rates, (rates + 1.0) * (Q - p)
 
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
+CHUNK_SIZE = 100000 # p_n per block; progress is printed between blocks
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
-        print("Please ensure 'primes_100m.txt' is in a 'prime' folder.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr
 
 # --- Main Testing Logic ---
 def run_PLR_v11_failure_analysis():
@@ -114,8 +99,8 @@ def run_PLR_v11_failure_analysis():
         print("Stopping test: Engine data could not be loaded.")
         return
         
-    prime_list = load_primes_from_file(PRIME_INPUT_FILE)
-    if prime_list is None: return
+    prime_arr = load_primes_from_file(PRIME_INPUT_FILE)
+    if prime_arr is None: return
 
     print(f"\nStarting PLR v11.0 Failure Analysis for {PRIMES_TO_TEST:,} primes...")
     print(f"  - Engine: v11.0 (v_mod6_rate * gap_g_n)")
@@ -134,63 +119,35 @@ def run_PLR_v11_failure_analysis():
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    if loop_end_index >= len(prime_list) - (NUM_CANDIDATES_TO_CHECK + 2):
+    if loop_end_index >= len(prime_arr) - (NUM_CANDIDATES_TO_CHECK + 2):
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v11_acc = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Acc: {v11_acc:.2f}% | Failures: {total_failures:,} | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    for chunk_start in range(START_INDEX, loop_end_index, CHUNK_SIZE):
+        chunk_end = min(chunk_start + CHUNK_SIZE, loop_end_index)
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+        rates, scores = score_batch(prime_arr, chunk_start, chunk_end)
         
-        candidate_scores = []
-        for q_i in candidates:
-            S_cand = p_n + q_i
-            gap_g_i = q_i - p_n
-            
-            score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-            candidate_scores.append((score_v11, q_i))
-
         # --- Tally Winners ---
-        total_predictions += 1
+        # argmin keeps the first (smallest) prime on ties, like the sort;
+        # the winner is the true prime exactly when it is column 0
+        win_idx = scores.argmin(axis=1)
+        failed = np.flatnonzero(win_idx != 0)
+        total_predictions += chunk_end - chunk_start
+        total_failures += len(failed)
+        total_successes += (chunk_end - chunk_start) - len(failed)
         
-        candidate_scores.sort(key=lambda x: x[0])
-        min_score = candidate_scores[0][0]
-        winners_list = [q_i for score, q_i in candidate_scores if score == min_score]
-        winner = winners_list[0] # Smallest prime in case of a tie
-
-        if winner == true_p_n_plus_1:
-            total_successes += 1
-        else:
-            # --- THIS IS A FAILURE. ANALYZE IT. ---
-            total_failures += 1
-            
-            # 1. Get True Prime's data
-            true_anchor = p_n + true_p_n_plus_1
-            true_gap = true_p_n_plus_1 - p_n
-            true_vmod6 = get_vmod6_score(true_anchor)
-
-            # 2. Get Fake Winner's data
-            fake_anchor = p_n + winner
-            fake_gap = winner - p_n
-            fake_vmod6 = get_vmod6_score(fake_anchor)
-            
-            # 3. Categorize the failure
-            if true_vmod6 == fake_vmod6:
-                scenario_A_failures += 1
-            elif true_vmod6 > fake_vmod6:
-                scenario_B_failures += 1
-            else: # true_vmod6 < fake_vmod6
-                scenario_C_failures += 1
+        # --- Categorize every FAILURE by True vs. Fake v_mod6 score ---
+        true_vmod6 = rates[failed, 0]
+        fake_vmod6 = rates[failed, win_idx[failed]]
+        scenario_A_failures += int(np.count_nonzero(true_vmod6 == fake_vmod6))
+        scenario_B_failures += int(np.count_nonzero(true_vmod6 > fake_vmod6))
+        scenario_C_failures += int(np.count_nonzero(true_vmod6 < fake_vmod6))
+        
+        # Progress once per block
+        elapsed = time.time() - start_time
+        v11_acc = (total_successes / total_predictions) * 100
+        print(f"Progress: {total_predictions:,} / {PRIMES_TO_TEST:,} | Acc: {v11_acc:.2f}% | Failures: {total_failures:,} | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
@@ -14,75 +14,68 @@
 #
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
 from collections import defaultdict
 
+import numpy as np
+
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from plr_common import load_primes, load_mod6_map, mod6_table, mod_by_constant
+
 # --- Engine Setup (v11.0 "Weighted Gap") ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
+MOD6_SCORES = None # Dense length-6 array view of the map (index = S % 6)
 
 def load_engine_data():
-    """Loads the v_mod6 messiness map."""
-    global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
-        return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
+    """Loads the v_mod6 messiness map (shared loader, parsed once per process)."""
+    global MESSINESS_MAP_V_MOD6, MOD6_SCORES
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
+    MOD6_SCORES = np.array(mod6_table(MESSINESS_MAP_V_MOD6), dtype=np.float64)
+    print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
+    return True
 
-def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
+# --- End Engine Setup ---
+
+def score_batch(prime_arr, start, end):
     """
-    The v11.0 "Weighted Gap" Engine.
-    Final_Score = (v_mod6_rate + 1.0) * (gap_g_n)
+    v11.0 rates and scores for every p_n in prime_arr[start:end] at once.
+    Row r of each (N, NUM_CANDIDATES_TO_CHECK) matrix is p_n =
+    prime_arr[start + r] against its candidate list, so column 0 is always
+    the true p_n+1. Returns (rates, scores).
     """
-    if MESSINESS_MAP_V_MOD6 is None:
-        return float('inf')
-
-    score_mod6 = MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-    
-    if score_mod6 == float('inf'):
-        return float('inf')
-        
-    final_weighted_score = (score_mod6 + 1.0) * gap_g_n
-    return final_weighted_score
-# --- End Engine Setup ---
+    p = prime_arr[start:end, None]
+    Q = np.lib.stride_tricks.sliding_window_view(
+        prime_arr[start + 1:end + NUM_CANDIDATES_TO_CHECK], NUM_CANDIDATES_TO_CHECK)
+    rates = MOD6_SCORES[mod_by_constant(p + Q, 6)]
+    return rates, (rates + 1.0) * (Q - p)
 
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
+CHUNK_SIZE = 100000 # p_n per block; progress is printed between blocks
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
-        print("Please ensure 'primes_100m.txt' is in a 'prime' folder.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr
 
 # --- Main Testing Logic ---
 def run_PLR_v11_failure_rank_analysis():
@@ -91,8 +84,8 @@ def run_PLR_v11_failure_rank_analysis():
         print("Stopping test: Engine data could not be loaded.")
         return
         
-    prime_list = load_primes_from_file(PRIME_INPUT_FILE)
-    if prime_list is None: return
+    prime_arr = load_primes_from_file(PRIME_INPUT_FILE)
+    if prime_arr is None: return
 
     print(f"\nStarting PLR v11.0 Failure Rank Analysis for {PRIMES_TO_TEST:,} primes...")
     print(f"  - Engine: v11.0 (v_mod6_rate * gap_g_n)")
@@ -110,57 +103,33 @@ def run_PLR_v11_failure_rank_analysis():
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    if loop_end_index >= len(prime_list) - (NUM_CANDIDATES_TO_CHECK + 2):
+    if loop_end_index >= len(prime_arr) - (NUM_CANDIDATES_TO_CHECK + 2):
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v11_acc = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Acc: {v11_acc:.2f}% | Failures: {total_failures:,} | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    for chunk_start in range(START_INDEX, loop_end_index, CHUNK_SIZE):
+        chunk_end = min(chunk_start + CHUNK_SIZE, loop_end_index)
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+        rates, scores = score_batch(prime_arr, chunk_start, chunk_end)
         
-        candidate_scores = []
-        for q_i in candidates:
-            S_cand = p_n + q_i
-            gap_g_i = q_i - p_n
-            
-            score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-            # Store (score, prime)
-            candidate_scores.append((score_v11, q_i))
-
-        # --- Tally Winners ---
-        total_predictions += 1
+        # --- Rank of the true prime (column 0) in the sorted list ---
+        # The stable sort puts it after every strictly lower score and
+        # before its ties (it is the first candidate), so no sort is needed.
+        # Rank 1 is a success, anything else a failure.
+        true_prime_rank = 1 + np.count_nonzero(scores[:, 1:] < scores[:, :1], axis=1)
+        failure_ranks = true_prime_rank[true_prime_rank > 1]
+        total_predictions += chunk_end - chunk_start
+        total_failures += len(failure_ranks)
+        total_successes += (chunk_end - chunk_start) - len(failure_ranks)
         
-        # Sort the list by score
-        candidate_scores.sort(key=lambda x: x[0])
+        for rank, count in enumerate(np.bincount(failure_ranks, minlength=NUM_CANDIDATES_TO_CHECK + 1)):
+            if count > 0:
+                failure_rank_distribution[rank] += int(count)
         
-        # Get the winner
-        winner = candidate_scores[0][1]
-
-        if winner == true_p_n_plus_1:
-            total_successes += 1
-        else:
-            # --- THIS IS A FAILURE. FIND THE TRUE PRIME'S RANK. ---
-            total_failures += 1
-            
-            true_prime_rank = -1
-            for rank in range(NUM_CANDIDATES_TO_CHECK): # rank is 0-9
-                if candidate_scores[rank][1] == true_p_n_plus_1:
-                    # Ranks are 1-based, so add 1
-                    true_prime_rank = rank + 1
-                    break
-            
-            if true_prime_rank != -1:
-                failure_rank_distribution[true_prime_rank] += 1
+        # Progress once per block
+        elapsed = time.time() - start_time
+        v11_acc = (total_successes / total_predictions) * 100
+        print(f"Progress: {total_predictions:,} / {PRIMES_TO_TEST:,} | Acc: {v11_acc:.2f}% | Failures: {total_failures:,} | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
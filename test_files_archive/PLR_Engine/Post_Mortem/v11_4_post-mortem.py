@@ -8,69 +8,68 @@
 # creating the final, unpredictable failures.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
 from collections import defaultdict
 
+import numpy as np
+
+# The shared loaders and Law I helpers live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from plr_common import load_primes, load_mod6_map, mod6_table, mod_by_constant, law_one_k_min, prime_table
+
 # --- Engine Setup (v11.0 "Weighted Gap" Core) ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
+MOD6_SCORES = None # Dense length-6 array view of the map (index = S % 6)
 
 def load_engine_data():
-    """Loads the v_mod6 messiness map."""
-    global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
+    """Loads the v_mod6 messiness map (shared loader, parsed once per process)."""
+    global MESSINESS_MAP_V_MOD6, MOD6_SCORES
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
+    MOD6_SCORES = np.array(mod6_table(MESSINESS_MAP_V_MOD6), dtype=np.float64)
+    return True
 
-def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
-    """The v11.0 "Weighted Gap" Engine."""
-    if MESSINESS_MAP_V_MOD6 is None:
-        return float('inf')
-    score_mod6 = MESSINESS_MAP_V_MOD6.get(anchor_sn % 6, float('inf'))
-    if score_mod6 == float('inf'):
-        return float('inf')
-    return (score_mod6 + 1.0) * gap_g_n
 # --- End Engine Setup ---
 
+def v11_winner_index_batch(prime_arr, start, end):
+    """
+    Column of the v11.0 winner for every p_n in prime_arr[start:end] at
+    once, where row r holds p_n = prime_arr[start + r] against its
+    candidate list (column 0 is the true p_n+1). argmin keeps the first
+    candidate on ties, like the stable sort.
+    """
+    p = prime_arr[start:end, None]
+    Q = np.lib.stride_tricks.sliding_window_view(
+        prime_arr[start + 1:end + NUM_CANDIDATES_TO_CHECK], NUM_CANDIDATES_TO_CHECK)
+    scores = (MOD6_SCORES[mod_by_constant(p + Q, 6)] + 1.0) * (Q - p)
+    return scores.argmin(axis=1)
+
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
+CHUNK_SIZE = 100000 # p_n per block; progress is printed between blocks
+K_SEARCH_LIMIT = 2000 # Law I k_min search radius (the old failsafe)
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
-        return None, None
-    
-    prime_set = set(prime_list)
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes and created set in {end_time - start_time:.2f} seconds.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
+        return None
     
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
-        return None, None
+        return None
         
-    return prime_list, prime_set
-
-def is_prime(k_val, prime_set):
-    """Helper function to check if k is prime."""
-    if k_val < 2: return False
-    return k_val in prime_set
+    return prime_arr
 
 # --- Main Testing Logic ---
 def run_PLR_k_min_composition_analysis():
@@ -79,8 +78,11 @@ def run_PLR_k_min_composition_analysis():
         print("Stopping test: Engine data could not be loaded.")
         return
         
-    prime_list, prime_set = load_primes_from_file(PRIME_INPUT_FILE)
-    if prime_list is None: return
+    prime_arr = load_primes_from_file(PRIME_INPUT_FILE)
+    if prime_arr is None: return
+    # k_min never exceeds K_SEARCH_LIMIT, so a small table answers every
+    # 'is k prime?' with one lookup
+    k_is_prime = prime_table(prime_arr, K_SEARCH_LIMIT)
 
     print(f"\nStarting PLR k_min Composition Analysis for {PRIMES_TO_TEST:,} primes...")
     print(f"  - Analyzing composite k_min for v11.0 Failures (the structural root).")
@@ -93,56 +95,36 @@ def run_PLR_k_min_composition_analysis():
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    if loop_end_index >= len(prime_list) - (NUM_CANDIDATES_TO_CHECK + 2):
+    if loop_end_index >= len(prime_arr) - (NUM_CANDIDATES_TO_CHECK + 2):
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Failures Analyzed: {total_v11_failures_analyzed:,} | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    for chunk_start in range(START_INDEX, loop_end_index, CHUNK_SIZE):
+        chunk_end = min(chunk_start + CHUNK_SIZE, loop_end_index)
         
-        # 1. Run the v11.0 Engine to check for a FAILURE
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+        # 1. Run the v11.0 Engine to find this block's FAILURES
+        #    (the winner is not column 0, the true p_n+1)
+        failed = np.flatnonzero(v11_winner_index_batch(prime_arr, chunk_start, chunk_end) != 0)
         
-        candidate_scores = []
-        for q_i in candidates:
-            S_cand = p_n + q_i
-            gap_g_i = q_i - p_n
-            score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-            candidate_scores.append((score_v11, q_i))
-
-        candidate_scores.sort(key=lambda x: x[0])
-        winner_v11 = candidate_scores[0][1]
-
-        if winner_v11 != true_p_n_plus_1:
-            # --- THIS IS A v11.0 FAILURE. NOW ANALYZE THE TRUE ANCHOR'S STRUCTURE. ---
-            
-            # 2. Find the true anchor's k_min (structural factor)
-            anchor_S_n = p_n + true_p_n_plus_1
-            min_distance_k = 0
-            search_dist = 1
-            
-            while True:
-                q_lower = anchor_S_n - search_dist
-                q_upper = anchor_S_n + search_dist
-                if q_lower in prime_set: min_distance_k = search_dist; break
-                if q_upper in prime_set: min_distance_k = search_dist; break
-                search_dist += 1
-                if search_dist > 2000: break # Failsafe
-            
-            if min_distance_k > 0:
-                is_k_composite = (min_distance_k > 1) and not is_prime(min_distance_k, prime_set)
-                
-                if is_k_composite:
-                    total_v11_failures_analyzed += 1
-                    k_min_failure_counts[min_distance_k] += 1
+        # 2. Find each failing true anchor's k_min (structural factor):
+        #    the nearest prime within K_SEARCH_LIMIT of S_n, 0 if none
+        fail_idx = chunk_start + failed
+        anchor_S_n = prime_arr[fail_idx] + prime_arr[fail_idx + 1]
+        k_min_arr = law_one_k_min(prime_arr, anchor_S_n, K_SEARCH_LIMIT)
+        
+        # 3. Keep the composite ones, counted in order of first appearance
+        #    (the report's sort by count is stable)
+        is_k_composite = (k_min_arr > 1) & ~k_is_prime[k_min_arr]
+        k_composite = k_min_arr[is_k_composite]
+        total_v11_failures_analyzed += len(k_composite)
+        k_values, first_seen, counts = np.unique(k_composite, return_index=True, return_counts=True)
+        for order in np.argsort(first_seen):
+            k_min_failure_counts[int(k_values[order])] += int(counts[order])
+        
+        # Progress once per block
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Failures Analyzed: {total_v11_failures_analyzed:,} | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     print(f"Progress: {PRIMES_TO_TEST:,} / {PRIMES_TO_TEST:,} | Failures Analyzed: {total_v11_failures_analyzed:,} | Time: {time.time() - start_time:.0f}s")
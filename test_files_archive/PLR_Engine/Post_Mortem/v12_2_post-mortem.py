@@ -18,11 +18,16 @@
 # different failures? This is the next step to 100%.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
 from collections import defaultdict
 
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from plr_common import load_primes, load_mod6_map
+
 # --- Engine Setup (v11.0 "Weighted Gap") ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
@@ -32,21 +37,15 @@ CLEAN_THRESHOLD = 3.0  # (v_mod6 score < 3.0 is "Clean")
 MESSY_THRESHOLD = 20.0 # (v_mod6 score > 20.0 is "Messy")
 
 def load_engine_data():
-    """Loads the v_mod6 messiness map."""
+    """Loads the v_mod6 messiness map (shared loader, parsed once per process)."""
     global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
-        print(f"  - 'Clean' Signature Threshold: < {CLEAN_THRESHOLD}%")
-        print(f"  - 'Messy' Signature Threshold: > {MESSY_THRESHOLD}%")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
-        return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
+    print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
+    print(f"  - 'Clean' Signature Threshold: < {CLEAN_THRESHOLD}%")
+    print(f"  - 'Messy' Signature Threshold: > {MESSY_THRESHOLD}%")
+    return True
 
 def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
     """The v11.0 "Weighted Gap" Engine."""
@@ -67,31 +66,23 @@ def get_vmod6_score(anchor_sn):
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 100000
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
-        print("Please ensure 'primes_100m.txt' is in a 'prime' folder.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr.tolist()
 
 # --- Main Testing Logic ---
 def run_PLR_v12_failure_rank_analysis():
@@ -122,61 +113,62 @@ def run_PLR_v12_failure_rank_analysis():
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v12_acc = (total_successes_v12 / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Acc: {v12_acc:.2f}% | Failures: {total_failures_v12:,} | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    for chunk_start in range(START_INDEX, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            p_n = prime_list[i]
+            true_p_n_plus_1 = prime_list[i + 1]
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                candidates.append(prime_list[i + j])
         
-        # Get the v11.0 ranked list
-        candidate_scores = []
-        for q_i in candidates:
-            S_cand = p_n + q_i
-            gap_g_i = q_i - p_n
-            score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-            # Store (score, prime, vmod6_score)
-            vmod6_rate = get_vmod6_score(S_cand)
-            candidate_scores.append((score_v11, q_i, vmod6_rate))
-
-        total_predictions += 1
-        candidate_scores.sort(key=lambda x: x[0])
+            # Get the v11.0 ranked list
+            candidate_scores = []
+            for q_i in candidates:
+                S_cand = p_n + q_i
+                gap_g_i = q_i - p_n
+                score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
+                # Store (score, prime, vmod6_score)
+                vmod6_rate = get_vmod6_score(S_cand)
+                candidate_scores.append((score_v11, q_i, vmod6_rate))
+
+            total_predictions += 1
+            candidate_scores.sort(key=lambda x: x[0])
         
-        # --- Run v12.0 "Signature" Logic ---
-        winner_v11_prime = candidate_scores[0][1]
-        winner_v11_vmod6 = candidate_scores[0][2]
+            # --- Run v12.0 "Signature" Logic ---
+            winner_v11_prime = candidate_scores[0][1]
+            winner_v11_vmod6 = candidate_scores[0][2]
         
-        final_prediction = winner_v11_prime # Default
+            final_prediction = winner_v11_prime # Default
         
-        if winner_v11_vmod6 < CLEAN_THRESHOLD: # If #1 is "Clean"
-            if len(candidate_scores) >= 2:
-                candidate_2_vmod6 = candidate_scores[1][2]
-                if candidate_2_vmod6 > MESSY_THRESHOLD: # AND #2 is "Messy"
-                    final_prediction = candidate_scores[1][1] # OVERRIDE
-
-        # --- Tally v12.0 Result ---
-        if final_prediction == true_p_n_plus_1:
-            total_successes_v12 += 1
-        else:
-            # --- THIS IS A v12.0 FAILURE. ANALYZE IT. ---
-            total_failures_v12 += 1
+            if winner_v11_vmod6 < CLEAN_THRESHOLD: # If #1 is "Clean"
+                if len(candidate_scores) >= 2:
+                    candidate_2_vmod6 = candidate_scores[1][2]
+                    if candidate_2_vmod6 > MESSY_THRESHOLD: # AND #2 is "Messy"
+                        final_prediction = candidate_scores[1][1] # OVERRIDE
+
+            # --- Tally v12.0 Result ---
+            if final_prediction == true_p_n_plus_1:
+                total_successes_v12 += 1
+            else:
+                # --- THIS IS A v12.0 FAILURE. ANALYZE IT. ---
+                total_failures_v12 += 1
             
-            true_prime_rank = -1
-            # Find the rank of the true prime in the *original v11.0 list*
-            for rank in range(NUM_CANDIDATES_TO_CHECK): # rank is 0-9
-                if candidate_scores[rank][1] == true_p_n_plus_1:
-                    true_prime_rank = rank + 1
-                    break
+                true_prime_rank = -1
+                # Find the rank of the true prime in the *original v11.0 list*
+                for rank in range(NUM_CANDIDATES_TO_CHECK): # rank is 0-9
+                    if candidate_scores[rank][1] == true_p_n_plus_1:
+                        true_prime_rank = rank + 1
+                        break
             
-            if true_prime_rank != -1:
-                failure_rank_distribution[true_prime_rank] += 1
+                if true_prime_rank != -1:
+                    failure_rank_distribution[true_prime_rank] += 1
+
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        v12_acc = (total_successes_v12 / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Acc: {v12_acc:.2f}% | Failures: {total_failures_v12:,} | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
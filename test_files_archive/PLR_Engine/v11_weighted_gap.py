@@ -18,11 +18,17 @@
 # and prove this is the true Path of Least Resistance.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
 import json
 from collections import defaultdict
 
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes
+
 # --- Engine Setup ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MOD30_ENGINE_FILE = "data/messiness_map_v1_mod30.json"
@@ -96,31 +102,23 @@ def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 100000
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
-        print("Please ensure 'primes_100m.txt' is in a 'prime' folder.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr.tolist()
 
 def get_winner_from_scores(candidate_scores):
     """
@@ -161,48 +159,49 @@ def run_PLR_v11_weighted_test():
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v11_acc = (total_successes_v11_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
-            v7_acc = (total_successes_v7_baseline / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v11.0 Acc: {v11_acc:.2f}% | v7.0 Acc: {v7_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    for chunk_start in range(START_INDEX, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            p_n = prime_list[i]
+            true_p_n_plus_1 = prime_list[i + 1]
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                candidates.append(prime_list[i + j])
         
-        scores_v11 = []
-        scores_v7 = []
+            scores_v11 = []
+            scores_v7 = []
         
-        for q_i in candidates:
-            S_cand = p_n + q_i
-            gap_g_i = q_i - p_n
+            for q_i in candidates:
+                S_cand = p_n + q_i
+                gap_g_i = q_i - p_n
             
-            # --- Get v11.0 Score (float) ---
-            score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-            scores_v11.append((score_v11, q_i))
+                # --- Get v11.0 Score (float) ---
+                score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
+                scores_v11.append((score_v11, q_i))
             
-            # --- Get v7.0 Score (tuple) ---
-            score_v7 = get_messiness_score_v7_recursive(S_cand, gap_g_i)
-            scores_v7.append((score_v7, q_i))
+                # --- Get v7.0 Score (tuple) ---
+                score_v7 = get_messiness_score_v7_recursive(S_cand, gap_g_i)
+                scores_v7.append((score_v7, q_i))
 
-        # --- Tally Winners ---
-        total_predictions += 1
+            # --- Tally Winners ---
+            total_predictions += 1
         
-        # v11.0 Winner
-        winner_v11 = get_winner_from_scores(scores_v11)
-        if winner_v11 == true_p_n_plus_1:
-            total_successes_v11_new_champ += 1
-
-        # v7.0 Winner
-        winner_v7 = get_winner_from_scores(scores_v7)
-        if winner_v7 == true_p_n_plus_1:
-            total_successes_v7_baseline += 1
+            # v11.0 Winner
+            winner_v11 = get_winner_from_scores(scores_v11)
+            if winner_v11 == true_p_n_plus_1:
+                total_successes_v11_new_champ += 1
+
+            # v7.0 Winner
+            winner_v7 = get_winner_from_scores(scores_v7)
+            if winner_v7 == true_p_n_plus_1:
+                total_successes_v7_baseline += 1
+
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        v11_acc = (total_successes_v11_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
+        v7_acc = (total_successes_v7_baseline / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v11.0 Acc: {v11_acc:.2f}% | v7.0 Acc: {v7_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
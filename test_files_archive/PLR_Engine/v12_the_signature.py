@@ -26,11 +26,16 @@
 # failures and break the 60.49% barrier.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
 from collections import defaultdict
 
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes, load_mod6_map
+
 # --- Engine Setup (v11.0 "Weighted Gap") ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
@@ -43,21 +48,15 @@ MESSY_THRESHOLD = 20.0 # (Actual scores are ~26.2%)
 
 
 def load_engine_data():
-    """Loads the v_mod6 messiness map."""
+    """Loads the v_mod6 messiness map (shared loader, parsed once per process)."""
     global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
-        print(f"  - 'Clean' Signature Threshold: < {CLEAN_THRESHOLD}%")
-        print(f"  - 'Messy' Signature Threshold: > {MESSY_THRESHOLD}%")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
-        return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
+    print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
+    print(f"  - 'Clean' Signature Threshold: < {CLEAN_THRESHOLD}%")
+    print(f"  - 'Messy' Signature Threshold: > {MESSY_THRESHOLD}%")
+    return True
 
 def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
     """The v11.0 "Weighted Gap" Engine."""
@@ -78,31 +77,23 @@ def get_vmod6_score(anchor_sn):
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 100000
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
-        print("Please ensure 'primes_100m.txt' is in a 'prime' folder.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr.tolist()
 
 # --- Main Testing Logic ---
 def run_PLR_v12_signature_test():
@@ -130,66 +121,67 @@ def run_PLR_v12_signature_test():
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v12_acc = (total_successes_v12_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
-            v11_acc = (total_successes_v11_baseline / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v12.0 Acc: {v12_acc:.2f}% | v11.0 Acc: {v11_acc:.2f}% | Overrides: {total_overrides_attempted:,} | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    for chunk_start in range(START_INDEX, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            p_n = prime_list[i]
+            true_p_n_plus_1 = prime_list[i + 1]
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                candidates.append(prime_list[i + j])
         
-        candidate_scores = []
-        for q_i in candidates:
-            S_cand = p_n + q_i
-            gap_g_i = q_i - p_n
-            score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-            candidate_scores.append((score_v11, q_i))
-
-        # --- Get v11.0 Baseline Prediction ---
-        total_predictions += 1
-        candidate_scores.sort(key=lambda x: x[0])
+            candidate_scores = []
+            for q_i in candidates:
+                S_cand = p_n + q_i
+                gap_g_i = q_i - p_n
+                score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
+                candidate_scores.append((score_v11, q_i))
+
+            # --- Get v11.0 Baseline Prediction ---
+            total_predictions += 1
+            candidate_scores.sort(key=lambda x: x[0])
         
-        winner_v11 = candidate_scores[0][1] # Get the prime
-        if winner_v11 == true_p_n_plus_1:
-            total_successes_v11_baseline += 1
+            winner_v11 = candidate_scores[0][1] # Get the prime
+            if winner_v11 == true_p_n_plus_1:
+                total_successes_v11_baseline += 1
             
-        # --- Run v12.0 "Signature" Logic ---
-        final_prediction = winner_v11 # Default to v11.0
+            # --- Run v12.0 "Signature" Logic ---
+            final_prediction = winner_v11 # Default to v11.0
         
-        # We need at least 2 candidates to check for the signature
-        if len(candidate_scores) >= 2:
-            # 1. Get #1 and #2 candidates' data
-            winner_v11_prime = candidate_scores[0][1]
-            candidate_2_prime = candidate_scores[1][1]
-
-            # 2. Get their "Cleanliness" scores (v_mod6 rate)
-            winner_v11_anchor = p_n + winner_v11_prime
-            winner_v11_vmod6 = get_vmod6_score(winner_v11_anchor)
+            # We need at least 2 candidates to check for the signature
+            if len(candidate_scores) >= 2:
+                # 1. Get #1 and #2 candidates' data
+                winner_v11_prime = candidate_scores[0][1]
+                candidate_2_prime = candidate_scores[1][1]
+
+                # 2. Get their "Cleanliness" scores (v_mod6 rate)
+                winner_v11_anchor = p_n + winner_v11_prime
+                winner_v11_vmod6 = get_vmod6_score(winner_v11_anchor)
             
-            candidate_2_anchor = p_n + candidate_2_prime
-            candidate_2_vmod6 = get_vmod6_score(candidate_2_anchor)
+                candidate_2_anchor = p_n + candidate_2_prime
+                candidate_2_vmod6 = get_vmod6_score(candidate_2_anchor)
             
-            # 3. Apply the "Signature Test"
-            is_winner_clean = (winner_v11_vmod6 < CLEAN_THRESHOLD)
-            is_c2_messy = (candidate_2_vmod6 > MESSY_THRESHOLD)
+                # 3. Apply the "Signature Test"
+                is_winner_clean = (winner_v11_vmod6 < CLEAN_THRESHOLD)
+                is_c2_messy = (candidate_2_vmod6 > MESSY_THRESHOLD)
             
-            if is_winner_clean and is_c2_messy:
-                # *** OVERRIDE ***
-                # This is the "Clean #1 vs. Messy #2" signature.
-                # We bet that this is a Scenario B failure.
-                final_prediction = candidate_2_prime
-                total_overrides_attempted += 1
-
-        # 4. Tally the final v12.0 prediction
-        if final_prediction == true_p_n_plus_1:
-            total_successes_v12_new_champ += 1
+                if is_winner_clean and is_c2_messy:
+                    # *** OVERRIDE ***
+                    # This is the "Clean #1 vs. Messy #2" signature.
+                    # We bet that this is a Scenario B failure.
+                    final_prediction = candidate_2_prime
+                    total_overrides_attempted += 1
+
+            # 4. Tally the final v12.0 prediction
+            if final_prediction == true_p_n_plus_1:
+                total_successes_v12_new_champ += 1
+
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        v12_acc = (total_successes_v12_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
+        v11_acc = (total_successes_v11_baseline / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v12.0 Acc: {v12_acc:.2f}% | v11.0 Acc: {v11_acc:.2f}% | Overrides: {total_overrides_attempted:,} | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
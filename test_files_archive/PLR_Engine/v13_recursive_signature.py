@@ -23,11 +23,16 @@
 # and be the definitive test of the PLR.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
 from collections import defaultdict
 
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes, load_mod6_map
+
 # --- Engine Setup (v11.0 "Weighted Gap") ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
@@ -42,22 +47,16 @@ RECURSIVE_SEARCH_DEPTH = 6 # (Will check Ranks 2, 3, 4, 5, 6)
 
 
 def load_engine_data():
-    """Loads the v_mod6 messiness map."""
+    """Loads the v_mod6 messiness map (shared loader, parsed once per process)."""
     global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
-        print(f"  - 'Clean' Signature Threshold: < {CLEAN_THRESHOLD}%")
-        print(f"  - 'Messy' Signature Threshold: > {MESSY_THRESHOLD}%")
-        print(f"  - 'Recursive Search Depth': Ranks 2-{RECURSIVE_SEARCH_DEPTH}")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
-        return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
+    print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
+    print(f"  - 'Clean' Signature Threshold: < {CLEAN_THRESHOLD}%")
+    print(f"  - 'Messy' Signature Threshold: > {MESSY_THRESHOLD}%")
+    print(f"  - 'Recursive Search Depth': Ranks 2-{RECURSIVE_SEARCH_DEPTH}")
+    return True
 
 def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
     """The v11.0 "Weighted Gap" Engine."""
@@ -78,31 +77,23 @@ def get_vmod6_score(anchor_sn):
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 100000
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
-        print("Please ensure 'primes_100m.txt' is in a 'prime' folder.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr.tolist()
 
 # --- Main Testing Logic ---
 def run_PLR_v13_recursive_signature_test():
@@ -130,73 +121,74 @@ def run_PLR_v13_recursive_signature_test():
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v13_acc = (total_successes_v13_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
-            v11_acc = (total_successes_v11_baseline / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v13.0 Acc: {v13_acc:.2f}% | v11.0 Acc: {v11_acc:.2f}% | Overrides: {total_overrides_attempted:,} | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    for chunk_start in range(START_INDEX, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            p_n = prime_list[i]
+            true_p_n_plus_1 = prime_list[i + 1]
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                candidates.append(prime_list[i + j])
         
-        # Get the v11.0 ranked list
-        candidate_scores = []
-        for q_i in candidates:
-            S_cand = p_n + q_i
-            gap_g_i = q_i - p_n
-            score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-            candidate_scores.append((score_v11, q_i))
-
-        # --- Get v11.0 Baseline Prediction ---
-        total_predictions += 1
-        candidate_scores.sort(key=lambda x: x[0])
+            # Get the v11.0 ranked list
+            candidate_scores = []
+            for q_i in candidates:
+                S_cand = p_n + q_i
+                gap_g_i = q_i - p_n
+                score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
+                candidate_scores.append((score_v11, q_i))
+
+            # --- Get v11.0 Baseline Prediction ---
+            total_predictions += 1
+            candidate_scores.sort(key=lambda x: x[0])
         
-        winner_v11_prime = candidate_scores[0][1] # Get the prime
-        if winner_v11_prime == true_p_n_plus_1:
-            total_successes_v11_baseline += 1
+            winner_v11_prime = candidate_scores[0][1] # Get the prime
+            if winner_v11_prime == true_p_n_plus_1:
+                total_successes_v11_baseline += 1
             
-        # --- Run v13.0 "Recursive Signature" Logic ---
-        final_prediction = winner_v11_prime # Default to v11.0
+            # --- Run v13.0 "Recursive Signature" Logic ---
+            final_prediction = winner_v11_prime # Default to v11.0
         
-        # 1. Get the v_mod6 score of the #1 Winner
-        winner_v11_anchor = p_n + winner_v11_prime
-        winner_v11_vmod6 = get_vmod6_score(winner_v11_anchor)
+            # 1. Get the v_mod6 score of the #1 Winner
+            winner_v11_anchor = p_n + winner_v11_prime
+            winner_v11_vmod6 = get_vmod6_score(winner_v11_anchor)
         
-        # 2. IF the #1 Winner is "Clean", start searching for a "Messy" one
-        if winner_v11_vmod6 < CLEAN_THRESHOLD:
+            # 2. IF the #1 Winner is "Clean", start searching for a "Messy" one
+            if winner_v11_vmod6 < CLEAN_THRESHOLD:
             
-            # 3. Recursively search Ranks 2 through RECURSIVE_SEARCH_DEPTH
-            # (List index 1 is Rank 2)
-            for rank_index in range(1, RECURSIVE_SEARCH_DEPTH):
+                # 3. Recursively search Ranks 2 through RECURSIVE_SEARCH_DEPTH
+                # (List index 1 is Rank 2)
+                for rank_index in range(1, RECURSIVE_SEARCH_DEPTH):
                 
-                # Stop if we run out of candidates (e.g., if NUM_CANDIDATES < 6)
-                if rank_index >= len(candidate_scores):
-                    break
+                    # Stop if we run out of candidates (e.g., if NUM_CANDIDATES < 6)
+                    if rank_index >= len(candidate_scores):
+                        break
                     
-                # 4. Get the next candidate's data
-                next_candidate_prime = candidate_scores[rank_index][1]
-                next_candidate_anchor = p_n + next_candidate_prime
-                next_candidate_vmod6 = get_vmod6_score(next_candidate_anchor)
+                    # 4. Get the next candidate's data
+                    next_candidate_prime = candidate_scores[rank_index][1]
+                    next_candidate_anchor = p_n + next_candidate_prime
+                    next_candidate_vmod6 = get_vmod6_score(next_candidate_anchor)
                 
-                # 5. Check if it's "Messy"
-                if next_candidate_vmod6 > MESSY_THRESHOLD:
-                    # *** OVERRIDE ***
-                    # We found the "Clean #1 vs. Messy #(2-6)" signature.
-                    # We predict this "Messy" candidate instead.
-                    final_prediction = next_candidate_prime
-                    total_overrides_attempted += 1
-                    # We're done searching
-                    break 
+                    # 5. Check if it's "Messy"
+                    if next_candidate_vmod6 > MESSY_THRESHOLD:
+                        # *** OVERRIDE ***
+                        # We found the "Clean #1 vs. Messy #(2-6)" signature.
+                        # We predict this "Messy" candidate instead.
+                        final_prediction = next_candidate_prime
+                        total_overrides_attempted += 1
+                        # We're done searching
+                        break 
         
-        # 6. Tally the final v13.0 prediction
-        if final_prediction == true_p_n_plus_1:
-            total_successes_v13_new_champ += 1
+            # 6. Tally the final v13.0 prediction
+            if final_prediction == true_p_n_plus_1:
+                total_successes_v13_new_champ += 1
+
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        v13_acc = (total_successes_v13_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
+        v11_acc = (total_successes_v11_baseline / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v13.0 Acc: {v13_acc:.2f}% | v11.0 Acc: {v11_acc:.2f}% | Overrides: {total_overrides_attempted:,} | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
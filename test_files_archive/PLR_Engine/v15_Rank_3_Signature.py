@@ -11,11 +11,16 @@
 # to provide a net gain over the v12.0 (68.07%) baseline.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
 from collections import defaultdict
 
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes, load_mod6_map
+
 # --- Engine Setup (v11.0 "Weighted Gap") ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
@@ -25,19 +30,13 @@ CLEAN_THRESHOLD = 3.0  # (v_mod6 score < 3.0 is "Clean")
 MESSY_THRESHOLD = 20.0 # (v_mod6 score > 20.0 is "Messy")
 
 def load_engine_data():
-    """Loads the v_mod6 messiness map."""
+    """Loads the v_mod6 messiness map (shared loader, parsed once per process)."""
     global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
-        return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
+    print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
+    return True
 
 def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
     """The v11.0 "Weighted Gap" Engine."""
@@ -58,31 +57,23 @@ def get_vmod6_score(anchor_sn):
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 100000
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
-        print("Please ensure 'primes_100m.txt' is in a 'prime' folder.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr.tolist()
 
 # --- Main Testing Logic ---
 def run_PLR_v15_rank3_signature_test():
@@ -110,92 +101,93 @@ def run_PLR_v15_rank3_signature_test():
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v15_acc = (total_successes_v15_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
-            v12_acc = (total_successes_v12_baseline / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v15.0 Acc: {v15_acc:.2f}% | v12.0 Acc: {v12_acc:.2f}% | Rank 3 Overrides: {total_rank3_overrides_attempted:,} | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    for chunk_start in range(START_INDEX, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            p_n = prime_list[i]
+            true_p_n_plus_1 = prime_list[i + 1]
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                candidates.append(prime_list[i + j])
         
-        # Get the v11.0 ranked list
-        candidate_scores = []
-        for q_i in candidates:
-            S_cand = p_n + q_i
-            gap_g_i = q_i - p_n
-            score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-            # Store (score, prime, vmod6_score)
-            vmod6_rate = get_vmod6_score(S_cand)
-            candidate_scores.append((score_v11, q_i, vmod6_rate))
-
-        total_predictions += 1
-        candidate_scores.sort(key=lambda x: x[0])
+            # Get the v11.0 ranked list
+            candidate_scores = []
+            for q_i in candidates:
+                S_cand = p_n + q_i
+                gap_g_i = q_i - p_n
+                score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
+                # Store (score, prime, vmod6_score)
+                vmod6_rate = get_vmod6_score(S_cand)
+                candidate_scores.append((score_v11, q_i, vmod6_rate))
+
+            total_predictions += 1
+            candidate_scores.sort(key=lambda x: x[0])
         
-        # --- Apply v12.0 Baseline Logic ---
+            # --- Apply v12.0 Baseline Logic ---
         
-        # Get data for the top candidates
-        winner_v11_prime = candidate_scores[0][1]
-        winner_v11_vmod6 = candidate_scores[0][2]
+            # Get data for the top candidates
+            winner_v11_prime = candidate_scores[0][1]
+            winner_v11_vmod6 = candidate_scores[0][2]
         
-        prediction_v12 = winner_v11_prime # Default
+            prediction_v12 = winner_v11_prime # Default
         
-        # v12.0 Logic: Check Rank 2
-        if winner_v11_vmod6 < CLEAN_THRESHOLD: # If #1 is "Clean"
-            if len(candidate_scores) >= 2:
-                candidate_2_vmod6 = candidate_scores[1][2]
-                if candidate_2_vmod6 > MESSY_THRESHOLD: # AND #2 is "Messy"
-                    prediction_v12 = candidate_scores[1][1] # OVERRIDE
-
-        if prediction_v12 == true_p_n_plus_1:
-            total_successes_v12_baseline += 1
+            # v12.0 Logic: Check Rank 2
+            if winner_v11_vmod6 < CLEAN_THRESHOLD: # If #1 is "Clean"
+                if len(candidate_scores) >= 2:
+                    candidate_2_vmod6 = candidate_scores[1][2]
+                    if candidate_2_vmod6 > MESSY_THRESHOLD: # AND #2 is "Messy"
+                        prediction_v12 = candidate_scores[1][1] # OVERRIDE
+
+            if prediction_v12 == true_p_n_plus_1:
+                total_successes_v12_baseline += 1
             
-        # --- Apply v15.0 Logic (The New Fix) ---
+            # --- Apply v15.0 Logic (The New Fix) ---
         
-        final_prediction_v15 = prediction_v12 # Start with v12's prediction
+            final_prediction_v15 = prediction_v12 # Start with v12's prediction
         
-        # The Rank 2 override has priority (it's built into prediction_v12).
-        # We only need to check for Rank 3 if the v12 prediction was NOT an override.
-        # Simplest way: check if prediction_v12 chose Rank 1.
+            # The Rank 2 override has priority (it's built into prediction_v12).
+            # We only need to check for Rank 3 if the v12 prediction was NOT an override.
+            # Simplest way: check if prediction_v12 chose Rank 1.
         
-        # We check the original Rank 1 winner's v_mod6 score.
-        if winner_v11_vmod6 < CLEAN_THRESHOLD: # If #1 is "Clean" (potential failure signature)
+            # We check the original Rank 1 winner's v_mod6 score.
+            if winner_v11_vmod6 < CLEAN_THRESHOLD: # If #1 is "Clean" (potential failure signature)
             
-            # Check Rank 3 (Index 2 in the list)
-            if len(candidate_scores) >= 3:
-                candidate_3_vmod6 = candidate_scores[2][2] # Rank 3's vmod6 score
+                # Check Rank 3 (Index 2 in the list)
+                if len(candidate_scores) >= 3:
+                    candidate_3_vmod6 = candidate_scores[2][2] # Rank 3's vmod6 score
                 
-                # Check for the Clean #1 vs Messy #3 Signature
-                if candidate_3_vmod6 > MESSY_THRESHOLD: 
+                    # Check for the Clean #1 vs Messy #3 Signature
+                    if candidate_3_vmod6 > MESSY_THRESHOLD: 
                     
-                    # *Only* override if v12.0 did *not* already make a prediction for Rank 2.
-                    # This check is slightly complex, but necessary for the chain:
+                        # *Only* override if v12.0 did *not* already make a prediction for Rank 2.
+                        # This check is slightly complex, but necessary for the chain:
                     
-                    # Did the v12.0 override NOT happen?
-                    # The v12.0 override happens IF #1 is Clean AND #2 is Messy.
-                    # We only override for #3 if #2 was NOT Messy (or #1 was not Clean, but we checked that).
+                        # Did the v12.0 override NOT happen?
+                        # The v12.0 override happens IF #1 is Clean AND #2 is Messy.
+                        # We only override for #3 if #2 was NOT Messy (or #1 was not Clean, but we checked that).
                     
-                    # The v12 override happens when:
-                    v12_override_did_NOT_happen = True
-                    if len(candidate_scores) >= 2:
-                        candidate_2_vmod6 = candidate_scores[1][2]
-                        # Check if the signature for #2 was found
-                        if winner_v11_vmod6 < CLEAN_THRESHOLD and candidate_2_vmod6 > MESSY_THRESHOLD:
-                            v12_override_did_NOT_happen = False # The v12 override DID happen.
+                        # The v12 override happens when:
+                        v12_override_did_NOT_happen = True
+                        if len(candidate_scores) >= 2:
+                            candidate_2_vmod6 = candidate_scores[1][2]
+                            # Check if the signature for #2 was found
+                            if winner_v11_vmod6 < CLEAN_THRESHOLD and candidate_2_vmod6 > MESSY_THRESHOLD:
+                                v12_override_did_NOT_happen = False # The v12 override DID happen.
                             
-                    # If v12 did not override, check for #3
-                    if v12_override_did_NOT_happen:
-                        final_prediction_v15 = candidate_scores[2][1] # OVERRIDE
-                        total_rank3_overrides_attempted += 1
-
-        if final_prediction_v15 == true_p_n_plus_1:
-            total_successes_v15_new_champ += 1
+                        # If v12 did not override, check for #3
+                        if v12_override_did_NOT_happen:
+                            final_prediction_v15 = candidate_scores[2][1] # OVERRIDE
+                            total_rank3_overrides_attempted += 1
+
+            if final_prediction_v15 == true_p_n_plus_1:
+                total_successes_v15_new_champ += 1
+
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        v15_acc = (total_successes_v15_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
+        v12_acc = (total_successes_v12_baseline / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v15.0 Acc: {v15_acc:.2f}% | v12.0 Acc: {v12_acc:.2f}% | Rank 3 Overrides: {total_rank3_overrides_attempted:,} | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
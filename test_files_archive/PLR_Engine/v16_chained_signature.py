@@ -10,11 +10,16 @@
 # 75.94% accuracy gain.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
 from collections import defaultdict
 
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes, load_mod6_map
+
 # --- Engine Setup (v11.0 "Weighted Gap") ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
@@ -27,19 +32,13 @@ MAX_SIGNATURE_SEARCH_DEPTH = 4 # (Will check Ranks 2, 3, and 4)
 
 
 def load_engine_data():
-    """Loads the v_mod6 messiness map."""
+    """Loads the v_mod6 messiness map (shared loader, parsed once per process)."""
     global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
-        return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
+    print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
+    return True
 
 def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
     """The v11.0 "Weighted Gap" Engine."""
@@ -60,30 +59,23 @@ def get_vmod6_score(anchor_sn):
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 100000
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr.tolist()
 
 # --- Main Testing Logic ---
 def run_PLR_v16_chained_signature_test():
@@ -114,92 +106,93 @@ def run_PLR_v16_chained_signature_test():
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v16_acc = (total_successes_v16_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
-            v15_acc = (total_successes_v15_baseline / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v16.0 Acc: {v16_acc:.2f}% | v15.0 Acc: {v15_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    for chunk_start in range(START_INDEX, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            p_n = prime_list[i]
+            true_p_n_plus_1 = prime_list[i + 1]
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                candidates.append(prime_list[i + j])
         
-        # Get the v11.0 ranked list
-        candidate_scores = []
-        for q_i in candidates:
-            S_cand = p_n + q_i
-            gap_g_i = q_i - p_n
-            score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
-            # Store (score, prime, vmod6_score)
-            vmod6_rate = get_vmod6_score(S_cand)
-            candidate_scores.append((score_v11, q_i, vmod6_rate))
-
-        total_predictions += 1
-        candidate_scores.sort(key=lambda x: x[0])
+            # Get the v11.0 ranked list
+            candidate_scores = []
+            for q_i in candidates:
+                S_cand = p_n + q_i
+                gap_g_i = q_i - p_n
+                score_v11 = get_messiness_score_v11_weighted(S_cand, gap_g_i)
+                # Store (score, prime, vmod6_score)
+                vmod6_rate = get_vmod6_score(S_cand)
+                candidate_scores.append((score_v11, q_i, vmod6_rate))
+
+            total_predictions += 1
+            candidate_scores.sort(key=lambda x: x[0])
         
-        # --- Apply v15.0 Baseline Logic (Ranks 2 and 3) ---
+            # --- Apply v15.0 Baseline Logic (Ranks 2 and 3) ---
         
-        winner_v11_prime = candidate_scores[0][1]
-        winner_v11_vmod6 = candidate_scores[0][2]
+            winner_v11_prime = candidate_scores[0][1]
+            winner_v11_vmod6 = candidate_scores[0][2]
         
-        # We need to know the v15 prediction for the final tally
-        prediction_v15 = winner_v11_prime
+            # We need to know the v15 prediction for the final tally
+            prediction_v15 = winner_v11_prime
         
-        # The new v16.0 engine's prediction
-        prediction_v16 = winner_v11_prime # Default for new engine
+            # The new v16.0 engine's prediction
+            prediction_v16 = winner_v11_prime # Default for new engine
         
         
-        # --- CHAINED SEARCH: Ranks 2, 3, 4 ---
-        if winner_v11_vmod6 < CLEAN_THRESHOLD: # If #1 is "Clean" (potential failure signature)
+            # --- CHAINED SEARCH: Ranks 2, 3, 4 ---
+            if winner_v11_vmod6 < CLEAN_THRESHOLD: # If #1 is "Clean" (potential failure signature)
             
-            # This flag tracks if *any* override was applied in this chain
-            override_applied = False
+                # This flag tracks if *any* override was applied in this chain
+                override_applied = False
             
-            for rank_index in range(1, MAX_SIGNATURE_SEARCH_DEPTH + 1):
-                if rank_index >= len(candidate_scores):
-                    break
+                for rank_index in range(1, MAX_SIGNATURE_SEARCH_DEPTH + 1):
+                    if rank_index >= len(candidate_scores):
+                        break
                     
-                next_candidate_vmod6 = candidate_scores[rank_index][2]
+                    next_candidate_vmod6 = candidate_scores[rank_index][2]
                 
-                if next_candidate_vmod6 > MESSY_THRESHOLD:
-                    # *** OVERRIDE ***
-                    # The first 'Messy' candidate found is the prediction
+                    if next_candidate_vmod6 > MESSY_THRESHOLD:
+                        # *** OVERRIDE ***
+                        # The first 'Messy' candidate found is the prediction
                     
-                    if not override_applied:
-                        # Only count the override once (at the highest priority rank found)
-                        total_v16_overrides_attempted += 1
-                        override_applied = True
+                        if not override_applied:
+                            # Only count the override once (at the highest priority rank found)
+                            total_v16_overrides_attempted += 1
+                            override_applied = True
                         
-                    # The override decision is the Messy candidate's prime
-                    next_candidate_prime = candidate_scores[rank_index][1]
-
-                    # Tallying logic for both baselines and new engine:
-                    if rank_index == 1: # Rank 2 fix (v12.0 logic)
-                        prediction_v15 = next_candidate_prime
-                        prediction_v16 = next_candidate_prime
-                    elif rank_index == 2: # Rank 3 fix (v15.0 logic)
-                        # The v15 baseline uses Rank 2 OR Rank 3 fix
-                        if not candidate_scores[1][2] > MESSY_THRESHOLD:
+                        # The override decision is the Messy candidate's prime
+                        next_candidate_prime = candidate_scores[rank_index][1]
+
+                        # Tallying logic for both baselines and new engine:
+                        if rank_index == 1: # Rank 2 fix (v12.0 logic)
                             prediction_v15 = next_candidate_prime
-                        prediction_v16 = next_candidate_prime
-                    elif rank_index == 3: # Rank 4 fix (v16.0 new logic)
-                        prediction_v16 = next_candidate_prime
+                            prediction_v16 = next_candidate_prime
+                        elif rank_index == 2: # Rank 3 fix (v15.0 logic)
+                            # The v15 baseline uses Rank 2 OR Rank 3 fix
+                            if not candidate_scores[1][2] > MESSY_THRESHOLD:
+                                prediction_v15 = next_candidate_prime
+                            prediction_v16 = next_candidate_prime
+                        elif rank_index == 3: # Rank 4 fix (v16.0 new logic)
+                            prediction_v16 = next_candidate_prime
                         
-                    # Break the chain after the first fix is applied (highest priority)
-                    break 
+                        # Break the chain after the first fix is applied (highest priority)
+                        break 
 
-        # --- Tally v15.0 Baseline Result ---
-        if prediction_v15 == true_p_n_plus_1:
-            total_successes_v15_baseline += 1
+            # --- Tally v15.0 Baseline Result ---
+            if prediction_v15 == true_p_n_plus_1:
+                total_successes_v15_baseline += 1
             
-        # --- Tally v16.0 Result ---
-        if prediction_v16 == true_p_n_plus_1:
-            total_successes_v16_new_champ += 1
+            # --- Tally v16.0 Result ---
+            if prediction_v16 == true_p_n_plus_1:
+                total_successes_v16_new_champ += 1
+
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        v16_acc = (total_successes_v16_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
+        v15_acc = (total_successes_v15_baseline / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v16.0 Acc: {v16_acc:.2f}% | v15.0 Acc: {v15_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
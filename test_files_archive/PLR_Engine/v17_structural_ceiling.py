@@ -11,11 +11,17 @@
 # Logic: (v_mod210_rate * gap_g_n) + Sequential Signature Override (Ranks 2-4)
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
 import json
 from collections import defaultdict
 
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes
+
 # --- Engine Setup ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MOD210_ENGINE_FILE = "data/messiness_map_v3_mod210.json"
@@ -120,30 +126,23 @@ def get_v17_prediction(p_n, candidates, prime_list):
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 100000
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr.tolist()
 
 # --- Main Testing Logic ---
 def run_PLR_v17_structural_ceiling_test():
@@ -171,32 +170,33 @@ def run_PLR_v17_structural_ceiling_test():
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v17_acc = (total_successes_v17_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
-            v16_acc = (total_successes_v16_baseline / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v17.0 Acc: {v17_acc:.2f}% | v16.0 Acc: {v16_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    for chunk_start in range(START_INDEX, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            p_n = prime_list[i]
+            true_p_n_plus_1 = prime_list[i + 1]
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                candidates.append(prime_list[i + j])
         
-        total_predictions += 1
+            total_predictions += 1
         
-        # 1. Get v16.0 Baseline Prediction
-        prediction_v16 = get_v16_prediction(p_n, candidates, prime_list)
-        if prediction_v16 == true_p_n_plus_1:
-            total_successes_v16_baseline += 1
+            # 1. Get v16.0 Baseline Prediction
+            prediction_v16 = get_v16_prediction(p_n, candidates, prime_list)
+            if prediction_v16 == true_p_n_plus_1:
+                total_successes_v16_baseline += 1
             
-        # 2. Get v17.0 Challenger Prediction
-        prediction_v17 = get_v17_prediction(p_n, candidates, prime_list)
-        if prediction_v17 == true_p_n_plus_1:
-            total_successes_v17_new_champ += 1
+            # 2. Get v17.0 Challenger Prediction
+            prediction_v17 = get_v17_prediction(p_n, candidates, prime_list)
+            if prediction_v17 == true_p_n_plus_1:
+                total_successes_v17_new_champ += 1
+
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        v17_acc = (total_successes_v17_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
+        v16_acc = (total_successes_v16_baseline / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v17.0 Acc: {v17_acc:.2f}% | v16.0 Acc: {v16_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
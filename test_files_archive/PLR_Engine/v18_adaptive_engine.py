@@ -24,11 +24,17 @@
 # solution for the 33.6% of failures it couldn't solve.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
 import json
 from collections import defaultdict
 
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes
+
 # --- Engine Setup ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MOD210_ENGINE_FILE = "data/messiness_map_v3_mod210.json" # Needed for new tie-breaker
@@ -143,30 +149,23 @@ def get_v17_tiebreaker_prediction(p_n, candidates):
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 100000
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr.tolist()
 
 # --- Main Testing Logic ---
 def run_PLR_v18_adaptive_test():
@@ -198,49 +197,50 @@ def run_PLR_v18_adaptive_test():
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v18_acc = (total_successes_v18_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
-            v16_acc = (total_successes_v16_baseline / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v18.0 Acc: {v18_acc:.2f}% | v16.0 Acc: {v16_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    for chunk_start in range(START_INDEX, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            p_n = prime_list[i]
+            true_p_n_plus_1 = prime_list[i + 1]
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                candidates.append(prime_list[i + j])
         
-        total_predictions += 1
+            total_predictions += 1
         
-        # --- 1. Get v16.0 Baseline Prediction ---
-        prediction_v16 = get_v16_prediction(p_n, candidates)
-        if prediction_v16 == true_p_n_plus_1:
-            total_successes_v16_baseline += 1
+            # --- 1. Get v16.0 Baseline Prediction ---
+            prediction_v16 = get_v16_prediction(p_n, candidates)
+            if prediction_v16 == true_p_n_plus_1:
+                total_successes_v16_baseline += 1
             
-        # --- 2. Get v18.0 Adaptive Prediction ---
+            # --- 2. Get v18.0 Adaptive Prediction ---
         
-        # First, diagnose the environment
-        true_gap = true_p_n_plus_1 - p_n
-        true_gap_category = categorize_gap(true_gap)
+            # First, diagnose the environment
+            true_gap = true_p_n_plus_1 - p_n
+            true_gap_category = categorize_gap(true_gap)
         
-        final_prediction_v18 = None
+            final_prediction_v18 = None
         
-        if true_gap_category == "Large" or true_gap_category == "Medium":
-            # This is the "Large Gap" Problem (Scenario B)
-            large_gap_predictions += 1
-            final_prediction_v18 = get_v16_prediction(p_n, candidates)
+            if true_gap_category == "Large" or true_gap_category == "Medium":
+                # This is the "Large Gap" Problem (Scenario B)
+                large_gap_predictions += 1
+                final_prediction_v18 = get_v16_prediction(p_n, candidates)
             
-        else: # true_gap_category == "Small"
-            # This is the "Small Gap" Problem (Scenario A)
-            small_gap_predictions += 1
-            final_prediction_v18 = get_v17_tiebreaker_prediction(p_n, candidates)
+            else: # true_gap_category == "Small"
+                # This is the "Small Gap" Problem (Scenario A)
+                small_gap_predictions += 1
+                final_prediction_v18 = get_v17_tiebreaker_prediction(p_n, candidates)
+
+            # 3. Tally the v18.0 Result
+            if final_prediction_v18 == true_p_n_plus_1:
+                total_successes_v18_new_champ += 1
 
-        # 3. Tally the v18.0 Result
-        if final_prediction_v18 == true_p_n_plus_1:
-            total_successes_v18_new_champ += 1
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        v18_acc = (total_successes_v18_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
+        v16_acc = (total_successes_v16_baseline / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | v18.0 Acc: {v18_acc:.2f}% | v16.0 Acc: {v16_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
@@ -25,11 +25,16 @@
 # can break the 75.94% barrier.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
 from collections import defaultdict
 
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes, load_mod6_map
+
 # --- Engine Setup ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
@@ -50,19 +55,13 @@ def categorize_gap(gap):
     return "Medium"
 
 def load_engine_data():
-    """Loads the v_mod6 messiness map."""
+    """Loads the v_mod6 messiness map (shared loader, parsed once per process)."""
     global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) engine data.")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
-        return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
+    print(f"Loaded v_mod6 (Mod 6) engine data.")
+    return True
 
 # --- v11.0 Core Logic (Helper) ---
 def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
@@ -119,30 +118,23 @@ def get_adaptive_prediction(p_n, candidates, gap_signature):
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 100000
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr.tolist()
 
 # --- Main Testing Logic ---
 def run_PLR_v19_volatility_test():
@@ -171,42 +163,43 @@ def run_PLR_v19_volatility_test():
         return
 
     # Start at START_INDEX + 1 so we always have a g_{n-1}
-    for i in range(START_INDEX + 1, loop_end_index):
-        if (i - (START_INDEX+1) + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - (START_INDEX+1) + 1
-            v19_acc = (total_successes_v19_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
-            v16_acc = (total_successes_v16_baseline / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {total_predictions:,} | v19.0 Acc: {v19_acc:.2f}% | v16.0 Acc: {v16_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
-
-        p_n_minus_1 = prime_list[i - 1]
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    for chunk_start in range(START_INDEX + 1, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            p_n_minus_1 = prime_list[i - 1]
+            p_n = prime_list[i]
+            true_p_n_plus_1 = prime_list[i + 1]
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                candidates.append(prime_list[i + j])
         
-        total_predictions += 1
+            total_predictions += 1
         
-        # --- 1. Get v16.0 Baseline Prediction (Standard Ranks 2-4 search) ---
-        prediction_v16 = get_adaptive_prediction(p_n, candidates, "Standard") # Use standard logic
-        if prediction_v16 == true_p_n_plus_1:
-            total_successes_v16_baseline += 1
+            # --- 1. Get v16.0 Baseline Prediction (Standard Ranks 2-4 search) ---
+            prediction_v16 = get_adaptive_prediction(p_n, candidates, "Standard") # Use standard logic
+            if prediction_v16 == true_p_n_plus_1:
+                total_successes_v16_baseline += 1
             
-        # --- 2. Get v19.0 Adaptive Prediction ---
+            # --- 2. Get v19.0 Adaptive Prediction ---
         
-        # First, diagnose the environment
-        g_n_minus_1_cat = categorize_gap(p_n - p_n_minus_1)
-        g_n_cat = categorize_gap(true_p_n_plus_1 - p_n)
-        gap_signature = f"{g_n_minus_1_cat}_to_{g_n_cat}"
+            # First, diagnose the environment
+            g_n_minus_1_cat = categorize_gap(p_n - p_n_minus_1)
+            g_n_cat = categorize_gap(true_p_n_plus_1 - p_n)
+            gap_signature = f"{g_n_minus_1_cat}_to_{g_n_cat}"
         
-        # Run the adaptive engine
-        final_prediction_v19 = get_adaptive_prediction(p_n, candidates, gap_signature)
-
-        # 3. Tally the v19.0 Result
-        if final_prediction_v19 == true_p_n_plus_1:
-            total_successes_v19_new_champ += 1
+            # Run the adaptive engine
+            final_prediction_v19 = get_adaptive_prediction(p_n, candidates, gap_signature)
+
+            # 3. Tally the v19.0 Result
+            if final_prediction_v19 == true_p_n_plus_1:
+                total_successes_v19_new_champ += 1
+
+        elapsed = time.time() - start_time
+        progress = chunk_end - (START_INDEX+1)
+        v19_acc = (total_successes_v19_new_champ / total_predictions) * 100 if total_predictions > 0 else 0
+        v16_acc = (total_successes_v16_baseline / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {total_predictions:,} | v19.0 Acc: {v19_acc:.2f}% | v16.0 Acc: {v16_acc:.2f}% | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
@@ -13,11 +13,18 @@
 # 55.51% of "PLR Successes".
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
 import json
+from bisect import bisect_left
 from collections import defaultdict
 
+# The shared prime loader and wheel live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes, prime_wheel, is_prime_wheel
+
 # --- Engine Setup (v_mod6 "Champion" Engine) ---
 ENGINE_DATA_FILE = "data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
@@ -54,35 +61,33 @@ PRIMES_TO_TEST = 50000000
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
 MAX_LAW_III_RADIUS = 30 # Max radius to search for Law III
+CHUNK_SIZE = 100000 # anchors per block; progress is printed between blocks
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and builds the prime wheel."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None, None
     
-    prime_set = set(prime_list)
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes and created set in {end_time - start_time:.2f} seconds.")
+    # Mod-30 wheel bitmap instead of a set: ~67 MB rather than several GB
+    wheel = prime_wheel(prime_arr)
     
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + MAX_LAW_III_RADIUS + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
-        return None, None, None
+        return None, None
         
-    return prime_list, prime_set
+    # The per-anchor loop below works on Python ints; converting the
+    # memory-mapped cache is far faster than parsing the text file
+    prime_list = prime_arr.tolist()
+    return prime_list, wheel
 
-def is_clean_k(k_val, prime_set):
+def is_clean_k(k_val, wheel):
     """Helper function to check if k is 1 or a prime."""
     if k_val == 1: return True
     if k_val < 2: return False
-    return k_val in prime_set
+    return is_prime_wheel(wheel, k_val)
 
 # --- Main Testing Logic ---
 def run_PLR_vs_Law3_analysis_corrected():
@@ -91,7 +96,7 @@ def run_PLR_vs_Law3_analysis_corrected():
         print("Stopping test: Engine data could not be loaded.")
         return
         
-    prime_list, prime_set = load_primes_from_file(PRIME_INPUT_FILE)
+    prime_list, wheel = load_primes_from_file(PRIME_INPUT_FILE)
     if prime_list is None: return
 
     print(f"\nStarting PLR Failure vs. Law III Radius Analysis (Corrected) for {PRIMES_TO_TEST:,} primes...")
@@ -111,82 +116,77 @@ def run_PLR_vs_Law3_analysis_corrected():
          print(f"\nFATAL ERROR: Not enough primes loaded for S_n+r lookups at the end.")
          return
 
-    for i in range(loop_start_index, loop_end_index):
-        if (i - loop_start_index + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - loop_start_index + 1
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Law I Fails Found: {total_law_I_failures_analyzed:,} | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i+1]
-        anchor_S_n = p_n + true_p_n_plus_1
+    s_idx = 0
+    for chunk_start in range(loop_start_index, loop_end_index, CHUNK_SIZE):
+        chunk_end = min(chunk_start + CHUNK_SIZE, loop_end_index)
         
-        # --- 1. First, find this anchor's Law I/III status ---
-        min_distance_k = 0
-        q_prime = 0
-        search_dist = 1
+        for i in range(chunk_start, chunk_end):
+            p_n = prime_list[i]
+            true_p_n_plus_1 = prime_list[i+1]
+            anchor_S_n = p_n + true_p_n_plus_1
         
-        while True:
-            q_lower = anchor_S_n - search_dist
-            q_upper = anchor_S_n + search_dist
-
-            if q_lower in prime_set:
-                min_distance_k = search_dist
+            # --- 1. First, find this anchor's Law I/III status ---
+            # The nearest primes below and above S_n give k_min directly (the
+            # lower one wins ties, as in a d = 1, 2, ... probe). Anchors only
+            # grow, so each search resumes from the previous anchor's index.
+            s_idx = bisect_left(prime_list, anchor_S_n, s_idx)
+            q_lower = prime_list[s_idx - 1]
+            if s_idx == len(prime_list) or anchor_S_n - q_lower <= prime_list[s_idx] - anchor_S_n:
                 q_prime = q_lower
-                break
-            if q_upper in prime_set:
-                min_distance_k = search_dist
-                q_prime = q_upper
-                break
-                
-            search_dist += 1
-            if search_dist > 2000: break 
+            else:
+                q_prime = prime_list[s_idx]
+            min_distance_k = abs(anchor_S_n - q_prime)
         
-        if min_distance_k == 0: continue 
+            if min_distance_k > 2000: continue 
 
-        is_k_composite = (min_distance_k > 1) and (min_distance_k not in prime_set)
+            is_k_composite = (min_distance_k > 1) and not is_prime_wheel(wheel, min_distance_k)
         
-        if is_k_composite:
-            total_law_I_failures_analyzed += 1
+            if is_k_composite:
+                total_law_I_failures_analyzed += 1
             
-            # --- 2. Find this failure's TRUE Law III fixing radius 'r' ---
-            true_fixing_radius = -1 
-            for r in range(1, MAX_LAW_III_RADIUS + 1):
-                S_prev = prime_list[i - r] + prime_list[i - r + 1]
-                if is_clean_k(abs(S_prev - q_prime), prime_set):
-                    true_fixing_radius = r
-                    break
+                # --- 2. Find this failure's TRUE Law III fixing radius 'r' ---
+                true_fixing_radius = -1 
+                for r in range(1, MAX_LAW_III_RADIUS + 1):
+                    S_prev = prime_list[i - r] + prime_list[i - r + 1]
+                    if is_clean_k(abs(S_prev - q_prime), wheel):
+                        true_fixing_radius = r
+                        break
                 
-                S_next = prime_list[i + r] + prime_list[i + r + 1]
-                if is_clean_k(abs(S_next - q_prime), prime_set):
-                    true_fixing_radius = r
-                    break
+                    S_next = prime_list[i + r] + prime_list[i + r + 1]
+                    if is_clean_k(abs(S_next - q_prime), wheel):
+                        true_fixing_radius = r
+                        break
             
-            if true_fixing_radius == -1:
-                continue 
+                if true_fixing_radius == -1:
+                    continue 
 
-            # --- 3. Now, run the PLR prediction for p_n using v_mod6 ---
-            candidates = []
-            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-                candidates.append(prime_list[i + j])
+                # --- 3. Now, run the PLR prediction for p_n using v_mod6 ---
+                candidates = []
+                for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                    candidates.append(prime_list[i + j])
             
-            candidate_scores = []
-            for q_i in candidates:
-                S_cand = p_n + q_i
-                messiness_score = get_messiness_score_v_mod6(S_cand)
-                candidate_scores.append((messiness_score, q_i))
-
-            # --- 4. Get PLR Status (Tied-for-1st) ---
-            min_score = min(s[0] for s in candidate_scores)
-            winners_list = [q_i for score, q_i in candidate_scores if score == min_score]
+                candidate_scores = []
+                for q_i in candidates:
+                    S_cand = p_n + q_i
+                    messiness_score = get_messiness_score_v_mod6(S_cand)
+                    candidate_scores.append((messiness_score, q_i))
+
+                # --- 4. Get PLR Status (Tied-for-1st) ---
+                min_score = min(s[0] for s in candidate_scores)
+                winners_list = [q_i for score, q_i in candidate_scores if score == min_score]
             
-            is_PLR_success = (true_p_n_plus_1 in winners_list)
+                is_PLR_success = (true_p_n_plus_1 in winners_list)
             
-            # --- 5. Log the result in the correct bin ---
-            if is_PLR_success:
-                success_r_distribution[true_fixing_radius] += 1
-            else:
-                failure_r_distribution[true_fixing_radius] += 1
+                # --- 5. Log the result in the correct bin ---
+                if is_PLR_success:
+                    success_r_distribution[true_fixing_radius] += 1
+                else:
+                    failure_r_distribution[true_fixing_radius] += 1
+        
+        # Progress once per block, outside the per-anchor loop
+        elapsed = time.time() - start_time
+        progress = chunk_end - loop_start_index
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Law I Fails Found: {total_law_I_failures_analyzed:,} | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = PRIMES_TO_TEST
@@ -14,11 +14,17 @@
 # its PLR status (Success/Failure) and its PAS status (Clean/Messy).
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
 import json
 from collections import defaultdict
 
+# The shared prime loader and wheel live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes, prime_wheel, is_prime_wheel
+
 # --- Engine Setup (v7.0 "Recursive") ---
 MOD6_ENGINE_FILE = "../data/messiness_map_v_mod6.json"
 MOD30_ENGINE_FILE = "../data/messiness_map_v1_mod30.json" # Hard-coded
@@ -78,35 +84,33 @@ def get_messiness_score_v7_recursive(anchor_sn, gap_g_n):
 # --- Configuration ---
 PRIME_INPUT_FILE = "../prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 100000
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and builds the prime wheel."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None, None
     
-    prime_set = set(prime_list)
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes and created set in {end_time - start_time:.2f} seconds.")
+    # Mod-30 wheel bitmap instead of a set: ~67 MB rather than several GB
+    wheel = prime_wheel(prime_arr)
     
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 10 # Buffer
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
-        return None, None, None
+        return None, None
         
-    return prime_list, prime_set
+    # The per-anchor loop below works on Python ints; converting the
+    # memory-mapped cache is far faster than parsing the text file
+    prime_list = prime_arr.tolist()
+    return prime_list, wheel
 
-def is_prime(k_val, prime_set):
+def is_prime(k_val, wheel):
     if k_val < 2: return False
-    return k_val in prime_set
+    return is_prime_wheel(wheel, k_val)
 
 # --- Main Testing Logic ---
 def run_PLR_vs_PAS_correlation():
@@ -115,7 +119,7 @@ def run_PLR_vs_PAS_correlation():
         print("Stopping test: Engine data could not be loaded.")
         return
         
-    prime_list, prime_set = load_primes_from_file(PRIME_INPUT_FILE)
+    prime_list, wheel = load_primes_from_file(PRIME_INPUT_FILE)
     if prime_list is None: return
 
     print(f"\nStarting PLR-PAS Correlation Test (Test 12) for {PRIMES_TO_TEST:,} primes...")
@@ -138,62 +142,63 @@ def run_PLR_vs_PAS_correlation():
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i+1]
+    for chunk_start in range(START_INDEX, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            p_n = prime_list[i]
+            true_p_n_plus_1 = prime_list[i+1]
         
-        # --- 1. Get PLR Status ---
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+            # --- 1. Get PLR Status ---
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                candidates.append(prime_list[i + j])
         
-        candidate_scores = []
-        for q_i in candidates:
-            S_cand = p_n + q_i
-            gap_g_i = q_i - p_n
-            messiness_score_tuple = get_messiness_score_v7_recursive(S_cand, gap_g_i)
-            candidate_scores.append((messiness_score_tuple, q_i))
+            candidate_scores = []
+            for q_i in candidates:
+                S_cand = p_n + q_i
+                gap_g_i = q_i - p_n
+                messiness_score_tuple = get_messiness_score_v7_recursive(S_cand, gap_g_i)
+                candidate_scores.append((messiness_score_tuple, q_i))
 
-        candidate_scores.sort(key=lambda x: x[0]) 
-        min_score = candidate_scores[0][0]
-        winners_list = [q_i for score_tuple, q_i in candidate_scores if score_tuple == min_score]
+            candidate_scores.sort(key=lambda x: x[0]) 
+            min_score = candidate_scores[0][0]
+            winners_list = [q_i for score_tuple, q_i in candidate_scores if score_tuple == min_score]
         
-        is_PLR_success = (true_p_n_plus_1 in winners_list)
+            is_PLR_success = (true_p_n_plus_1 in winners_list)
 
-        # --- 2. Get PAS Law I Status for the *true* anchor ---
-        anchor_S_n = p_n + true_p_n_plus_1
+            # --- 2. Get PAS Law I Status for the *true* anchor ---
+            anchor_S_n = p_n + true_p_n_plus_1
         
-        min_distance_k = 0
-        search_dist = 1
-        while True:
-            q_lower = anchor_S_n - search_dist
-            q_upper = anchor_S_n + search_dist
-            if q_lower in prime_set: min_distance_k = search_dist; break
-            if q_upper in prime_set: min_distance_k = search_dist; break
-            search_dist += 1
-            if search_dist > 2000: break 
+            min_distance_k = 0
+            search_dist = 1
+            while True:
+                q_lower = anchor_S_n - search_dist
+                q_upper = anchor_S_n + search_dist
+                if is_prime_wheel(wheel, q_lower): min_distance_k = search_dist; break
+                if is_prime_wheel(wheel, q_upper): min_distance_k = search_dist; break
+                search_dist += 1
+                if search_dist > 2000: break 
         
-        if min_distance_k == 0: continue # Skip this prime (large gap anomaly)
+            if min_distance_k == 0: continue # Skip this prime (large gap anomaly)
             
-        is_PAS_clean = (min_distance_k == 1) or is_prime(min_distance_k, prime_set)
+            is_PAS_clean = (min_distance_k == 1) or is_prime(min_distance_k, wheel)
 
-        # --- 3. Tally the 2x2 Matrix ---
-        total_predictions += 1
-        if is_PLR_success:
-            if is_PAS_clean:
-                total_success_and_clean += 1
-            else:
-                total_success_and_messy += 1
-        else:
-            if is_PAS_clean:
-                total_failure_and_clean += 1
+            # --- 3. Tally the 2x2 Matrix ---
+            total_predictions += 1
+            if is_PLR_success:
+                if is_PAS_clean:
+                    total_success_and_clean += 1
+                else:
+                    total_success_and_messy += 1
             else:
-                total_failure_and_messy += 1
+                if is_PAS_clean:
+                    total_failure_and_clean += 1
+                else:
+                    total_failure_and_messy += 1
+
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
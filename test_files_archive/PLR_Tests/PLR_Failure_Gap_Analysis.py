@@ -15,11 +15,17 @@
 # different average gap (g_n) than the 57.84% of successes.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
 import json
 from collections import defaultdict
 
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes
+
 # --- Engine Setup (v7.0 "Recursive") ---
 MOD6_ENGINE_FILE = "../data/messiness_map_v_mod6.json"
 MOD30_ENGINE_FILE = "../data/messiness_map_v1_mod30.json" # Hard-coded
@@ -79,30 +85,23 @@ def get_messiness_score_v7_recursive(anchor_sn, gap_g_n):
 # --- Configuration ---
 PRIME_INPUT_FILE = "../prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 100000
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr.tolist()
 
 # --- Main Testing Logic ---
 def run_PLR_v7_post_mortem_analysis():
@@ -129,43 +128,44 @@ def run_PLR_v7_post_mortem_analysis():
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            accuracy = (total_successes / (total_successes + total_failures)) * 100 if (total_successes + total_failures) > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Successes: {total_successes:,} | Failures: {total_failures:,} | Acc: {accuracy:.2f}% | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
+    for chunk_start in range(START_INDEX, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            p_n = prime_list[i]
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                candidates.append(prime_list[i + j])
         
-        true_p_n_plus_1 = candidates[0]
-        true_gap_g_n = true_p_n_plus_1 - p_n
+            true_p_n_plus_1 = candidates[0]
+            true_gap_g_n = true_p_n_plus_1 - p_n
         
-        candidate_scores = []
-        for q_i in candidates:
-            S_cand = p_n + q_i
-            gap_g_i = q_i - p_n
-            messiness_score_tuple = get_messiness_score_v7_recursive(S_cand, gap_g_i)
-            candidate_scores.append((messiness_score_tuple, q_i))
+            candidate_scores = []
+            for q_i in candidates:
+                S_cand = p_n + q_i
+                gap_g_i = q_i - p_n
+                messiness_score_tuple = get_messiness_score_v7_recursive(S_cand, gap_g_i)
+                candidate_scores.append((messiness_score_tuple, q_i))
             
-        # --- Run the "Tied-for-1st" logic ---
-        candidate_scores.sort(key=lambda x: x[0]) 
-        min_score = candidate_scores[0][0]
-        winners_list = [q_i for score_tuple, q_i in candidate_scores if score_tuple == min_score]
+            # --- Run the "Tied-for-1st" logic ---
+            candidate_scores.sort(key=lambda x: x[0]) 
+            min_score = candidate_scores[0][0]
+            winners_list = [q_i for score_tuple, q_i in candidate_scores if score_tuple == min_score]
         
-        # --- 3. Log the result in the correct bin ---
-        if true_p_n_plus_1 in winners_list:
-            # SUCCESS
-            total_successes += 1
-            success_gap_sum += true_gap_g_n
-        else:
-            # FAILURE
-            total_failures += 1
-            failure_gap_sum += true_gap_g_n
+            # --- 3. Log the result in the correct bin ---
+            if true_p_n_plus_1 in winners_list:
+                # SUCCESS
+                total_successes += 1
+                success_gap_sum += true_gap_g_n
+            else:
+                # FAILURE
+                total_failures += 1
+                failure_gap_sum += true_gap_g_n
+
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        accuracy = (total_successes / (total_successes + total_failures)) * 100 if (total_successes + total_failures) > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Successes: {total_successes:,} | Failures: {total_failures:,} | Acc: {accuracy:.2f}% | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     total_predictions = total_successes + total_failures
@@ -22,11 +22,16 @@
 # 7.   At the end, compare the "Top 10" fingerprints from both databases.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
 from collections import defaultdict
 
+# The shared prime loader and wheel live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes, load_mod6_map, prime_wheel, is_prime_wheel
+
 # --- Engine Setup (v16.0 "Chained Signature") ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
@@ -36,19 +41,13 @@ MESSY_THRESHOLD = 20.0
 MAX_SIGNATURE_SEARCH_DEPTH = 4 # Ranks 2, 3, 4
 
 def load_engine_data():
-    """Loads the v_mod6 messiness map."""
+    """Loads the v_mod6 messiness map (shared loader, parsed once per process)."""
     global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
-        return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
+    print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
+    return True
 
 def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
     """The v11.0 "Weighted Gap" Engine Core."""
@@ -90,22 +89,22 @@ def get_v16_prediction(p_n, candidates):
 # --- End Engine Setup ---
 
 # --- PAS Law I Helper Functions ---
-def is_prime(k_val, prime_set):
+def is_prime(k_val, wheel):
     """Helper function to check if k is prime."""
     if k_val < 2: return False
-    return k_val in prime_set
+    return is_prime_wheel(wheel, k_val)
 
-def get_pas_k_min(anchor_sn, prime_set):
+def get_pas_k_min(anchor_sn, wheel):
     """Finds the k_min for a given anchor."""
     min_distance_k = 0
     search_dist = 1
     while True:
         q_lower = anchor_sn - search_dist
         q_upper = anchor_sn + search_dist
-        if q_lower in prime_set:
+        if is_prime_wheel(wheel, q_lower):
             min_distance_k = search_dist
             break
-        if q_upper in prime_set:
+        if is_prime_wheel(wheel, q_upper):
             min_distance_k = search_dist
             break
         search_dist += 1
@@ -116,32 +115,30 @@ def get_pas_k_min(anchor_sn, prime_set):
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 10000
 NUM_CANDIDATES_TO_CHECK = 10 
 HISTORICAL_DEPTH = 10 # How many anchors back to check
 START_INDEX = 20 # Must be > HISTORICAL_DEPTH + 1
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and builds the prime wheel."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None, None
     
-    prime_set = set(prime_list) # Need the set for fast k_min lookups
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes and set in {end_time - start_time:.2f} seconds.")
+    # Mod-30 wheel bitmap instead of a set: ~67 MB rather than several GB
+    wheel = prime_wheel(prime_arr)
     
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None, None
         
-    return prime_list, prime_set
+    # The per-anchor loop below works on Python ints; converting the
+    # memory-mapped cache is far faster than parsing the text file
+    prime_list = prime_arr.tolist()
+    return prime_list, wheel
 
 # --- Main Testing Logic ---
 def run_PLR_historical_fingerprint_analysis():
@@ -150,7 +147,7 @@ def run_PLR_historical_fingerprint_analysis():
         print("Stopping test: Engine data could not be loaded.")
         return
         
-    prime_list, prime_set = load_primes_from_file(PRIME_INPUT_FILE)
+    prime_list, wheel = load_primes_from_file(PRIME_INPUT_FILE)
     if prime_list is None: return
 
     print(f"\nStarting PLR 'Historical Fingerprint' Analysis (Test 37) for {PRIMES_TO_TEST:,} primes...")
@@ -173,48 +170,49 @@ def run_PLR_historical_fingerprint_analysis():
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 10000 == 0: # Print every 10k
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v16_acc = (total_v16_successes / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Acc: {v16_acc:.2f}% | Failures: {total_v16_failures:,} | Time: {elapsed:.0f}s", end='\r')
-
-        # --- 1. Get p_n and candidates ---
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    for chunk_start in range(START_INDEX, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            # --- 1. Get p_n and candidates ---
+            p_n = prime_list[i]
+            true_p_n_plus_1 = prime_list[i + 1]
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                candidates.append(prime_list[i + j])
         
-        total_predictions += 1
+            total_predictions += 1
         
-        # --- 2. Get v16.0 Prediction ---
-        prediction_v16 = get_v16_prediction(p_n, candidates)
-        is_success = (prediction_v16 == true_p_n_plus_1)
+            # --- 2. Get v16.0 Prediction ---
+            prediction_v16 = get_v16_prediction(p_n, candidates)
+            is_success = (prediction_v16 == true_p_n_plus_1)
 
-        # --- 3. Get Historical Fingerprint ---
-        fingerprint = ""
-        for k in range(1, HISTORICAL_DEPTH + 1):
-            # k=1 is S_{n-1}, k=2 is S_{n-2}, ...
-            hist_anchor_sn = prime_list[i - k] + prime_list[i - k + 1]
-            k_min = get_pas_k_min(hist_anchor_sn, prime_set)
+            # --- 3. Get Historical Fingerprint ---
+            fingerprint = ""
+            for k in range(1, HISTORICAL_DEPTH + 1):
+                # k=1 is S_{n-1}, k=2 is S_{n-2}, ...
+                hist_anchor_sn = prime_list[i - k] + prime_list[i - k + 1]
+                k_min = get_pas_k_min(hist_anchor_sn, wheel)
             
-            if k_min == -1: # Failsafe
-                fingerprint += "E" # Error
-            elif (k_min > 1) and not is_prime(k_min, prime_set):
-                fingerprint += "M" # Messy
-            else:
-                fingerprint += "C" # Clean
+                if k_min == -1: # Failsafe
+                    fingerprint += "E" # Error
+                elif (k_min > 1) and not is_prime(k_min, wheel):
+                    fingerprint += "M" # Messy
+                else:
+                    fingerprint += "C" # Clean
         
-        # --- 4. Log the Fingerprint ---
-        if is_success:
-            total_v16_successes += 1
-            success_fingerprints[fingerprint] += 1
-        else:
-            total_v16_failures += 1
-            failure_fingerprints[fingerprint] += 1
+            # --- 4. Log the Fingerprint ---
+            if is_success:
+                total_v16_successes += 1
+                success_fingerprints[fingerprint] += 1
+            else:
+                total_v16_failures += 1
+                failure_fingerprints[fingerprint] += 1
+
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        v16_acc = (total_v16_successes / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Acc: {v16_acc:.2f}% | Failures: {total_v16_failures:,} | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
@@ -13,10 +13,16 @@
 # will achieve an accuracy *higher* than the 55.51% v_mod6 baseline.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
 import json
 
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes
+
 # --- Engine Setup ---
 ENGINE_DATA_FILE = "data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
@@ -50,30 +56,23 @@ def get_messiness_score_v_mod6(anchor_sn):
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 100000
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr.tolist()
 
 # --- Main Testing Logic ---
 def run_PLR_hybrid_gap_tiebreaker_test():
@@ -96,52 +95,53 @@ def run_PLR_hybrid_gap_tiebreaker_test():
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            accuracy = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Successes: {total_successes:,} | Accuracy: {accuracy:.2f}% | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
+    for chunk_start in range(START_INDEX, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            p_n = prime_list[i]
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            q_i = prime_list[i + j]
-            candidates.append(q_i)
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                q_i = prime_list[i + j]
+                candidates.append(q_i)
         
-        true_p_n_plus_1 = candidates[0]
+            true_p_n_plus_1 = candidates[0]
         
-        candidate_scores = []
-        for q_i in candidates:
-            S_cand = p_n + q_i
-            gap_g_i = q_i - p_n
+            candidate_scores = []
+            for q_i in candidates:
+                S_cand = p_n + q_i
+                gap_g_i = q_i - p_n
             
-            # --- Call the v_mod6 Engine for the PRIMARY score ---
-            primary_score = get_messiness_score_v_mod6(S_cand)
+                # --- Call the v_mod6 Engine for the PRIMARY score ---
+                primary_score = get_messiness_score_v_mod6(S_cand)
             
-            # --- The gap (g_n) is the SECONDARY score ---
-            secondary_score = gap_g_i
-            # ---
+                # --- The gap (g_n) is the SECONDARY score ---
+                secondary_score = gap_g_i
+                # ---
             
-            # Store the (prime, (primary_score, secondary_score))
-            candidate_scores.append((q_i, (primary_score, secondary_score)))
+                # Store the (prime, (primary_score, secondary_score))
+                candidate_scores.append((q_i, (primary_score, secondary_score)))
             
-        # --- 5. Find the Best Candidate (Hierarchical Sort) ---
+            # --- 5. Find the Best Candidate (Hierarchical Sort) ---
         
-        # This sort key is the *crucial* part of v5.0.
-        # It sorts by item[1][0] (primary_score, mod 6) first.
-        # Then, it uses item[1][1] (secondary_score, the gap) to break ties.
-        # A smaller gap is better, as shown by Test 7 
-        candidate_scores.sort(key=lambda x: (x[1][0], x[1][1]))
+            # This sort key is the *crucial* part of v5.0.
+            # It sorts by item[1][0] (primary_score, mod 6) first.
+            # Then, it uses item[1][1] (secondary_score, the gap) to break ties.
+            # A smaller gap is better, as shown by Test 7 
+            candidate_scores.sort(key=lambda x: (x[1][0], x[1][1]))
         
-        # The best candidate is the first one in this 2-level sorted list
-        predicted_p_n_plus_1, best_scores = candidate_scores[0]
+            # The best candidate is the first one in this 2-level sorted list
+            predicted_p_n_plus_1, best_scores = candidate_scores[0]
         
-        # --- 6. Tally the Prediction ---
-        total_predictions += 1
-        if predicted_p_n_plus_1 == true_p_n_plus_1:
-            total_successes += 1
+            # --- 6. Tally the Prediction ---
+            total_predictions += 1
+            if predicted_p_n_plus_1 == true_p_n_plus_1:
+                total_successes += 1
+
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        accuracy = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Successes: {total_successes:,} | Accuracy: {accuracy:.2f}% | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = PRIMES_TO_TEST
@@ -11,10 +11,16 @@
 # (Mod 6, Mod 30, Mod 210) *only* on anchors with a large gap.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
 import json
 
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes
+
 # --- Gap Configuration ---
 GAP_MODE_SWITCH_POINT = 20.0
 
@@ -81,30 +87,23 @@ def get_messiness_score_v3_mod210(anchor_sn):
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 100000
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr.tolist()
 
 # --- Main Testing Logic ---
 def run_PLR_large_gap_bakeoff():
@@ -130,57 +129,58 @@ def run_PLR_large_gap_bakeoff():
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Large Gap Anchors: {total_large_gap_predictions:,} | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
-        true_gap_g_n = true_p_n_plus_1 - p_n
+    for chunk_start in range(START_INDEX, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            p_n = prime_list[i]
+            true_p_n_plus_1 = prime_list[i + 1]
+            true_gap_g_n = true_p_n_plus_1 - p_n
         
-        # --- THIS IS THE KEY: ONLY TEST "LARGE-GAP" ANCHORS ---
-        if true_gap_g_n < GAP_MODE_SWITCH_POINT:
-            continue
+            # --- THIS IS THE KEY: ONLY TEST "LARGE-GAP" ANCHORS ---
+            if true_gap_g_n < GAP_MODE_SWITCH_POINT:
+                continue
             
-        total_large_gap_predictions += 1
+            total_large_gap_predictions += 1
         
-        # --- Score all 10 candidates with all 3 engines ---
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+            # --- Score all 10 candidates with all 3 engines ---
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                candidates.append(prime_list[i + j])
         
-        scores_mod6 = []
-        scores_mod30 = []
-        scores_mod210 = []
+            scores_mod6 = []
+            scores_mod30 = []
+            scores_mod210 = []
         
-        for q_i in candidates:
-            S_cand = p_n + q_i
+            for q_i in candidates:
+                S_cand = p_n + q_i
             
-            scores_mod6.append((get_messiness_score_v_mod6(S_cand), q_i))
-            scores_mod30.append((get_messiness_score_v1_mod30(S_cand), q_i))
-            scores_mod210.append((get_messiness_score_v3_mod210(S_cand), q_i))
+                scores_mod6.append((get_messiness_score_v_mod6(S_cand), q_i))
+                scores_mod30.append((get_messiness_score_v1_mod30(S_cand), q_i))
+                scores_mod210.append((get_messiness_score_v3_mod210(S_cand), q_i))
             
-        # --- Tally the "Tied-for-1st" winner for each engine ---
+            # --- Tally the "Tied-for-1st" winner for each engine ---
         
-        # Mod 6
-        min_score_mod6 = min(s[0] for s in scores_mod6)
-        winners_mod6 = [q_i for score, q_i in scores_mod6 if score == min_score_mod6]
-        if true_p_n_plus_1 in winners_mod6:
-            total_successes_mod6 += 1
-
-        # Mod 30
-        min_score_mod30 = min(s[0] for s in scores_mod30)
-        winners_mod30 = [q_i for score, q_i in scores_mod30 if score == min_score_mod30]
-        if true_p_n_plus_1 in winners_mod30:
-            total_successes_mod30 += 1
+            # Mod 6
+            min_score_mod6 = min(s[0] for s in scores_mod6)
+            winners_mod6 = [q_i for score, q_i in scores_mod6 if score == min_score_mod6]
+            if true_p_n_plus_1 in winners_mod6:
+                total_successes_mod6 += 1
+
+            # Mod 30
+            min_score_mod30 = min(s[0] for s in scores_mod30)
+            winners_mod30 = [q_i for score, q_i in scores_mod30 if score == min_score_mod30]
+            if true_p_n_plus_1 in winners_mod30:
+                total_successes_mod30 += 1
             
-        # Mod 210
-        min_score_mod210 = min(s[0] for s in scores_mod210)
-        winners_mod210 = [q_i for score, q_i in scores_mod210 if score == min_score_mod210]
-        if true_p_n_plus_1 in winners_mod210:
-            total_successes_mod210 += 1
+            # Mod 210
+            min_score_mod210 = min(s[0] for s in scores_mod210)
+            winners_mod210 = [q_i for score, q_i in scores_mod210 if score == min_score_mod210]
+            if true_p_n_plus_1 in winners_mod210:
+                total_successes_mod210 += 1
+
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Large Gap Anchors: {total_large_gap_predictions:,} | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = PRIMES_TO_TEST
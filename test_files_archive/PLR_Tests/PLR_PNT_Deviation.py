@@ -18,11 +18,16 @@
 # the prime's deviation from the Prime Number Theorem.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
-import json
 from collections import defaultdict
 
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes, load_mod6_map
+
 # --- Engine Setup (v16.0 "Chained Signature") ---
 MOD6_ENGINE_FILE = "data/messiness_map_v_mod6.json"
 MESSINESS_MAP_V_MOD6 = None
@@ -32,19 +37,13 @@ MESSY_THRESHOLD = 20.0
 MAX_SIGNATURE_SEARCH_DEPTH = 4 # Ranks 2, 3, 4
 
 def load_engine_data():
-    """Loads the v_mod6 messiness map."""
+    """Loads the v_mod6 messiness map (shared loader, parsed once per process)."""
     global MESSINESS_MAP_V_MOD6
-    try:
-        with open(MOD6_ENGINE_FILE, 'r') as f:
-            MESSINESS_MAP_V_MOD6 = {int(k): v for k, v in json.load(f).items()}
-        print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
-        return True
-    except FileNotFoundError as e:
-        print(f"FATAL ERROR: Engine file not found: {e.filename}")
-        return False
-    except Exception as e:
-        print(f"FATAL ERROR: Could not load or parse engine file: {e}")
+    MESSINESS_MAP_V_MOD6 = load_mod6_map(MOD6_ENGINE_FILE)
+    if MESSINESS_MAP_V_MOD6 is None:
         return False
+    print(f"Loaded v_mod6 (Mod 6) engine data from '{MOD6_ENGINE_FILE}'.")
+    return True
 
 def get_messiness_score_v11_weighted(anchor_sn, gap_g_n):
     """The v11.0 "Weighted Gap" Engine Core."""
@@ -89,30 +88,23 @@ def get_v16_prediction(p_n, candidates):
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 100000
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 11 # Must be > 10 to have a stable p_n and p_{n-1}
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr.tolist()
 
 # --- Main Testing Logic ---
 def run_PLR_pnt_deviation_analysis():
@@ -144,43 +136,44 @@ def run_PLR_pnt_deviation_analysis():
         print("FATAL ERROR: PRIMES_TO_TEST is too large for the loaded prime list.")
         return
 
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            v16_acc = (total_v16_successes / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Acc: {v16_acc:.2f}% | Failures: {total_v16_failures:,} | Time: {elapsed:.0f}s", end='\r')
-
-        # --- 1. Get p_n and candidates ---
-        p_n_minus_1 = prime_list[i - 1]
-        p_n = prime_list[i]
-        true_p_n_plus_1 = prime_list[i + 1]
+    for chunk_start in range(START_INDEX, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            # --- 1. Get p_n and candidates ---
+            p_n_minus_1 = prime_list[i - 1]
+            p_n = prime_list[i]
+            true_p_n_plus_1 = prime_list[i + 1]
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            candidates.append(prime_list[i + j])
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                candidates.append(prime_list[i + j])
         
-        total_predictions += 1
+            total_predictions += 1
         
-        # --- 2. Get v16.0 Prediction ---
-        prediction_v16 = get_v16_prediction(p_n, candidates)
-        is_success = (prediction_v16 == true_p_n_plus_1)
+            # --- 2. Get v16.0 Prediction ---
+            prediction_v16 = get_v16_prediction(p_n, candidates)
+            is_success = (prediction_v16 == true_p_n_plus_1)
 
-        # --- 3. Get PNT Deviation Score ---
-        actual_gap = p_n - p_n_minus_1
-        pnt_average_gap = math.log(p_n) # ln(p_n)
+            # --- 3. Get PNT Deviation Score ---
+            actual_gap = p_n - p_n_minus_1
+            pnt_average_gap = math.log(p_n) # ln(p_n)
         
-        if pnt_average_gap == 0: continue # Avoid division by zero
+            if pnt_average_gap == 0: continue # Avoid division by zero
             
-        pnt_deviation_score = actual_gap / pnt_average_gap
+            pnt_deviation_score = actual_gap / pnt_average_gap
         
-        # --- 4. Log the Score ---
-        if is_success:
-            total_v16_successes += 1
-            success_deviation_sum += pnt_deviation_score
-        else:
-            total_v16_failures += 1
-            failure_deviation_sum += pnt_deviation_score
+            # --- 4. Log the Score ---
+            if is_success:
+                total_v16_successes += 1
+                success_deviation_sum += pnt_deviation_score
+            else:
+                total_v16_failures += 1
+                failure_deviation_sum += pnt_deviation_score
+
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        v16_acc = (total_v16_successes / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Acc: {v16_acc:.2f}% | Failures: {total_v16_failures:,} | Time: {elapsed:.0f}s", end='\r')
             
     # --- Final Summary ---
     progress = total_predictions
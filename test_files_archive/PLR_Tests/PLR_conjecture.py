@@ -20,8 +20,15 @@
 # 7. Tally Successes and report the final prediction accuracy.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
+
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes
+
 # Import the engine from the other file
 # (Make sure 'pac_diagnostic_engine.py' is in the same folder)
 from pac_diagnostic_engine import get_messiness_score
@@ -30,31 +37,24 @@ from pac_diagnostic_engine import get_messiness_score
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 # Test the first 1,000,000 primes (adjust as needed)
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 10000
 # How many "next primes" to check as candidates?
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 # Consistent start
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr.tolist()
 
 # --- Main Testing Logic ---
 def run_PLR_predictive_test():
@@ -73,43 +73,44 @@ def run_PLR_predictive_test():
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 10000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            accuracy = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Successes: {total_successes:,} | Accuracy: {accuracy:.2f}% | Time: {elapsed:.0f}s", end='\r')
-
-        # 1. Get Base Prime
-        p_n = prime_list[i]
+    for chunk_start in range(START_INDEX, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            # 1. Get Base Prime
+            p_n = prime_list[i]
         
-        # 2. Get Candidates
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            q_i = prime_list[i + j]
-            candidates.append(q_i)
+            # 2. Get Candidates
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                q_i = prime_list[i + j]
+                candidates.append(q_i)
         
-        # The true next prime is the first one
-        true_p_n_plus_1 = candidates[0]
+            # The true next prime is the first one
+            true_p_n_plus_1 = candidates[0]
         
-        # --- 3 & 4. Score all Candidate Anchors ---
-        candidate_scores = []
-        for q_i in candidates:
-            S_cand = p_n + q_i
-            messiness_score = get_messiness_score(S_cand)
-            candidate_scores.append((messiness_score, q_i))
+            # --- 3 & 4. Score all Candidate Anchors ---
+            candidate_scores = []
+            for q_i in candidates:
+                S_cand = p_n + q_i
+                messiness_score = get_messiness_score(S_cand)
+                candidate_scores.append((messiness_score, q_i))
             
-        # 5. Find the Best Candidate (lowest score)
-        # Sort the list by score (item[0])
-        candidate_scores.sort(key=lambda x: x[0])
+            # 5. Find the Best Candidate (lowest score)
+            # Sort the list by score (item[0])
+            candidate_scores.sort(key=lambda x: x[0])
         
-        # The best candidate is the first one in the sorted list
-        best_score, predicted_p_n_plus_1 = candidate_scores[0]
+            # The best candidate is the first one in the sorted list
+            best_score, predicted_p_n_plus_1 = candidate_scores[0]
         
-        # 6. Tally the Prediction
-        total_predictions += 1
-        if predicted_p_n_plus_1 == true_p_n_plus_1:
-            total_successes += 1
+            # 6. Tally the Prediction
+            total_predictions += 1
+            if predicted_p_n_plus_1 == true_p_n_plus_1:
+                total_successes += 1
+
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        accuracy = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Successes: {total_successes:,} | Accuracy: {accuracy:.2f}% | Time: {elapsed:.0f}s", end='\r')
 
     # --- Final Summary ---
     progress = PRIMES_TO_TEST
@@ -10,38 +10,38 @@
 # *higher* than the 18.57% baseline.
 # ==============================================================================
 
+import os
+import sys
 import time
 import math
+
+# The shared prime loader lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from plr_common import load_primes
+
 # Import the v2.1 engine
 from pac_diagnostic_engine_v2_1 import get_messiness_score_v2_1, categorize_gap
 
 # --- Configuration ---
 PRIME_INPUT_FILE = "prime/primes_100m.txt"
 PRIMES_TO_TEST = 50000000 
+PROGRESS_INTERVAL = 100000
 NUM_CANDIDATES_TO_CHECK = 10 
 START_INDEX = 10 
 
 # --- Function to load primes from a file ---
 def load_primes_from_file(filename):
-    """Loads ALL primes from the text file."""
-    print(f"Loading ALL primes from {filename}...")
-    start_time = time.time()
-    try:
-        with open(filename, 'r') as f:
-            prime_list = [int(line.strip()) for line in f]
-    except FileNotFoundError:
-        print(f"FATAL ERROR: The prime file '{filename}' was not found.")
+    """Loads ALL primes (shared .npy-cached loader) and checks there are enough."""
+    prime_arr = load_primes(filename)
+    if prime_arr is None:
         return None
     
-    end_time = time.time()
-    print(f"Loaded {len(prime_list):,} primes in {end_time - start_time:.2f} seconds.")
-    
     required_primes = PRIMES_TO_TEST + START_INDEX + NUM_CANDIDATES_TO_CHECK + 2
-    if len(prime_list) < required_primes:
+    if len(prime_arr) < required_primes:
         print(f"\nFATAL ERROR: Prime file is too small for this test.")
         return None
         
-    return prime_list
+    return prime_arr.tolist()
 
 # --- Main Testing Logic ---
 def run_PLR_predictive_test_v2_1():
@@ -60,50 +60,51 @@ def run_PLR_predictive_test_v2_1():
     
     loop_end_index = PRIMES_TO_TEST + START_INDEX
     
-    for i in range(START_INDEX, loop_end_index):
-        if (i - START_INDEX + 1) % 100000 == 0:
-            elapsed = time.time() - start_time
-            progress = i - START_INDEX + 1
-            accuracy = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
-            print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Successes: {total_successes:,} | Accuracy: {accuracy:.2f}% | Time: {elapsed:.0f}s", end='\r')
-
-        p_n = prime_list[i]
+    for chunk_start in range(START_INDEX, loop_end_index, PROGRESS_INTERVAL):
+        chunk_end = min(chunk_start + PROGRESS_INTERVAL, loop_end_index)
+        for i in range(chunk_start, chunk_end):
+            p_n = prime_list[i]
         
-        candidates = []
-        for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
-            q_i = prime_list[i + j]
-            candidates.append(q_i)
+            candidates = []
+            for j in range(1, NUM_CANDIDATES_TO_CHECK + 1):
+                q_i = prime_list[i + j]
+                candidates.append(q_i)
         
-        true_p_n_plus_1 = candidates[0]
+            true_p_n_plus_1 = candidates[0]
         
-        candidate_scores = []
-        for q_i in candidates:
-            S_cand = p_n + q_i
-            gap_g_i = q_i - p_n 
+            candidate_scores = []
+            for q_i in candidates:
+                S_cand = p_n + q_i
+                gap_g_i = q_i - p_n 
             
-            # --- Call the v2.1 Engine ---
-            messiness_score = get_messiness_score_v2_1(S_cand, gap_g_i)
-            # ---
+                # --- Call the v2.1 Engine ---
+                messiness_score = get_messiness_score_v2_1(S_cand, gap_g_i)
+                # ---
             
-            candidate_scores.append((messiness_score, q_i))
+                candidate_scores.append((messiness_score, q_i))
             
-        # Find the Best Candidate (lowest score / lowest failure rate)
-        candidate_scores.sort(key=lambda x: x[0])
-        best_score, predicted_p_n_plus_1 = candidate_scores[0]
+            # Find the Best Candidate (lowest score / lowest failure rate)
+            candidate_scores.sort(key=lambda x: x[0])
+            best_score, predicted_p_n_plus_1 = candidate_scores[0]
         
-        total_predictions += 1
-        if predicted_p_n_plus_1 == true_p_n_plus_1:
-            total_successes += 1
+            total_predictions += 1
+            if predicted_p_n_plus_1 == true_p_n_plus_1:
+                total_successes += 1
             
-        # --- Handle Ties ---
-        # It's possible for multiple candidates to have the same *best* score
-        # (e.g., two "impossible" anchors with 'inf' scores).
-        # We need to check if the true anchor was *among* the tied best.
-        # This is a more complex but fair way to score.
+            # --- Handle Ties ---
+            # It's possible for multiple candidates to have the same *best* score
+            # (e.g., two "impossible" anchors with 'inf' scores).
+            # We need to check if the true anchor was *among* the tied best.
+            # This is a more complex but fair way to score.
         
-        # NOTE: For simplicity, the above code only counts a "win"
-        # if the true prime is the *first* in the sorted list.
-        # This is a strict but clear test.
+            # NOTE: For simplicity, the above code only counts a "win"
+            # if the true prime is the *first* in the sorted list.
+            # This is a strict but clear test.
+
+        elapsed = time.time() - start_time
+        progress = chunk_end - START_INDEX
+        accuracy = (total_successes / total_predictions) * 100 if total_predictions > 0 else 0
+        print(f"Progress: {progress:,} / {PRIMES_TO_TEST:,} | Successes: {total_successes:,} | Accuracy: {accuracy:.2f}% | Time: {elapsed:.0f}s", end='\r')
 
     # --- Final Summary ---
     progress = PRIMES_TO_TEST